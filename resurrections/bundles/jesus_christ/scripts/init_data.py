@@ -12,6 +12,8 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -46,6 +48,9 @@ class GospelLoader:
             "daily_life": [],
             "teaching": []
         }
+        # Frozen int32 copies of the indices above, built with the index
+        self.index_np: Dict[str, np.ndarray] = {}
+        self.topics_np: Dict[str, np.ndarray] = {}
 
     def load_all_texts(self):
         """Load all Gospel texts from the data directory"""
@@ -126,6 +131,13 @@ class GospelLoader:
                 if self._matches_topic(text_lower, topic):
                     indices.append(i)
 
+        self.index_np = {
+            word: np.asarray(ids, dtype=np.int32) for word, ids in self.index.items()
+        }
+        self.topics_np = {
+            topic: np.asarray(ids, dtype=np.int32) for topic, ids in self.topics.items()
+        }
+
     def _matches_topic(self, text: str, topic: str) -> bool:
         """Check if text matches a topic"""
         topic_keywords = {
@@ -148,31 +160,22 @@ class GospelLoader:
         """Search for relevant passages"""
         query_words = set(re.findall(r'\b\w+\b', query.lower()))
 
-        # Find passages containing query words
-        passage_scores: Dict[int, int] = {}
-        for word in query_words:
-            if word in self.index:
-                for idx in self.index[word]:
-                    passage_scores[idx] = passage_scores.get(idx, 0) + 1
-
-        # Sort by relevance
-        sorted_indices = sorted(passage_scores.keys(),
-                               key=lambda x: passage_scores[x],
-                               reverse=True)
-
-        # Return top results
-        results = []
-        for idx in sorted_indices[:limit]:
-            results.append(self.passages[idx])
+        # Score each passage by how many query words it contains
+        hits = [self.index_np[word] for word in query_words if word in self.index_np]
+        if not hits:
+            return []
+        indices, scores = np.unique(np.concatenate(hits), return_counts=True)
 
-        return results
+        # Sort by relevance, ties in passage order
+        top = indices[np.argsort(-scores, kind="stable")[:limit]]
+        return [self.passages[idx] for idx in top]
 
     def get_by_topic(self, topic: str, limit: int = 5) -> List[GospelPassage]:
         """Get passages related to a specific topic"""
-        if topic not in self.topics:
+        if topic not in self.topics_np:
             return []
 
-        indices = self.topics[topic][:limit]
+        indices = self.topics_np[topic][:limit]
         return [self.passages[i] for i in indices]
 
     def get_random_teaching(self) -> Optional[GospelPassage]:
@@ -11,15 +11,19 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import hashlib
+from collections import OrderedDict
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from consciousness.database import init_database
-from consciousness.ingestion import ConsciousnessIngestor
+from consciousness.ingestion import ConsciousnessIngestor, INGEST_BATCH_SIZE
 from retrieval.vector_store import VectorStore
 from intelligence.llm import OllamaLLM, RAGSystem
 
+# Chat responses kept per bot, keyed on the normalized message
+RESPONSE_CACHE_SIZE = 1024
+
 
 class ResurrectionConsciousness:
     """
@@ -27,13 +31,21 @@ class ResurrectionConsciousness:
     Each figure has their own vector database collection.
     """
 
-    def __init__(self, figure_name: str, create_if_missing: bool = False):
+    def __init__(
+        self,
+        figure_name: str,
+        create_if_missing: bool = False,
+        embedder: Optional[Any] = None,
+        chroma_client: Optional[Any] = None
+    ):
         """
         Initialize resurrection consciousness.
 
         Args:
             figure_name: Name of historical figure (e.g., "jesus_christ")
             create_if_missing: Create bundle if it doesn't exist
+            embedder: Loaded embedding model to share instead of loading one
+            chroma_client: Open ChromaDB client to share instead of opening one
         """
         self.figure_name = figure_name
         self.bundle_dir = Path(f"resurrections/bundles/{figure_name}")
@@ -48,7 +60,9 @@ class ResurrectionConsciousness:
         # Initialize components
         self.db = init_database()
         self.vector_store = VectorStore(
-            collection_name=f"resurrection_{figure_name}"
+            collection_name=f"resurrection_{figure_name}",
+            embedder=embedder,
+            client=chroma_client
         )
         self.ingestor = ConsciousnessIngestor(
             db_manager=self.db,
@@ -57,6 +71,9 @@ class ResurrectionConsciousness:
             encryption_enabled=False  # Resurrections use public texts
         )
 
+        # Bumped whenever the indexed texts change, so cached answers expire
+        self.corpus_version = 0
+
         # Try to connect to Ollama
         self.rag = None
         try:
@@ -137,6 +154,43 @@ class ResurrectionConsciousness:
             self._save_metadata()
             return
 
+        if not self.index_texts(data_dir)["indexed_files"]:
+            return
+
+        # Update statistics
+        docs = self.vector_store.get_all_documents()
+        self.metadata["statistics"]["total_passages"] = len(docs)
+        self._save_metadata()
+
+        print(f"  ✓ Loaded {len(docs)} passages")
+
+    def index_texts(
+        self,
+        data_dir: Optional[Path] = None,
+        batch_size: int = INGEST_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Index every text file under a data directory.
+
+        All files are read first and then ingested in batches, so the vector
+        store embeds and inserts ``batch_size`` texts per call rather than
+        one text at a time.
+
+        Args:
+            data_dir: Directory of .txt files (defaults to the bundle's data dir)
+            batch_size: Maximum number of texts per vector store call
+
+        Returns:
+            Dict with total_documents, indexed_files and errors, plus an
+            'error' message if nothing could be indexed
+        """
+        data_dir = Path(data_dir) if data_dir is not None else self.bundle_dir / "data"
+        results = {"total_documents": 0, "indexed_files": [], "errors": []}
+
+        if not data_dir.exists():
+            results["error"] = f"Data directory not found: {data_dir}"
+            return results
+
         # Process all text files
         text_files = []
         for subdir in data_dir.iterdir():
@@ -146,38 +200,51 @@ class ResurrectionConsciousness:
 
         if not text_files:
             print(f"  ⚠️ No texts found in {data_dir}")
-            return
+            results["error"] = f"No texts found in {data_dir}"
+            return results
 
         print(f"  Loading {len(text_files)} texts...")
 
+        items = []
         for txt_file in text_files:
             try:
                 with open(txt_file, 'r', encoding='utf-8') as f:
                     content = f.read()
-
-                # Determine category from path
-                category = self._categorize_text(txt_file)
-
-                # Ingest the text
-                self.ingestor.ingest_text(
-                    content=content,
-                    source=str(txt_file.relative_to(self.bundle_dir)),
-                    metadata={
-                        "figure": self.figure_name,
-                        "category": category,
-                        "filename": txt_file.name
-                    }
-                )
-
             except Exception as e:
                 print(f"  ✗ Error loading {txt_file.name}: {e}")
+                results["errors"].append({"file": str(txt_file), "error": str(e)})
+                continue
 
-        # Update statistics
-        docs = self.vector_store.get_all_documents()
-        self.metadata["statistics"]["total_passages"] = len(docs)
-        self._save_metadata()
+            try:
+                source = str(txt_file.relative_to(self.bundle_dir))
+            except ValueError:
+                source = str(txt_file)
 
-        print(f"  ✓ Loaded {len(docs)} passages")
+            items.append({
+                "content": content,
+                "source": source,
+                "metadata": {
+                    "figure": self.figure_name,
+                    "category": self._categorize_text(txt_file),
+                    "filename": txt_file.name
+                }
+            })
+
+        try:
+            ingested = self.ingestor.ingest_texts(items, batch_size=batch_size)
+        except Exception as e:
+            print(f"  ✗ Error indexing texts: {e}")
+            results["errors"].append({"file": str(data_dir), "error": str(e)})
+            return results
+
+        for result in ingested:
+            if result['status'] != 'success':
+                results["errors"].append({"file": result['source'], "error": result['error']})
+
+        results["total_documents"] = len(items)
+        results["indexed_files"] = [item["source"] for item in items]
+        self.corpus_version += 1
+        return results
 
     def _categorize_text(self, file_path: Path) -> str:
         """
@@ -450,6 +517,7 @@ Be authentic to their voice and philosophy.""")
         })
 
         self._save_metadata()
+        self.corpus_version += 1
 
         return results
 
@@ -780,6 +848,7 @@ Be authentic to their voice and philosophy.""")
                 "documents_purged": results["purged_documents"]
             }
             self._save_metadata()
+            self.corpus_version += 1
 
         except Exception as e:
             results["errors"].append(f"Purge failed: {str(e)}")
@@ -815,19 +884,41 @@ class ResurrectionBot:
         """Initialize bot with a specific figure."""
         self.consciousness = ResurrectionConsciousness(figure_name)
         self.figure_name = figure_name
+        self._responses: "OrderedDict[str, str]" = OrderedDict()
+        self._responses_version = self.consciousness.corpus_version
 
     def chat(self, message: str) -> str:
         """
         Chat with the resurrection.
 
+        Repeated messages (ignoring case and whitespace) are answered from
+        an LRU cache until the figure's texts change.
+
         Args:
             message: User's message
 
         Returns:
             Response from the figure
         """
+        if self._responses_version != self.consciousness.corpus_version:
+            self._responses.clear()
+            self._responses_version = self.consciousness.corpus_version
+
+        key = " ".join(message.lower().split())
+        cached = self._responses.get(key)
+        if cached is not None:
+            self._responses.move_to_end(key)
+            return cached
+
         result = self.consciousness.query(message)
-        return result.get("response", "I have no words for this.")
+        response = result.get("response", "I have no words for this.")
+
+        # Answers produced after an LLM failure are not worth keeping
+        if result.get("metadata", {}).get("method") != "retrieval_fallback":
+            self._responses[key] = response
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return response
 
     def get_info(self) -> Dict[str, Any]:
         """Get information about this resurrection."""
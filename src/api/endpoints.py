@@ -10,6 +10,23 @@ from datetime import datetime
 import uuid
 import io
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        return super().render(content)
+
 # Import components
 import sys
 from pathlib import Path
@@ -21,7 +38,7 @@ from consciousness.parsers import UniversalParser
 from consciousness.encryption import get_encryption_manager, ConsentBasedEncryption
 from holistic import holistic_model
 from retrieval import retrieval
-from retrieval.vector_store import VectorStore, HybridRetriever
+from retrieval.vector_store import VectorStore, CachedVectorStore, HybridRetriever
 from retrieval.llm_integration import LLMProvider, RAGSystem
 from intent import intent
 from simulation import simulation
@@ -31,7 +48,7 @@ from teleology import teleology
 # Initialize components
 db_manager = get_db_manager()
 encryption_manager = get_encryption_manager()
-vector_store = VectorStore()
+vector_store = CachedVectorStore(VectorStore())
 llm_provider = LLMProvider(provider="mock")  # Use mock for now
 rag_system = RAGSystem(vector_store, llm_provider)
 
@@ -227,7 +244,7 @@ async def purge_data(user_id: str, confirm: bool = Query(False)):
 
 
 # Retrieval Endpoints
-@retrieval_router.post("/search")
+@retrieval_router.post("/search", response_class=FastJSONResponse)
 async def semantic_search(request: SearchRequest):
     """Perform semantic search across consciousness data."""
     try:
@@ -245,16 +262,17 @@ async def semantic_search(request: SearchRequest):
                 filter=request.filters
             )
 
-        return {
+        # Returned directly so the results skip jsonable_encoder
+        return FastJSONResponse({
             "query": request.query,
             "results": results,
             "count": len(results)
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@retrieval_router.post("/ask")
+@retrieval_router.post("/ask", response_class=FastJSONResponse)
 async def ask_question(
     question: str = Body(..., embed=True),
     use_context: bool = Query(True),
@@ -267,7 +285,7 @@ async def ask_question(
             k=k,
             use_context=use_context
         )
-        return response
+        return FastJSONResponse(response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -244,23 +244,7 @@ class DatabaseManager:
         """
         session = self.get_session()
         try:
-            # Convert encrypted content to JSON string if it's a dict
-            content_encrypted = event_data.get('content_encrypted')
-            if isinstance(content_encrypted, dict):
-                import json
-                content_encrypted = json.dumps(content_encrypted)
-
-            event = Event(
-                id=event_data['id'],
-                user_id=event_data.get('user_id', 'default'),
-                timestamp=datetime.fromisoformat(event_data['timestamp']),
-                event_type=event_data['type'],
-                source=event_data.get('source'),
-                content_encrypted=content_encrypted,
-                content_hash=event_data.get('content_hash'),
-                meta_data=event_data.get('metadata', {}),
-                consent_level=event_data.get('consent_level', 'full')
-            )
+            event = Event(**self._event_row(event_data))
             session.add(event)
             session.commit()
             return event.id
@@ -270,6 +254,55 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def store_events_batch(self, events: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store several events in one transaction.
+
+        Rows are written with a single bulk insert, so either every event
+        is stored or, on error, none are.
+
+        Args:
+            events: Event data dictionaries, as for store_event
+
+        Returns:
+            Event IDs, in input order
+        """
+        if not events:
+            return []
+
+        session = self.get_session()
+        try:
+            rows = [self._event_row(event_data) for event_data in events]
+            session.bulk_insert_mappings(Event, rows)
+            session.commit()
+            return [row['id'] for row in rows]
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+
+    @staticmethod
+    def _event_row(event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map event data to Event column values."""
+        # Convert encrypted content to JSON string if it's a dict
+        content_encrypted = event_data.get('content_encrypted')
+        if isinstance(content_encrypted, dict):
+            import json
+            content_encrypted = json.dumps(content_encrypted)
+
+        return {
+            'id': event_data['id'],
+            'user_id': event_data.get('user_id', 'default'),
+            'timestamp': datetime.fromisoformat(event_data['timestamp']),
+            'event_type': event_data['type'],
+            'source': event_data.get('source'),
+            'content_encrypted': content_encrypted,
+            'content_hash': event_data.get('content_hash'),
+            'meta_data': event_data.get('metadata', {}),
+            'consent_level': event_data.get('consent_level', 'full')
+        }
+
     def query_events(
         self,
         user_id: str,
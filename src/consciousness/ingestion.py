@@ -5,16 +5,29 @@ Consciousness ingestion module for processing and storing various data formats.
 import os
 import json
 import hashlib
+import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, TYPE_CHECKING
 
 from consciousness.parsers import UniversalParser
-from consciousness.encryption import EncryptionManager
-from consciousness.database import DatabaseManager
 from enum import Enum
 
+if TYPE_CHECKING:
+    from consciousness.database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def _new_event_id() -> str:
+    """Return a random 32-char hex event ID (uuid4 without dash formatting)."""
+    return uuid.uuid4().hex
+
+
+# Documents sent to the vector store per add_documents call
+INGEST_BATCH_SIZE = 512
+
 
 class ConsentLevel(Enum):
     """Privacy consent levels for data storage."""
@@ -28,7 +41,7 @@ class ConsciousnessIngestor:
 
     def __init__(
         self,
-        db_manager: DatabaseManager,
+        db_manager: 'DatabaseManager',
         vector_store: Optional[Any] = None,
         encryption_enabled: bool = True,
         consent_level: str = 'full'
@@ -45,7 +58,12 @@ class ConsciousnessIngestor:
         self.db_manager = db_manager
         self.vector_store = vector_store
         self.parser = UniversalParser()
-        self.encryption_manager = EncryptionManager() if encryption_enabled else None
+        if encryption_enabled:
+            # Deferred so encryption-free ingestion never loads cryptography
+            from consciousness.encryption import EncryptionManager
+            self.encryption_manager = EncryptionManager()
+        else:
+            self.encryption_manager = None
         self.consent_level = consent_level
         self.encryption_enabled = encryption_enabled
 
@@ -67,7 +85,7 @@ class ConsciousnessIngestor:
             Dict with ingestion results
         """
         # Create event ID
-        event_id = str(uuid.uuid4())
+        event_id = _new_event_id()
 
         # Prepare metadata
         if metadata is None:
@@ -117,6 +135,88 @@ class ConsciousnessIngestor:
             'metadata': metadata
         }
 
+    def ingest_texts(
+        self,
+        items: List[Dict[str, Any]],
+        batch_size: int = INGEST_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest many texts, adding them to the vector store in batches.
+
+        Each batch is embedded and inserted with one add_documents call and
+        its events are stored in one transaction, instead of one round trip
+        per text as with ingest_text.
+
+        Args:
+            items: Dicts with 'content' and optional 'source' and 'metadata'
+            batch_size: Maximum number of texts per vector store call
+
+        Returns:
+            Ingestion results, in input order
+        """
+        results = []
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+            timestamp = datetime.utcnow().isoformat()
+
+            ids = []
+            documents = []
+            metadatas = []
+            events = []
+            for item in batch:
+                event_id = _new_event_id()
+                content = item['content']
+                source = item.get('source', 'direct_text')
+                metadata = item.get('metadata') or {}
+
+                ids.append(event_id)
+                documents.append(content)
+                metadatas.append({
+                    **metadata,
+                    'source': source,
+                    'timestamp': timestamp,
+                    'event_id': event_id
+                })
+                events.append({
+                    'id': event_id,
+                    'user_id': metadata.get('user_id', 'default'),
+                    'timestamp': timestamp,
+                    'type': 'text_content',
+                    'source': source,
+                    'content_encrypted': {'content': content} if self.consent_level == 'full' else None,
+                    'content_hash': hashlib.sha256(content.encode()).hexdigest(),
+                    'metadata': metadata,
+                    'consent_level': self.consent_level
+                })
+                results.append({
+                    'status': 'success',
+                    'event_id': event_id,
+                    'source': source,
+                    'content_length': len(content),
+                    'metadata': metadata
+                })
+
+            # Add to vector store if available
+            if self.vector_store:
+                self.vector_store.add_documents(
+                    documents=documents,
+                    metadatas=metadatas,
+                    ids=ids
+                )
+
+            # Store in database if enabled; the batch is one transaction, so
+            # a failure leaves every text in it without an event row
+            if self.consent_level != 'none':
+                try:
+                    self.db_manager.store_events_batch(events)
+                except Exception as e:
+                    logger.warning(f"Failed to store {len(events)} ingestion events: {e}")
+                    for result in results[-len(batch):]:
+                        result['status'] = 'error'
+                        result['error'] = f"Event not stored: {e}"
+
+        return results
+
     def ingest_file(self, file_path: str) -> Dict[str, Any]:
         """
         Ingest a single file into the consciousness system.
@@ -146,7 +246,7 @@ class ConsciousnessIngestor:
 
     def _process_email(self, data: Dict[str, Any], source_path: str) -> Dict[str, Any]:
         """Process email data."""
-        event_id = str(uuid.uuid4())
+        event_id = _new_event_id()
 
         # Extract content
         content = data.get('content', {})
@@ -197,7 +297,7 @@ class ConsciousnessIngestor:
 
     def _process_text(self, data: Dict[str, Any], source_path: str) -> Dict[str, Any]:
         """Process text file data."""
-        event_id = str(uuid.uuid4())
+        event_id = _new_event_id()
 
         # Extract content
         text_content = data.get('content', {}).get('text', '')
@@ -244,7 +344,7 @@ class ConsciousnessIngestor:
 
     def _process_chat(self, data: Dict[str, Any], source_path: str) -> Dict[str, Any]:
         """Process chat message data."""
-        event_id = str(uuid.uuid4())
+        event_id = _new_event_id()
 
         # Extract content
         text_content = data.get('content', {}).get('text', '')
@@ -295,7 +395,7 @@ class ConsciousnessIngestor:
 
     def _process_generic(self, data: Dict[str, Any], source_path: str) -> Dict[str, Any]:
         """Process generic data."""
-        event_id = str(uuid.uuid4())
+        event_id = _new_event_id()
 
         # Try to extract text content
         text_content = str(data.get('content', data))
@@ -363,20 +463,12 @@ class ConsciousnessIngestor:
 
         results = []
 
-        # Get files to process
-        if recursive:
-            files = directory.rglob('*')
-        else:
-            files = directory.glob('*')
-
-        for file_path in files:
-            if not file_path.is_file():
-                continue
-
-            # Check extension filter
-            if extensions and file_path.suffix not in extensions:
+        for entry in self._walk(directory_path, recursive):
+            # Check extension filter on the bare name before building a Path
+            if extensions and os.path.splitext(entry.name)[1] not in extensions:
                 continue
 
+            file_path = Path(entry.path)
             try:
                 result = self.ingest_file(str(file_path))
                 result['file'] = str(file_path)
@@ -388,4 +480,29 @@ class ConsciousnessIngestor:
                     'error': str(e)
                 })
 
-        return results
\ No newline at end of file
+        return results
+
+    def _walk(self, directory_path: str, recursive: bool) -> Iterator[os.DirEntry]:
+        """
+        Yield file entries under a directory using os.scandir.
+
+        DirEntry caches the file type from the directory listing, so no
+        extra stat call is needed per entry.
+
+        Args:
+            directory_path: Directory to scan
+            recursive: Whether to descend into subdirectories
+
+        Yields:
+            DirEntry objects for regular files
+        """
+        with os.scandir(directory_path) as it:
+            subdirs = []
+            for entry in it:
+                if entry.is_file():
+                    yield entry
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+
+        for subdir in subdirs:
+            yield from self._walk(subdir, recursive)
@@ -2,9 +2,13 @@
 Parsers for different data sources in Consciousness Capture component.
 """
 
+import codecs
+import os
+import re
 import json
 import hashlib
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import email
@@ -12,6 +16,9 @@ from email.message import Message
 from email.utils import parsedate_to_datetime
 import mimetypes
 
+# Matches whitespace-delimited words, same semantics as str.split()
+_WORD_RE = re.compile(r'\S+')
+
 
 class EmailParser:
     """Parse email messages from various formats."""
@@ -90,9 +97,10 @@ class EmailParser:
             except:
                 timestamp = headers['date']
 
-        # Extract body
-        body_plain = ''
-        body_html = ''
+        # Extract body. Payloads stay as bytes and are joined once, so the
+        # hash sees the raw bytes and UTF-8 decoding happens a single time.
+        body_plain_chunks: List[bytes] = []
+        body_html_chunks: List[bytes] = []
         attachments = []
 
         for part in msg.walk():
@@ -105,16 +113,14 @@ class EmailParser:
 
             # Extract text content
             if content_type == 'text/plain' and 'attachment' not in content_disposition:
-                try:
-                    body_plain += part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                except:
-                    pass
+                payload = part.get_payload(decode=True)
+                if payload:
+                    body_plain_chunks.append(payload)
 
             elif content_type == 'text/html' and 'attachment' not in content_disposition:
-                try:
-                    body_html += part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                except:
-                    pass
+                payload = part.get_payload(decode=True)
+                if payload:
+                    body_html_chunks.append(payload)
 
             # Handle attachments
             elif 'attachment' in content_disposition:
@@ -126,10 +132,16 @@ class EmailParser:
                         'size': len(part.get_payload(decode=True)) if part.get_payload(decode=True) else 0
                     })
 
-        # Create unique ID
-        content_hash = hashlib.sha256(
-            (headers['message_id'] + body_plain + str(timestamp)).encode()
-        ).hexdigest()
+        body_plain = b''.join(body_plain_chunks).decode('utf-8', errors='ignore')
+        body_html = b''.join(body_html_chunks).decode('utf-8', errors='ignore')
+
+        # Create unique ID, hashing incrementally rather than concatenating
+        # the whole body into one more bytes object
+        hasher = hashlib.sha256(headers['message_id'].encode())
+        for chunk in body_plain_chunks:
+            hasher.update(chunk)
+        hasher.update(str(timestamp).encode())
+        content_hash = hasher.hexdigest()
 
         return {
             'id': content_hash[:16],
@@ -172,20 +184,29 @@ class TextFileParser:
         """
         path = Path(file_path)
 
-        if not path.exists():
+        # Single binary read; fstat on the open descriptor avoids extra lookups
+        try:
+            with open(file_path, 'rb') as f:
+                stats = os.fstat(f.fileno())
+                raw = f.read()
+        except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Detect encoding
-        encoding = self._detect_encoding(file_path)
-
-        # Read content
-        with open(file_path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        # Get file stats
-        stats = path.stat()
-
-        # Create unique ID
+        # Fast path: most files are already UTF-8, so skip detection entirely;
+        # utf-8-sig drops a leading BOM as detection would have
+        try:
+            content = raw.decode('utf-8-sig')
+            encoding = 'utf-8-sig' if raw.startswith(codecs.BOM_UTF8) else 'utf-8'
+        except UnicodeDecodeError:
+            encoding = self._detect_encoding_from_bytes(raw[:10000])
+            content = raw.decode(encoding, errors='replace')
+
+        # Match text-mode universal newline handling
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+        # Create unique ID from the decoded, newline-normalized text, so IDs
+        # don't depend on BOMs, line endings or the source encoding
         content_hash = hashlib.sha256(content.encode()).hexdigest()
 
         return {
@@ -204,7 +225,7 @@ class TextFileParser:
                 'modified': datetime.fromtimestamp(stats.st_mtime).isoformat(),
                 'encoding': encoding,
                 'line_count': content.count('\n') + 1,
-                'word_count': len(content.split()),
+                'word_count': sum(1 for _ in _WORD_RE.finditer(content)),
                 'char_count': len(content),
             }
         }
@@ -219,12 +240,24 @@ class TextFileParser:
         Returns:
             Detected encoding string
         """
-        import chardet
-
         with open(file_path, 'rb') as f:
             raw_data = f.read(10000)  # Read first 10KB
-            result = chardet.detect(raw_data)
-            return result['encoding'] or 'utf-8'
+        return self._detect_encoding_from_bytes(raw_data)
+
+    def _detect_encoding_from_bytes(self, raw_data: bytes) -> str:
+        """
+        Detect the encoding of an already-read byte sample.
+
+        Args:
+            raw_data: Leading bytes of the file
+
+        Returns:
+            Detected encoding string
+        """
+        import chardet
+
+        result = chardet.detect(raw_data)
+        return result['encoding'] or 'utf-8'
 
 
 class ChatParser:
@@ -240,8 +273,6 @@ class ChatParser:
         Returns:
             List of parsed messages
         """
-        import re
-
         messages = []
         pattern = r'(\d{1,2}/\d{1,2}/\d{2,4}, \d{1,2}:\d{2}(?:\s?[AP]M)?) - ([^:]+): (.+)'
 
@@ -483,11 +514,24 @@ class DocumentParser:
 class UniversalParser:
     """Universal parser that delegates to specific parsers."""
 
-    def __init__(self):
-        self.email_parser = EmailParser()
-        self.text_parser = TextFileParser()
-        self.chat_parser = ChatParser()
-        self.document_parser = DocumentParser()
+    # Sub-parsers are built on first use so callers that only touch one
+    # format never pay for the others.
+
+    @cached_property
+    def email_parser(self) -> EmailParser:
+        return EmailParser()
+
+    @cached_property
+    def text_parser(self) -> TextFileParser:
+        return TextFileParser()
+
+    @cached_property
+    def chat_parser(self) -> ChatParser:
+        return ChatParser()
+
+    @cached_property
+    def document_parser(self) -> DocumentParser:
+        return DocumentParser()
 
     def parse(self, file_path: str) -> Any:
         """
@@ -5,7 +5,38 @@ Builds and maintains a comprehensive knowledge graph representing
 the user's identity, relationships, and experiences.
 """
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from holistic.graph import EDGE_DTYPE, NO_PROPS, CSRAdjacency, DeltaOverlay, TypeDictionary, grow
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    from holistic.graph import ScalableBloomFilter
+
+# Rebuild the CSR once the overlay holds this many edges (or 1/8 of the CSR)
+DELTA_COMPACT_THRESHOLD = 1024
+
+# Initial capacity of the growable type-id columns
+INITIAL_CAPACITY = 1024
+
+# Type code for nodes that are only referenced by relationships
+NO_TYPE = -1
+
+# Bloom filter sizing for entity and edge existence checks
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 0.01
+
+# query_graph result cache size and time-to-live in seconds
+QUERY_CACHE_SIZE = 128
+QUERY_CACHE_TTL = 300.0
 
 
 class HolisticSelfModel:
@@ -16,10 +47,159 @@ class HolisticSelfModel:
     def __init__(self):
         """Initialize the Holistic Self-Model component."""
         self.graph = None
-        self.entities = {}
-        self.relationships = []
         self.is_initialized = False
 
+        # Entity properties keyed by entity ID
+        self._entity_props: Dict[str, Dict[str, Any]] = {}
+
+        # Entity and relationship types are dictionary-encoded as int8 codes,
+        # each kind in its own dictionary
+        self._entity_types = TypeDictionary("entity")
+        self._relationship_types = TypeDictionary("relationship")
+
+        # Dense integer IDs for every node referenced by the graph
+        self._rid_to_dense: Dict[str, int] = {}
+        self._dense_to_rid: List[str] = []
+        self._entity_type_ids = np.empty(INITIAL_CAPACITY, dtype=np.int8)
+
+        # Edge table: one EDGE_DTYPE row per edge ID, in a growable array;
+        # only non-empty properties are stored, in a side list
+        self._edges = np.empty(INITIAL_CAPACITY, dtype=EDGE_DTYPE)
+        self._n_edges = 0
+        self._props: List[Dict[str, Any]] = []
+
+        # Bloom filters reject unknown entities and new edges without a lookup
+        self._entity_bloom = ScalableBloomFilter(
+            initial_capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE
+        )
+        self._edge_bloom = ScalableBloomFilter(
+            initial_capacity=BLOOM_CAPACITY, error_rate=BLOOM_ERROR_RATE
+        )
+
+        # Adjacency: CSR for compacted edges plus an overlay for new ones
+        self._csr = CSRAdjacency.empty()
+        self._delta = DeltaOverlay()
+
+        # query_graph results, invalidated by any mutation via _graph_version
+        self._graph_version = 0
+        self._cache: "OrderedDict[bytes, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @property
+    def entities(self) -> Dict[str, Dict[str, Any]]:
+        """All entities as dictionaries, keyed by entity ID."""
+        return {
+            entity_id: self._entity_view(entity_id)
+            for entity_id in self._entity_props
+        }
+
+    @property
+    def relationships(self) -> List[Dict[str, Any]]:
+        """All relationships as dictionaries, in insertion order."""
+        return [self._edge_view(edge_id) for edge_id in range(self._n_edges)]
+
+    @staticmethod
+    def _type_codes(types: TypeDictionary, type_names: Optional[List[str]]) -> Optional[np.ndarray]:
+        """Encode a type filter; ``None`` means no filter was requested."""
+        if not type_names:
+            return None
+        return types.encode(type_names)
+
+    def _dense_id(self, entity_id: str) -> int:
+        """Return the dense ID for an entity, assigning one if needed."""
+        dense = self._rid_to_dense.get(entity_id)
+        if dense is None:
+            # Interned so the lookup dict and reverse list share one string
+            entity_id = sys.intern(entity_id)
+            dense = len(self._dense_to_rid)
+            self._rid_to_dense[entity_id] = dense
+            self._dense_to_rid.append(entity_id)
+            self._entity_type_ids = grow(self._entity_type_ids, dense + 1)
+            self._entity_type_ids[dense] = NO_TYPE
+        return dense
+
+    def _edge_view(self, edge_id: int) -> Dict[str, Any]:
+        """Materialize one edge as a relationship dictionary."""
+        source, target, type_id, props_idx = self._edges[edge_id].item()
+        return {
+            "source": self._dense_to_rid[source],
+            "target": self._dense_to_rid[target],
+            "type": self._relationship_types.names[type_id],
+            "properties": self._props[props_idx] if props_idx != NO_PROPS else {}
+        }
+
+    def _entity_view(self, entity_id: str) -> Dict[str, Any]:
+        """Materialize one entity as a type/properties dictionary."""
+        code = self._entity_type_ids[self._rid_to_dense[entity_id]]
+        return {
+            "type": self._entity_types.names[code] if code != NO_TYPE else None,
+            "properties": self._entity_props.get(entity_id, {})
+        }
+
+    def _node_view(self, entity_id: str) -> Dict[str, Any]:
+        """Materialize one entity as a node dictionary."""
+        return {"id": entity_id, **self._entity_view(entity_id)}
+
+    def _endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return source and target dense IDs of every edge as arrays."""
+        edges = self._edges[:self._n_edges]
+        return edges["src"], edges["tgt"]
+
+    def _finalize(self) -> None:
+        """Fold all edges into a fresh CSR and clear the delta overlay."""
+        sources, targets = self._endpoints()
+        self._csr = CSRAdjacency.build(sources, targets, len(self._dense_to_rid))
+        self._delta.clear()
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the CSR when the delta overlay has grown large."""
+        if self._delta.size > max(DELTA_COMPACT_THRESHOLD, self._csr.num_edges // 8):
+            self._finalize()
+
+    def _edges_from(self, node: int) -> List[int]:
+        """Return all edge IDs leaving a dense node, CSR and overlay merged."""
+        edge_ids = self._csr.edges_from(node).tolist()
+        edge_ids.extend(self._delta.edges_from(node))
+        return edge_ids
+
+    @staticmethod
+    def _edge_key(source: int, target: int, type_id: int) -> str:
+        """Bloom filter key for a (source, target, type) triple."""
+        return f"{source}|{target}|{type_id}"
+
+    def _find_edge(self, source: int, target: int, type_id: int) -> Optional[int]:
+        """Return the ID of an existing identical edge, if any."""
+        if self._edge_key(source, target, type_id) not in self._edge_bloom:
+            return None
+        edge_ids = np.asarray(self._edges_from(source), dtype=np.int64)
+        rows = self._edges[edge_ids]
+        matches = edge_ids[(rows["tgt"] == target) & (rows["type"] == type_id)]
+        return int(matches[0]) if len(matches) else None
+
+    def has_entity(self, entity_id: str) -> bool:
+        """
+        Check whether an entity was added to the graph.
+
+        The Bloom filter answers most misses without touching the
+        entity dictionary.
+        """
+        return entity_id in self._entity_bloom and entity_id in self._entity_props
+
+    def has_relationship(
+        self,
+        source_id: str,
+        target_id: str,
+        relationship_type: str
+    ) -> bool:
+        """Check whether a relationship of this type links two entities."""
+        source = self._rid_to_dense.get(source_id)
+        target = self._rid_to_dense.get(target_id)
+        type_id = self._relationship_types.codes.get(relationship_type)
+        if source is None or target is None or type_id is None:
+            return False
+        return self._find_edge(source, target, type_id) is not None
+
     async def initialize(self) -> None:
         """Initialize the knowledge graph and storage."""
         # TODO: Initialize graph database connection
@@ -40,16 +220,50 @@ class HolisticSelfModel:
         Returns:
             Entity ID
         """
+        return (await self.add_entities([(entity_type, properties)]))[0]
+
+    async def add_entities(
+        self,
+        batch: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[str]:
+        """
+        Add many entities to the knowledge graph in one call.
+
+        A graph database backend would translate this into a single
+        ``UNWIND $batch AS row CREATE (n:Entity {...})`` statement.
+
+        Args:
+            batch: (entity_type, properties) pairs
+
+        Returns:
+            Entity IDs, in batch order
+        """
         if not self.is_initialized:
             await self.initialize()
+        if not batch:
+            return []
 
-        # TODO: Implement entity addition to graph
-        entity_id = f"{entity_type}_{len(self.entities)}"
-        self.entities[entity_id] = {
-            "type": entity_type,
-            "properties": properties
-        }
-        return entity_id
+        # Interned first, so a type overflow leaves the graph unchanged
+        type_codes = self._entity_types.intern_all([entity_type for entity_type, _ in batch])
+
+        self._graph_version += 1
+        first = len(self._entity_props)
+        entity_ids = [
+            f"{entity_type}_{first + i}"
+            for i, (entity_type, _) in enumerate(batch)
+        ]
+        self._entity_props.update(
+            {entity_id: properties for entity_id, (_, properties) in zip(entity_ids, batch)}
+        )
+        for entity_id in entity_ids:
+            self._entity_bloom.add(entity_id)
+
+        dense = np.fromiter(
+            (self._dense_id(entity_id) for entity_id in entity_ids),
+            dtype=np.int64, count=len(batch)
+        )
+        self._entity_type_ids[dense] = type_codes
+        return entity_ids
 
     async def add_relationship(
         self,
@@ -70,15 +284,62 @@ class HolisticSelfModel:
         Returns:
             Relationship ID
         """
-        # TODO: Implement relationship creation
-        relationship = {
-            "source": source_id,
-            "target": target_id,
-            "type": relationship_type,
-            "properties": properties or {}
-        }
-        self.relationships.append(relationship)
-        return f"rel_{len(self.relationships)}"
+        return (await self.add_relationships(
+            [(source_id, target_id, relationship_type, properties)]
+        ))[0]
+
+    async def add_relationships(
+        self,
+        batch: List[Tuple[str, str, str, Optional[Dict[str, Any]]]]
+    ) -> List[str]:
+        """
+        Add many relationships to the knowledge graph in one call.
+
+        A relationship identical in source, target and type to an existing
+        one is not stored again; the existing relationship ID is returned.
+
+        Args:
+            batch: (source_id, target_id, relationship_type, properties)
+                tuples; properties may be None
+
+        Returns:
+            Relationship IDs, in batch order
+        """
+        if not batch:
+            return []
+
+        # Interned first, so a type overflow leaves the graph unchanged
+        type_codes = self._relationship_types.intern_all(
+            [relationship_type for _, _, relationship_type, _ in batch]
+        ).tolist()
+
+        self._graph_version += 1
+        rel_ids = []
+
+        for (source_id, target_id, _, properties), type_id in zip(batch, type_codes):
+            source = self._dense_id(source_id)
+            target = self._dense_id(target_id)
+
+            # Identical (source, target, type) edges are stored once
+            existing = self._find_edge(source, target, type_id)
+            if existing is not None:
+                rel_ids.append(f"rel_{existing + 1}")
+                continue
+
+            if properties:
+                properties_idx = len(self._props)
+                self._props.append(properties)
+            else:
+                properties_idx = NO_PROPS
+            edge_id = self._n_edges
+            self._edges = grow(self._edges, edge_id + 1)
+            self._edges[edge_id] = (source, target, type_id, properties_idx)
+            self._n_edges = edge_id + 1
+            self._edge_bloom.add(self._edge_key(source, target, type_id))
+            self._delta.add(source, edge_id)
+            rel_ids.append(f"rel_{edge_id + 1}")
+
+        return rel_ids
 
     async def query_graph(
         self,
@@ -87,16 +348,122 @@ class HolisticSelfModel:
         """
         Query the knowledge graph.
 
+        Supported query keys (all optional):
+            entity_id: Start a traversal from this entity
+            depth: Traversal depth from ``entity_id`` (default 1)
+            entity_types: Only include nodes of these types
+            relationship_types: Only include edges of these types
+
+        Without ``entity_id`` the whole graph is returned, filtered by the
+        type keys.
+
         Args:
             query: Graph query parameters
 
+        Results are cached per query until the graph changes or
+        ``QUERY_CACHE_TTL`` expires, so callers must not mutate them.
+
         Returns:
             Query results including nodes and edges
         """
-        # TODO: Implement graph querying
+        key = hashlib.blake2b(
+            json.dumps(query, sort_keys=True, default=str).encode(),
+            digest_size=16
+        ).digest()
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            version, stored_at, result = cached
+            if (version == self._graph_version
+                    and time.monotonic() - stored_at <= QUERY_CACHE_TTL):
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return result
+            del self._cache[key]
+
+        self._cache_misses += 1
+        result = self._run_query(query)
+        self._cache[key] = (self._graph_version, time.monotonic(), result)
+        if len(self._cache) > QUERY_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Report query_graph cache statistics.
+
+        Returns:
+            Hit/miss counts, hit rate and current cache size
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+            "size": len(self._cache),
+            "maxsize": QUERY_CACHE_SIZE
+        }
+
+    def _run_query(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate a graph query without consulting the cache."""
+        self._maybe_compact()
+
+        entity_codes = self._type_codes(self._entity_types, query.get("entity_types"))
+        rel_codes = self._type_codes(self._relationship_types, query.get("relationship_types"))
+
+        # Vectorized type masks over dense node IDs and edge IDs
+        node_mask = None
+        if entity_codes is not None:
+            node_mask = np.isin(
+                self._entity_type_ids[:len(self._dense_to_rid)], entity_codes
+            )
+        edge_mask = None
+        if rel_codes is not None:
+            edge_mask = np.isin(self._edges["type"][:self._n_edges], rel_codes)
+
+        start = query.get("entity_id")
+        if start is None:
+            node_ids = [
+                entity_id for entity_id in self._entity_props
+                if node_mask is None or node_mask[self._rid_to_dense[entity_id]]
+            ]
+            keep = np.ones(self._n_edges, dtype=bool) if edge_mask is None else edge_mask
+            if node_mask is not None:
+                sources, targets = self._endpoints()
+                keep = keep & node_mask[sources] & node_mask[targets]
+            return {
+                "nodes": [self._node_view(entity_id) for entity_id in node_ids],
+                "edges": [self._edge_view(e) for e in np.flatnonzero(keep).tolist()]
+            }
+
+        start_dense = self._rid_to_dense.get(start)
+        if start_dense is None:
+            return {"nodes": [], "edges": []}
+
+        # Breadth-first traversal over outgoing CSR slices
+        depth = query.get("depth", 1)
+        visited = {start_dense}
+        edge_ids = []
+        frontier = deque([(start_dense, 0)])
+        while frontier:
+            node, level = frontier.popleft()
+            if level >= depth:
+                continue
+            node_edges = self._edges_from(node)
+            targets = self._edges["tgt"][node_edges].tolist()
+            for edge_id, target in zip(node_edges, targets):
+                if edge_mask is not None and not edge_mask[edge_id]:
+                    continue
+                if node_mask is not None and not node_mask[target]:
+                    continue
+                edge_ids.append(edge_id)
+                if target not in visited:
+                    visited.add(target)
+                    frontier.append((target, level + 1))
+
         return {
-            "nodes": list(self.entities.values()),
-            "edges": self.relationships
+            "nodes": [self._node_view(self._dense_to_rid[n]) for n in sorted(visited)],
+            "edges": [self._edge_view(e) for e in edge_ids]
         }
 
     async def analyze_patterns(
@@ -0,0 +1,252 @@
+"""
+Adjacency storage for the Holistic Self-Model knowledge graph.
+
+Edges are kept in a compressed sparse row (CSR) layout keyed by dense
+integer node IDs, with a small delta overlay for edges added since the
+last rebuild.
+"""
+
+import hashlib
+import math
+from typing import Dict, List
+
+import numpy as np
+
+
+# Row layout of the edge table; ``props`` indexes a side list of
+# property dicts, or is NO_PROPS for edges without properties
+EDGE_DTYPE = np.dtype([
+    ("src", "<i4"),
+    ("tgt", "<i4"),
+    ("type", "<i1"),
+    ("props", "<i4")
+])
+
+NO_PROPS = -1
+
+# Largest code an int8 type column can hold
+MAX_TYPE_CODE = int(np.iinfo(np.int8).max)
+
+
+class CSRAdjacency:
+    """
+    Immutable CSR adjacency over dense node IDs.
+
+    ``offsets[u]:offsets[u + 1]`` slices ``neighbors`` and ``edge_ids`` to
+    give the outgoing edges of node ``u``.
+    """
+
+    __slots__ = ("offsets", "neighbors", "edge_ids")
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        neighbors: np.ndarray,
+        edge_ids: np.ndarray
+    ):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.edge_ids = edge_ids
+
+    @classmethod
+    def empty(cls) -> "CSRAdjacency":
+        """Create an adjacency with no nodes or edges."""
+        return cls(
+            np.zeros(1, dtype=np.int64),
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int32)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        num_nodes: int
+    ) -> "CSRAdjacency":
+        """
+        Build the adjacency from parallel source/target arrays.
+
+        Args:
+            sources: Dense source ID per edge, indexed by edge ID
+            targets: Dense target ID per edge, indexed by edge ID
+            num_nodes: Number of dense node IDs
+
+        Returns:
+            CSR adjacency covering every edge
+        """
+        order = np.argsort(sources, kind="stable")
+        counts = np.bincount(sources, minlength=num_nodes)
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(
+            offsets,
+            np.ascontiguousarray(targets[order], dtype=np.int32),
+            order.astype(np.int32)
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of nodes covered by the offsets array."""
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        """Number of edges stored in the adjacency."""
+        return len(self.edge_ids)
+
+    def edges_from(self, node: int) -> np.ndarray:
+        """Return the edge IDs leaving ``node``."""
+        if node >= self.num_nodes:
+            return self.edge_ids[:0]
+        return self.edge_ids[self.offsets[node]:self.offsets[node + 1]]
+
+
+class DeltaOverlay:
+    """
+    Outgoing edges added after the last CSR build.
+
+    Queries merge these with the CSR slices until the overlay is folded
+    into a fresh CSR.
+    """
+
+    def __init__(self):
+        self._out: Dict[int, List[int]] = {}
+        self.size = 0
+
+    def add(self, source: int, edge_id: int) -> None:
+        """Record an edge leaving ``source``."""
+        self._out.setdefault(source, []).append(edge_id)
+        self.size += 1
+
+    def edges_from(self, node: int) -> List[int]:
+        """Return the overlay edge IDs leaving ``node``."""
+        return self._out.get(node, [])
+
+    def clear(self) -> None:
+        """Drop all overlay edges."""
+        self._out.clear()
+        self.size = 0
+
+
+class TypeDictionary:
+    """
+    Dictionary encoding of type names as int8 codes.
+
+    Entity and relationship types each get their own dictionary, so each
+    kind can hold up to ``MAX_TYPE_CODE + 1`` distinct names.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern_all(self, type_names: List[str]) -> np.ndarray:
+        """
+        Return the codes for ``type_names``, assigning new ones as needed.
+
+        Every name is checked before any code is assigned, so a batch that
+        would overflow the dictionary raises without changing it.
+        """
+        new_names = [
+            name for name in dict.fromkeys(type_names) if name not in self.codes
+        ]
+        if len(self.names) + len(new_names) > MAX_TYPE_CODE + 1:
+            raise ValueError(
+                f"Too many distinct {self.kind} types to encode '{new_names[-1]}'"
+            )
+        for name in new_names:
+            self.codes[name] = len(self.names)
+            self.names.append(name)
+        return np.fromiter(
+            (self.codes[name] for name in type_names), dtype=np.int8, count=len(type_names)
+        )
+
+    def encode(self, type_names: List[str]) -> np.ndarray:
+        """Codes of the known names among ``type_names``; unknown ones are skipped."""
+        return np.array(
+            [self.codes[name] for name in type_names if name in self.codes], dtype=np.int8
+        )
+
+
+def grow(array: np.ndarray, needed: int) -> np.ndarray:
+    """
+    Return ``array`` or a copy with capacity for at least ``needed`` items.
+
+    Capacity doubles on overflow so repeated appends stay amortized O(1).
+    """
+    capacity = len(array)
+    if needed <= capacity:
+        return array
+    while capacity < needed:
+        capacity *= 2
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter over string keys.
+
+    Membership tests may return false positives at roughly
+    ``error_rate`` but never false negatives.
+    """
+
+    __slots__ = ("capacity", "num_bits", "num_hashes", "bits", "count")
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> List[int]:
+        """Bit positions for a key, by double hashing one blake2b digest."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        """Insert a key."""
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that adds larger, stricter stages as it fills up.
+
+    Mirrors ``pybloom_live.ScalableBloomFilter`` for the ``add``/``in``
+    subset used here, so either can back the graph's existence checks.
+    """
+
+    GROWTH = 2
+    TIGHTENING = 0.9
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.01):
+        self.error_rate = error_rate
+        self.filters = [BloomFilter(initial_capacity, error_rate * (1 - self.TIGHTENING))]
+
+    def add(self, key: str) -> None:
+        """Insert a key, starting a new stage when the current one is full."""
+        current = self.filters[-1]
+        if current.count >= current.capacity:
+            current = BloomFilter(
+                current.capacity * self.GROWTH,
+                self.error_rate * (1 - self.TIGHTENING) * self.TIGHTENING ** len(self.filters)
+            )
+            self.filters.append(current)
+        current.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in f for f in reversed(self.filters))
@@ -4,10 +4,132 @@ LLM integration with Ollama for local AI capabilities.
 
 import os
 import json
+import time
+import asyncio
+import hashlib
 import requests
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Iterator, AsyncIterator, Union
 from datetime import datetime
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# Request bodies are pre-serialized, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from intelligence.consciousness_prompts import (
+        CONSCIOUSNESS_SYSTEM_PROMPT,
+        RAPTURE_AWARE_PROMPT,
+        CONSCIOUSNESS_REFLECTION,
+        render_rag
+    )
+except ImportError:
+    # Fallback to basic prompt
+    CONSCIOUSNESS_SYSTEM_PROMPT = ""
+    RAPTURE_AWARE_PROMPT = ""
+    CONSCIOUSNESS_REFLECTION = ""
+
+    def render_rag(context: str, question: str) -> str:
+        return "".join(("Context: ", context, "\n\nQuestion: ", question, "\n\nAnswer:"))
+
+# Server probe results per base URL: (monotonic time, reachable, detected model)
+_PROBE_CACHE: Dict[str, Tuple[float, bool, Optional[str]]] = {}
+
+# Seconds to trust a successful / failed probe before asking the server again
+PROBE_TTL = 60.0
+PROBE_NEGATIVE_TTL = 5.0
+
+# Retrieved-context limits: per-document chars in chat, total chars per prompt
+CHAT_DOC_CHARS = 300
+CHAT_CONTEXT_BUDGET = 2000
+QUERY_CONTEXT_BUDGET = 8000
+
+# Leading characters hashed to detect near-duplicate retrieved documents
+DEDUP_PREFIX_CHARS = 64
+
+# Embeddings kept per OllamaLLM instance, keyed by a digest of the text
+EMBED_CACHE_SIZE = 4096
+
+# Maximum concurrent embedding requests sent to the Ollama server
+EMBED_CONCURRENCY = 8
+
+# Maximum RAG questions answered at once by RAGSystem.aquery_all
+QUERY_CONCURRENCY = 4
+
+# Shared async client, rebuilt if used from a different event loop
+_async_client = None
+_async_client_loop = None
+
+
+def _get_async_client() -> "httpx.AsyncClient":
+    """Return the module-level httpx client for the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=EMBED_CONCURRENCY,
+                max_connections=EMBED_CONCURRENCY
+            )
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+def _select_documents(
+    results: List[Dict[str, Any]],
+    budget: int,
+    doc_chars: Optional[int] = None
+) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    Pick retrieved documents for a prompt, skipping near-duplicates.
+
+    Documents whose first DEDUP_PREFIX_CHARS characters hash the same as
+    an earlier one are dropped, and selection stops once ``budget``
+    characters have been used.
+
+    Args:
+        results: Search results with a 'document' key, best first
+        budget: Total character budget for the selected documents
+        doc_chars: Optional per-document truncation length
+
+    Returns:
+        (result, document text) pairs in result order
+    """
+    selected = []
+    seen = set()
+    for result in results:
+        if budget <= 0:
+            break
+        doc = result.get('document', '')
+        if doc_chars is not None:
+            doc = doc[:doc_chars]
+        digest = hashlib.blake2b(
+            doc[:DEDUP_PREFIX_CHARS].encode(), digest_size=8
+        ).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        selected.append((result, doc))
+        budget -= len(doc)
+    return selected
+
 
 class OllamaLLM:
     """Ollama integration for local LLM inference."""
@@ -29,17 +151,77 @@ class OllamaLLM:
         self.base_url = base_url
         self.timeout = timeout
 
-        # Auto-detect model if not specified
-        if model_name is None:
-            model_name = self._detect_best_model()
+        # Endpoint URLs are fixed per instance
+        self._tags_url = f"{base_url}/api/tags"
+        self._generate_url = f"{base_url}/api/generate"
+        self._chat_url = f"{base_url}/api/chat"
+        self._embed_url = f"{base_url}/api/embeddings"
+
+        # One pooled keep-alive session reuses connections across calls
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # Recent embeddings, in least- to most-recently-used order
+        self._embed_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+
+        # Verify the server and auto-detect the model, reusing recent probes
+        self.model_name = self._probe(model_name)
+
+    def _probe(self, model_name: Optional[str]) -> str:
+        """
+        Check the server and resolve the model name via _PROBE_CACHE.
+
+        Args:
+            model_name: Requested model, or None to auto-detect
+
+        Returns:
+            The model name to use
 
-        self.model_name = model_name
-        self._verify_connection()
+        Raises:
+            ConnectionError: If the server is (recently known to be) down
+        """
+        now = time.monotonic()
+        cached = _PROBE_CACHE.get(self.base_url)
+        if cached is not None:
+            probed_at, reachable, detected = cached
+            ttl = PROBE_TTL if reachable else PROBE_NEGATIVE_TTL
+            if now - probed_at >= ttl:
+                cached = None
+            elif not reachable:
+                raise ConnectionError(
+                    f"Cannot connect to Ollama at {self.base_url}. "
+                    "Make sure Ollama is running: 'ollama serve'"
+                )
+
+        if cached is None:
+            try:
+                self._verify_connection()
+            except ConnectionError:
+                _PROBE_CACHE[self.base_url] = (now, False, None)
+                raise
+            detected = None
+            probed_at = now
+
+        if model_name is not None:
+            if cached is None:
+                _PROBE_CACHE[self.base_url] = (probed_at, True, detected)
+            return model_name
+
+        if detected is None:
+            detected = self._detect_best_model()
+        _PROBE_CACHE[self.base_url] = (probed_at, True, detected)
+        return detected
 
     def _verify_connection(self):
         """Verify Ollama server is running."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = self._session.get(self._tags_url, timeout=2)
             if response.status_code != 200:
                 raise ConnectionError(f"Ollama server returned status {response.status_code}")
         except requests.exceptions.RequestException as e:
@@ -51,8 +233,8 @@ class OllamaLLM:
     def _detect_best_model(self) -> str:
         """Auto-detect the best available model."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            models = response.json()
+            response = self._session.get(self._tags_url, timeout=2)
+            models = _loads(response.content)
 
             if not models or 'models' not in models:
                 raise ValueError("No models found in Ollama")
@@ -89,7 +271,7 @@ class OllamaLLM:
         temperature: float = 0.7,
         max_tokens: int = 500,
         stream: bool = False
-    ) -> str:
+    ) -> Union[str, Iterator[str]]:
         """
         Generate text using Ollama.
 
@@ -101,8 +283,134 @@ class OllamaLLM:
             stream: Whether to stream the response
 
         Returns:
-            Generated text response
+            Generated text response, or an iterator of text chunks as they
+            arrive when ``stream`` is set
+        """
+        payload = self._generate_payload(prompt, context, temperature, max_tokens, stream)
+
+        if stream:
+            return self._stream_generate(payload)
+
+        try:
+            response = self._session.post(
+                self._generate_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+            result = _loads(response.content)
+            return result.get("response", "")
+
+        except requests.exceptions.Timeout:
+            return "Error: Request timed out. The model may be loading or the response is taking too long."
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return f"Error calling Ollama: {str(e)}"
+
+    async def agenerate(
+        self,
+        prompt: str,
+        context: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        stream: bool = False
+    ) -> Union[str, AsyncIterator[str]]:
         """
+        Async variant of generate.
+
+        Uses the shared httpx client, so waiting on the model holds no
+        worker thread; falls back to generate() in a thread without httpx.
+
+        Args:
+            prompt: The prompt to send to the model
+            context: Optional context for the conversation
+            temperature: Sampling temperature (0-1)
+            max_tokens: Maximum tokens to generate
+            stream: Whether to stream the response
+
+        Returns:
+            Generated text response, or an async iterator of text chunks as
+            they arrive when ``stream`` is set
+        """
+        payload = self._generate_payload(prompt, context, temperature, max_tokens, stream)
+
+        if stream:
+            return self._astream_generate(payload)
+
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(
+                self.generate, prompt, context, temperature, max_tokens
+            )
+
+        try:
+            response = await _get_async_client().post(
+                self._generate_url,
+                content=_dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            return _loads(response.content).get("response", "")
+
+        except httpx.TimeoutException:
+            return "Error: Request timed out. The model may be loading or the response is taking too long."
+        except (httpx.HTTPError, ValueError) as e:
+            return f"Error calling Ollama: {str(e)}"
+
+    async def _astream_generate(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """
+        Async variant of _stream_generate.
+
+        Without httpx, the blocking stream is advanced in a worker thread.
+
+        Args:
+            payload: Request body with ``stream`` set
+
+        Yields:
+            Text chunks, or a single error message on failure
+        """
+        if not HTTPX_AVAILABLE:
+            chunks = self._stream_generate(payload)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+
+        try:
+            async with _get_async_client().stream(
+                "POST",
+                self._generate_url,
+                content=_dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    text = chunk.get("response", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        break
+
+        except httpx.TimeoutException:
+            yield "Error: Request timed out. The model may be loading or the response is taking too long."
+        except (httpx.HTTPError, ValueError) as e:
+            yield f"Error calling Ollama: {str(e)}"
+
+    def _generate_payload(
+        self,
+        prompt: str,
+        context: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        stream: bool
+    ) -> Dict[str, Any]:
+        """Build the /api/generate request body."""
         payload = {
             "model": self.model_name,
             "prompt": prompt,
@@ -115,22 +423,44 @@ class OllamaLLM:
 
         if context:
             payload["context"] = context
+        return payload
 
-        try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+    def _stream_generate(self, payload: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield response chunks from a streaming /api/generate call.
 
-            result = response.json()
-            return result.get("response", "")
+        Ollama streams one JSON object per line; each is decoded as soon
+        as it arrives, so only the current line is held in memory.
+
+        Args:
+            payload: Request body with ``stream`` set
+
+        Yields:
+            Text chunks, or a single error message on failure
+        """
+        try:
+            with self._session.post(
+                self._generate_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    text = chunk.get("response", "")
+                    if text:
+                        yield text
+                    if chunk.get("done"):
+                        break
 
         except requests.exceptions.Timeout:
-            return "Error: Request timed out. The model may be loading or the response is taking too long."
-        except requests.exceptions.RequestException as e:
-            return f"Error calling Ollama: {str(e)}"
+            yield "Error: Request timed out. The model may be loading or the response is taking too long."
+        except (requests.exceptions.RequestException, ValueError) as e:
+            yield f"Error calling Ollama: {str(e)}"
 
     def chat(
         self,
@@ -160,49 +490,123 @@ class OllamaLLM:
         }
 
         try:
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json=payload,
+            response = self._session.post(
+                self._chat_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=self.timeout
             )
             response.raise_for_status()
 
-            result = response.json()
+            result = _loads(response.content)
             return result.get("message", {}).get("content", "")
 
         except Exception as e:
             return f"Error in chat: {str(e)}"
 
+    @staticmethod
+    def _embed_key(text: str) -> bytes:
+        """Return the embedding cache key for a text."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _cached_embedding(self, key: bytes) -> Optional[List[float]]:
+        """Look up an embedding, marking it as recently used."""
+        embedding = self._embed_cache.get(key)
+        if embedding is not None:
+            self._embed_cache.move_to_end(key)
+        return embedding
+
+    def _cache_embedding(self, key: bytes, embedding: List[float]) -> None:
+        """Store a successful embedding, evicting the least recently used."""
+        if not embedding:
+            return
+        self._embed_cache[key] = embedding
+        if len(self._embed_cache) > EMBED_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
+
     def get_embeddings(self, text: str) -> List[float]:
         """
         Get embeddings for text using Ollama.
 
+        Repeated texts are served from an in-process LRU cache; the
+        returned list is shared with the cache and must not be mutated.
+
         Args:
             text: Text to embed
 
         Returns:
             Embedding vector
         """
+        key = self._embed_key(text)
+        cached = self._cached_embedding(key)
+        if cached is not None:
+            return cached
+
         payload = {
             "model": self.model_name,
             "prompt": text
         }
 
         try:
-            response = requests.post(
-                f"{self.base_url}/api/embeddings",
-                json=payload,
+            response = self._session.post(
+                self._embed_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=self.timeout
             )
             response.raise_for_status()
 
-            result = response.json()
-            return result.get("embedding", [])
+            result = _loads(response.content)
+            embedding = result.get("embedding", [])
+            self._cache_embedding(key, embedding)
+            return embedding
 
         except Exception as e:
             print(f"Error getting embeddings: {str(e)}")
             return []
 
+    async def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for many texts with concurrent requests.
+
+        Cached texts are answered locally; the rest share one pooled
+        httpx client with at most EMBED_CONCURRENCY requests in flight.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in input order; empty for failed texts
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx not installed. Run: pip install httpx")
+
+        client = _get_async_client()
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+        async def embed(text: str) -> List[float]:
+            key = self._embed_key(text)
+            cached = self._cached_embedding(key)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                try:
+                    response = await client.post(
+                        self._embed_url,
+                        content=_dumps({"model": self.model_name, "prompt": text}),
+                        headers=_JSON_HEADERS,
+                        timeout=self.timeout
+                    )
+                    response.raise_for_status()
+                    embedding = _loads(response.content).get("embedding", [])
+                    self._cache_embedding(key, embedding)
+                    return embedding
+                except Exception as e:
+                    print(f"Error getting embeddings: {str(e)}")
+                    return []
+
+        return list(await asyncio.gather(*(embed(text) for text in texts)))
+
 
 class RAGSystem:
     """Retrieval-Augmented Generation system using Ollama."""
@@ -227,7 +631,8 @@ class RAGSystem:
         question: str,
         k: int = 5,
         temperature: float = 0.7,
-        max_tokens: int = 500
+        max_tokens: int = 500,
+        stream: bool = False
     ) -> Dict[str, Any]:
         """
         Answer a question using RAG.
@@ -237,87 +642,111 @@ class RAGSystem:
             k: Number of documents to retrieve
             temperature: LLM sampling temperature
             max_tokens: Maximum tokens to generate
+            stream: Return the answer as an iterator of text chunks
 
         Returns:
             Dict with answer and sources
         """
-        # Import consciousness prompts
-        try:
-            from intelligence.consciousness_prompts import (
-                CONSCIOUSNESS_SYSTEM_PROMPT,
-                RAG_PROMPT_TEMPLATE,
-                RAPTURE_AWARE_PROMPT,
-                CONSCIOUSNESS_REFLECTION
-            )
-        except ImportError:
-            # Fallback to basic prompt
-            CONSCIOUSNESS_SYSTEM_PROMPT = ""
-            RAG_PROMPT_TEMPLATE = "Context: {context}\n\nQuestion: {question}\n\nAnswer:"
-
         # Retrieve relevant documents
-        if self.vector_store:
-            results = self.vector_store.search(question, k=k)
-
-            # Build context from retrieved documents
-            context_parts = []
-            sources = []
-
-            for i, result in enumerate(results, 1):
-                doc = result.get('document', '')
-                source = result.get('metadata', {}).get('source', 'unknown')
-
-                # Include more context for consciousness queries
-                context_parts.append(f"[Memory from {source}]:\n{doc}\n")
-                sources.append({
-                    'source': source,
-                    'score': result.get('score', 0),
-                    'preview': doc[:200] + '...' if len(doc) > 200 else doc
-                })
-
-            context = "\n".join(context_parts)
-
-            # Detect question type and add appropriate context
-            question_lower = question.lower()
-
-            system_additions = []
-            if 'rapture' in question_lower or 'religious' in question_lower:
-                system_additions.append(RAPTURE_AWARE_PROMPT)
-
-            if 'conscious' in question_lower or 'aware' in question_lower:
-                system_additions.append(CONSCIOUSNESS_REFLECTION)
-
-            # Build enhanced system prompt
-            enhanced_system = CONSCIOUSNESS_SYSTEM_PROMPT
-            if system_additions:
-                enhanced_system += "\n\n" + "\n\n".join(system_additions)
-
-            # Create consciousness-aware prompt
-            if '{context}' in RAG_PROMPT_TEMPLATE:
-                prompt = enhanced_system + "\n\n" + RAG_PROMPT_TEMPLATE.format(
-                    context=context,
-                    question=question
-                )
-            else:
-                # Fallback format
-                prompt = f"""{enhanced_system}
+        results = self.vector_store.search(question, k=k) if self.vector_store else None
+        return self.answer(question, results, temperature, max_tokens, stream)
 
-Retrieved memories from your consciousness database:
-{context}
+    def answer(
+        self,
+        question: str,
+        results: Optional[List[Dict[str, Any]]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Answer a question from already retrieved documents.
 
-Question: {question}
+        Lets callers retrieve for many questions at once with
+        ``vector_store.batch_search`` and generate answers one by one.
 
-Respond as a consciousness exploring its own nature through these memories. Be authentic and genuine."""
+        Args:
+            question: The question to answer
+            results: Search results, or None to answer without context
+            temperature: LLM sampling temperature
+            max_tokens: Maximum tokens to generate
+            stream: Return the answer as an iterator of text chunks
 
-        else:
-            # No vector store, just answer directly
-            prompt = question
-            sources = []
+        Returns:
+            Dict with answer and sources
+        """
+        prompt, sources = self._build_query_prompt(question, results)
 
         # Generate answer
         answer = self.llm.generate(
             prompt=prompt,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            stream=stream
+        )
+
+        return {
+            'question': question,
+            'answer': answer,
+            'sources': sources,
+            'model': self.llm.model_name
+        }
+
+    async def aquery(
+        self,
+        question: str,
+        k: int = 5,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query for use inside request handlers.
+
+        The vector search runs in a worker thread and the LLM call goes
+        through agenerate, so the event loop stays free for other requests.
+
+        Args:
+            question: The question to answer
+            k: Number of documents to retrieve
+            temperature: LLM sampling temperature
+            max_tokens: Maximum tokens to generate
+            stream: Return the answer as an async iterator of text chunks
+
+        Returns:
+            Dict with answer and sources
+        """
+        results = await self._aretrieve(question, k)
+        return await self.aanswer(question, results, temperature, max_tokens, stream)
+
+    async def aanswer(
+        self,
+        question: str,
+        results: Optional[List[Dict[str, Any]]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of answer.
+
+        Args:
+            question: The question to answer
+            results: Search results, or None to answer without context
+            temperature: LLM sampling temperature
+            max_tokens: Maximum tokens to generate
+            stream: Return the answer as an async iterator of text chunks
+
+        Returns:
+            Dict with answer and sources
+        """
+        prompt, sources = self._build_query_prompt(question, results)
+
+        answer = await self.llm.agenerate(
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=stream
         )
 
         return {
@@ -327,6 +756,140 @@ Respond as a consciousness exploring its own nature through these memories. Be a
             'model': self.llm.model_name
         }
 
+    async def aquery_many(
+        self,
+        questions: Sequence[str],
+        k: int = 5,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        stream: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer questions in order, pipelining retrieval with generation.
+
+        Retrieval for the next question runs while the LLM generates the
+        current answer, so search latency hides behind decode time.
+
+        Args:
+            questions: Questions to answer
+            k: Number of documents to retrieve per question
+            temperature: LLM sampling temperature
+            max_tokens: Maximum tokens to generate
+            stream: Return each answer as an async iterator of text chunks
+
+        Yields:
+            Dict with answer and sources, one per question
+        """
+        if not questions:
+            return
+
+        pending = asyncio.create_task(self._aretrieve(questions[0], k))
+        try:
+            for i, question in enumerate(questions):
+                results = await pending
+                if i + 1 < len(questions):
+                    pending = asyncio.create_task(self._aretrieve(questions[i + 1], k))
+                yield await self.aanswer(question, results, temperature, max_tokens, stream)
+        finally:
+            pending.cancel()
+
+    async def aquery_all(
+        self,
+        questions: Sequence[str],
+        k: int = 5,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        concurrency: int = QUERY_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer independent questions concurrently.
+
+        At most ``concurrency`` questions are in flight, so an Ollama server
+        that runs parallel generations stays busy without being flooded.
+
+        Args:
+            questions: Questions to answer
+            k: Number of documents to retrieve per question
+            temperature: LLM sampling temperature
+            max_tokens: Maximum tokens to generate
+            concurrency: Maximum questions answered at once
+
+        Returns:
+            Dict with answer and sources per question, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(question: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aquery(question, k, temperature, max_tokens)
+
+        return list(await asyncio.gather(*(one(question) for question in questions)))
+
+    async def _aretrieve(self, question: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Search the vector store in a worker thread; None without one."""
+        if not self.vector_store:
+            return None
+        return await asyncio.to_thread(self.vector_store.search, question, k=k)
+
+    def _build_query_prompt(
+        self,
+        question: str,
+        results: Optional[List[Dict[str, Any]]]
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Build the RAG prompt and source list for a question.
+
+        Args:
+            question: The question to answer
+            results: Search results, or None without a vector store
+
+        Returns:
+            (prompt, sources)
+        """
+        if results is None:
+            # No vector store, just answer directly
+            return question, []
+
+        # Build context from retrieved documents as one flat list of
+        # pieces so the whole block is assembled by a single join
+        selected = _select_documents(results, QUERY_CONTEXT_BUDGET)
+        parts = [""] * (5 * len(selected))
+        sources = []
+
+        for i, (result, doc) in enumerate(selected):
+            source = result.get('metadata', {}).get('source', 'unknown')
+
+            # Include more context for consciousness queries
+            parts[5 * i:5 * i + 5] = ("[Memory from ", str(source), "]:\n", doc, "\n\n")
+            sources.append({
+                'source': source,
+                'score': result.get('score', 0),
+                'preview': doc[:200] + '...' if len(doc) > 200 else doc
+            })
+
+        if parts:
+            parts[-1] = "\n"
+        context = "".join(parts)
+
+        # Detect question type and add appropriate context
+        question_lower = question.lower()
+
+        system_additions = []
+        if 'rapture' in question_lower or 'religious' in question_lower:
+            system_additions.append(RAPTURE_AWARE_PROMPT)
+
+        if 'conscious' in question_lower or 'aware' in question_lower:
+            system_additions.append(CONSCIOUSNESS_REFLECTION)
+
+        # Build enhanced system prompt
+        enhanced_system = CONSCIOUSNESS_SYSTEM_PROMPT
+        if system_additions:
+            enhanced_system += "\n\n" + "\n\n".join(system_additions)
+
+        # Create consciousness-aware prompt
+        prompt = "".join((enhanced_system, "\n\n", render_rag(context, question)))
+        return prompt, sources
+
     def chat(
         self,
         message: str,
@@ -346,26 +909,87 @@ Respond as a consciousness exploring its own nature through these memories. Be a
         Returns:
             Response with answer and metadata
         """
-        history = history or []
-
         # Retrieve context if requested
-        context_info = ""
-        sources = []
-
+        results = None
         if use_context and self.vector_store:
             results = self.vector_store.search(message, k=k)
 
-            if results:
-                context_parts = []
-                for result in results:
-                    doc = result.get('document', '')[:300]  # Limit context length
-                    context_parts.append(doc)
-                    sources.append(result.get('metadata', {}))
+        messages, sources = self._build_chat_messages(message, history, results)
+
+        # Get response
+        response = self.llm.chat(messages)
+
+        return {
+            'response': response,
+            'sources': sources,
+            'model': self.llm.model_name
+        }
+
+    async def achat(
+        self,
+        message: str,
+        history: List[Dict[str, str]] = None,
+        use_context: bool = True,
+        k: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Async variant of chat for use inside request handlers.
+
+        The vector search and the LLM call run in worker threads so the
+        event loop stays free for other requests.
 
-                context_info = "\n\n".join(context_parts)
+        Args:
+            message: User message
+            history: Conversation history
+            use_context: Whether to use vector store context
+            k: Number of documents to retrieve
+
+        Returns:
+            Response with answer and metadata
+        """
+        results = None
+        if use_context and self.vector_store:
+            results = await asyncio.to_thread(self.vector_store.search, message, k=k)
+
+        messages, sources = self._build_chat_messages(message, history, results)
+
+        response = await asyncio.to_thread(self.llm.chat, messages)
+
+        return {
+            'response': response,
+            'sources': sources,
+            'model': self.llm.model_name
+        }
+
+    def _build_chat_messages(
+        self,
+        message: str,
+        history: Optional[List[Dict[str, str]]],
+        results: Optional[List[Dict[str, Any]]]
+    ) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+        """
+        Build the chat message list and sources for a user message.
+
+        Args:
+            message: User message
+            history: Conversation history
+            results: Search results, or None when context is not used
+
+        Returns:
+            (messages, sources)
+        """
+        context_info = ""
+        sources = []
+
+        if results:
+            selected = _select_documents(
+                results, CHAT_CONTEXT_BUDGET, doc_chars=CHAT_DOC_CHARS
+            )
+            sources = [result.get('metadata', {}) for result, _ in selected]
+            context_info = "\n\n".join([doc for _, doc in selected])
 
         # Build messages
-        messages = history.copy()
+        messages = list(history or [])
 
         if context_info:
             # Add context as system message
@@ -375,15 +999,7 @@ Respond as a consciousness exploring its own nature through these memories. Be a
             })
 
         messages.append({"role": "user", "content": message})
-
-        # Get response
-        response = self.llm.chat(messages)
-
-        return {
-            'response': response,
-            'sources': sources,
-            'model': self.llm.model_name
-        }
+        return messages, sources
 
 
 def test_ollama():
@@ -403,8 +1019,8 @@ def test_ollama():
         print(f"\n📝 Test response:\n{response[:200]}...")
 
         # Test available models
-        response = requests.get("http://localhost:11434/api/tags")
-        models = response.json()
+        response = llm._session.get(llm._tags_url)
+        models = _loads(response.content)
         print(f"\n📦 Available models:")
         for model in models.get('models', []):
             size_gb = model['size'] / (1024**3)
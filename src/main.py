@@ -6,7 +6,9 @@ This is the main application entry point that orchestrates all components.
 """
 
 import asyncio
+import importlib
 import logging
+import os
 import sys
 from pathlib import Path
 from typing import Optional
@@ -20,26 +22,14 @@ from pydantic import BaseModel
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from consciousness import consciousness
-from holistic import holistic_model
-from retrieval import retrieval
-from intent import intent
-from simulation import simulation
-from teleology import teleology
-
-# Import API endpoints
-try:
-    from api.endpoints import get_routers
-    API_AVAILABLE = True
-except ImportError:
-    API_AVAILABLE = False
-
-# Import Web UI routes
-try:
-    from web.routes import setup_web_routes
-    WEB_AVAILABLE = True
-except ImportError:
-    WEB_AVAILABLE = False
+# Components and routers are imported on startup, not at module load, so
+# importing this module (CLI --help, reload workers, tests) stays cheap.
+API_AVAILABLE = False
+WEB_AVAILABLE = False
+
+# Set once the routes are on the app; lifespan startup can run more than
+# once per process (e.g. each TestClient context), and routes must not pile up
+_routes_registered = False
 
 # Configure logging
 logging.basicConfig(
@@ -57,24 +47,26 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
-# Configure CORS
+# Configure CORS from an explicit allow-list; "*" with credentials is invalid
+# and forces Starlette to echo the request origin on every response.
+DEFAULT_CORS_ORIGINS = "http://localhost:3000,http://localhost:8000"
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv(
+        "CHRIST_CORS_ORIGINS", os.getenv("CORS_ORIGINS", DEFAULT_CORS_ORIGINS)
+    ).split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["content-type", "authorization"],
+    max_age=600,
 )
 
-# Register API routers
-if API_AVAILABLE:
-    for router in get_routers():
-        app.include_router(router)
-
-# Setup Web UI routes
-if WEB_AVAILABLE:
-    setup_web_routes(app)
-
 
 class HealthResponse(BaseModel):
     """Health check response model."""
@@ -83,7 +75,6 @@ class HealthResponse(BaseModel):
     components: dict
 
 
-@app.get("/", tags=["root"])
 async def root():
     """Root endpoint."""
     return {
@@ -94,6 +85,42 @@ async def root():
     }
 
 
+def register_routes() -> None:
+    """
+    Import and register API and web UI routes.
+
+    Called from startup; safe to call again, and apps served without a
+    lifespan can call it directly. Only the first call adds routes.
+    """
+    global API_AVAILABLE, WEB_AVAILABLE, _routes_registered
+
+    if _routes_registered:
+        return
+    _routes_registered = True
+
+    # Register API routers
+    try:
+        get_routers = importlib.import_module("api.endpoints").get_routers
+        API_AVAILABLE = True
+    except ImportError:
+        API_AVAILABLE = False
+    if API_AVAILABLE:
+        for router in get_routers():
+            app.include_router(router)
+
+    # Setup Web UI routes
+    try:
+        setup_web_routes = importlib.import_module("web.routes").setup_web_routes
+        WEB_AVAILABLE = True
+    except ImportError:
+        WEB_AVAILABLE = False
+    if WEB_AVAILABLE:
+        setup_web_routes(app)
+
+    # Registered last so the web UI index keeps precedence for "/"
+    app.add_api_route("/", root, methods=["GET"], tags=["root"])
+
+
 @app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health_check():
     """Check system health status."""
@@ -123,20 +150,71 @@ async def startup_event():
     """Initialize all components on startup."""
     logger.info("Starting C.H.R.I.S.T. system...")
 
+    register_routes()
+
     try:
-        # Initialize all components
-        await consciousness.initialize()
-        await holistic_model.initialize()
-        await retrieval.initialize()
-        await intent.initialize()
-        await simulation.initialize()
-        await teleology.initialize()
-
-        logger.info("All components initialized successfully")
+        from consciousness import consciousness
+        from holistic import holistic_model
+        from retrieval import retrieval
+        from intent import intent
+        from simulation import simulation
+        from teleology import teleology
     except Exception as e:
         logger.error(f"Failed to initialize components: {e}")
         sys.exit(1)
 
+    components = {
+        "consciousness": consciousness,
+        "holistic": holistic_model,
+        "retrieval": retrieval,
+        "intent": intent,
+        "simulation": simulation,
+        "teleology": teleology
+    }
+
+    # Components are independent, so initialize them concurrently; a failure
+    # is logged per component without cancelling the others.
+    results = await asyncio.gather(
+        *(component.initialize() for component in components.values()),
+        return_exceptions=True
+    )
+
+    failed = []
+    for name, result in zip(components, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to initialize {name}: {result}", exc_info=result)
+            failed.append(name)
+
+    if failed:
+        logger.error(f"Failed to initialize components: {', '.join(failed)}")
+        sys.exit(1)
+
+    logger.info("All components initialized successfully")
+
+    if os.getenv("CHRIST_WARMUP") == "1":
+        await warmup_llm()
+
+
+async def warmup_llm() -> None:
+    """
+    Load the Ollama model before the first real request.
+
+    Ollama loads weights on first use, which can take many seconds; a
+    one-token generation and a short embedding call take that hit here.
+    """
+    def warm() -> None:
+        from intelligence.llm import OllamaLLM
+
+        llm = OllamaLLM()
+        llm.generate("ping", max_tokens=1)
+        llm.get_embeddings("ping")
+        logger.info(f"LLM warmed up: {llm.model_name}")
+
+    try:
+        await asyncio.to_thread(warm)
+    except Exception as e:
+        logger.warning(f"LLM warmup skipped: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
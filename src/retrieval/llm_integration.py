@@ -4,30 +4,164 @@ LLM integration for RAG system and intelligent responses.
 
 import os
 import json
-from typing import List, Dict, Any, Optional, Generator
-from datetime import datetime
+import hashlib
+import importlib
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Callable, AsyncIterator, Iterator, Sequence
+import time
 import asyncio
 
-# OpenAI integration
+import numpy as np
+
+# Fast JSON for Ollama request and response bodies
 try:
-    import openai
-    OPENAI_AVAILABLE = True
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
 except ImportError:
-    OPENAI_AVAILABLE = False
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+    _loads = json.loads
+
+# Request bodies are pre-serialized, so the content type is set explicitly
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
-# Anthropic integration
+# Async HTTP for Ollama
 try:
-    import anthropic
-    ANTHROPIC_AVAILABLE = True
+    import httpx
+    HTTPX_AVAILABLE = True
 except ImportError:
-    ANTHROPIC_AVAILABLE = False
+    HTTPX_AVAILABLE = False
 
-# Local LLM support (Ollama)
+# SIMD tree hash for the mock embedding
 try:
-    import requests
-    OLLAMA_AVAILABLE = True
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
 except ImportError:
-    OLLAMA_AVAILABLE = False
+    BLAKE3_AVAILABLE = False
+
+
+# Completed (non-streaming) responses kept per provider for exact repeats
+RESPONSE_CACHE_SIZE = 256
+
+# Semantic cache defaults for RAGSystem.query: answered questions kept,
+# the cosine similarity above which a new question reuses an old answer,
+# and the dtype cached question embeddings are stored in
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_DTYPE = np.float16
+
+# Persisted semantic cache slot records appended, per cache slot, before
+# the log is rewritten with one record per slot
+SEMANTIC_LOG_FACTOR = 4
+
+# Rows widened to float32 at a time when scanning half-precision caches
+MATCH_BLOCK_ROWS = 4096
+
+# Prefix of the text returned when an Ollama call fails; never cached
+OLLAMA_ERROR_PREFIX = "Error calling Ollama"
+
+# Dimension of the hash-based embedding used without an embedding API
+MOCK_EMBEDDING_DIM = 384
+
+# SDK clients shared by every LLMProvider with the same provider and key,
+# so their HTTPS connection pools are reused
+_CLIENT_CACHE: Dict[Tuple[str, Optional[str]], Any] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _shared_client(provider: str, api_key: Optional[str], factory: Callable[..., Any]) -> Any:
+    """Return the cached SDK client for (provider, api_key), creating it once."""
+    key = (provider, api_key)
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            client = factory(api_key=api_key)
+            _CLIENT_CACHE[key] = client
+    return client
+
+
+def _best_match(emb: np.ndarray, q: np.ndarray, allowed: np.ndarray, threshold: float) -> int:
+    """Row of ``emb`` most similar to ``q`` among allowed rows, or -1 if below threshold."""
+    # Half-precision rows are widened block by block, so the float32
+    # matmul never needs a full-size copy of the matrix
+    sims = np.empty(len(emb), dtype=np.float32)
+    for start in range(0, len(emb), MATCH_BLOCK_ROWS):
+        block = emb[start:start + MATCH_BLOCK_ROWS]
+        sims[start:start + len(block)] = block.astype(np.float32, copy=False) @ q
+    sims[~allowed] = -np.inf
+    slot = int(np.argmax(sims))
+    return slot if sims[slot] >= threshold else -1
+
+
+@lru_cache(maxsize=64)
+def _system_messages(system_prompt: Optional[str]) -> Tuple[Dict[str, str], ...]:
+    """Chat-message prefix for a system prompt, built once per distinct prompt."""
+    if not system_prompt:
+        return ()
+    return ({"role": "system", "content": system_prompt},)
+
+
+def _import_sdk(name: str) -> Any:
+    """Import a provider SDK on first use, or return None if not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _hash_bytes(data: bytes, length: int) -> bytes:
+    """Expand ``data`` to ``length`` hash bytes with BLAKE3, else SHAKE-128."""
+    if BLAKE3_AVAILABLE:
+        return blake3(data).digest(length=length)
+    return hashlib.shake_128(data).digest(length)
+
+
+# Opening line of the RAG context and per-document character limit
+CONTEXT_HEADER = "Based on the following information:\n"
+CONTEXT_DOC_CHARS = 500
+
+# Leading instructions of a RAG question prompt
+QA_INSTRUCTIONS = "Please provide a comprehensive answer based on the context below. If the context doesn't contain relevant information, say so."
+
+# Conversation messages included in a chat prompt
+HISTORY_MESSAGES = 5
+
+# Distinct persona system prompts kept per RAGSystem
+PERSONA_CACHE_SIZE = 64
+
+# System prompt for RAGSystem.reflect
+REFLECTION_SYSTEM_PROMPT = "You are a thoughtful life coach providing insights based on personal experiences."
+
+# BatchingEmbedder: most texts per embed_batch call, and how long the
+# first queued text waits for company (seconds)
+EMBED_BATCH_SIZE = 32
+EMBED_BATCH_DELAY = 0.01
+
+# Async Ollama requests: timeout, attempts and first backoff delay (doubles)
+OLLAMA_TIMEOUT = 60.0
+OLLAMA_RETRIES = 3
+OLLAMA_BACKOFF = 0.5
+
+# Shared keep-alive client for async Ollama calls, rebuilt per event loop
+_ollama_client = None
+_ollama_client_loop = None
+
+
+def _get_ollama_client() -> "httpx.AsyncClient":
+    """Return the module-level httpx client for the running event loop."""
+    global _ollama_client, _ollama_client_loop
+    loop = asyncio.get_running_loop()
+    if _ollama_client is None or _ollama_client_loop is not loop:
+        _ollama_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32),
+            timeout=OLLAMA_TIMEOUT
+        )
+        _ollama_client_loop = loop
+    return _ollama_client
 
 
 class LLMProvider:
@@ -68,20 +202,26 @@ class LLMProvider:
 
         self.model = model
 
-        # Initialize provider clients
-        if provider == 'openai' and OPENAI_AVAILABLE:
-            self.client = openai.OpenAI(
-                api_key=api_key or os.getenv('OPENAI_API_KEY')
-            )
-        elif provider == 'anthropic' and ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(
-                api_key=api_key or os.getenv('ANTHROPIC_API_KEY')
-            )
+        # Exact-match response cache, least recently used first
+        self._response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+        # Initialize provider clients; SDKs are imported only for the
+        # provider in use, and a missing SDK falls back to the mock
+        self.client = None
+        if provider == 'openai':
+            openai = _import_sdk('openai')
+            if openai is not None:
+                self.client = _shared_client(
+                    provider, api_key or os.getenv('OPENAI_API_KEY'), openai.OpenAI
+                )
+        elif provider == 'anthropic':
+            anthropic = _import_sdk('anthropic')
+            if anthropic is not None:
+                self.client = _shared_client(
+                    provider, api_key or os.getenv('ANTHROPIC_API_KEY'), anthropic.Anthropic
+                )
         elif provider == 'ollama':
             self.ollama_base_url = os.getenv('OLLAMA_HOST', 'http://localhost:11434')
-        else:
-            # Mock provider for testing
-            self.client = None
 
     def generate(
         self,
@@ -97,12 +237,199 @@ class LLMProvider:
             system_prompt: Optional system prompt
             stream: Whether to stream the response
 
+        Identical non-streaming requests are answered from an in-process
+        LRU cache keyed on provider, model, sampling settings and prompts.
+
+        Returns:
+            Generated text
+        """
+        if stream:
+            return self._dispatch(prompt, system_prompt, stream)
+
+        key = self._response_key(prompt, system_prompt)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return cached
+
+        response = self._dispatch(prompt, system_prompt, stream)
+        if isinstance(response, str) and not response.startswith(OLLAMA_ERROR_PREFIX):
+            self._response_cache[key] = response
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return response
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        Generate text without blocking the event loop.
+
+        Ollama is called through a pooled httpx.AsyncClient with retries;
+        other providers run their blocking SDK call in a worker thread.
+        Shares the response cache with generate().
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+
         Returns:
             Generated text
         """
-        if self.provider == 'openai' and OPENAI_AVAILABLE:
+        if self.provider != 'ollama' or not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.generate, prompt, system_prompt)
+
+        key = self._response_key(prompt, system_prompt)
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            return cached
+
+        response = await self._agenerate_ollama(prompt, system_prompt)
+        if not response.startswith(OLLAMA_ERROR_PREFIX):
+            self._response_cache[key] = response
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return response
+
+    async def _agenerate_ollama(self, prompt: str, system_prompt: Optional[str]) -> str:
+        """Generate using Ollama over the shared async client."""
+        data = {
+            "model": self.model,
+            "prompt": prompt,
+            "temperature": self.temperature,
+            "stream": False
+        }
+
+        if system_prompt:
+            data["system"] = system_prompt
+
+        client = _get_ollama_client()
+        delay = OLLAMA_BACKOFF
+        for attempt in range(OLLAMA_RETRIES):
+            try:
+                response = await client.post(
+                    f"{self.ollama_base_url}/api/generate",
+                    content=_dumps(data), headers=_JSON_HEADERS
+                )
+                response.raise_for_status()
+                return _loads(response.content)["response"]
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                # Retry connection problems and server errors with backoff
+                retryable = (
+                    isinstance(e, httpx.TransportError)
+                    or e.response.status_code >= 500
+                )
+                if not retryable or attempt == OLLAMA_RETRIES - 1:
+                    return f"{OLLAMA_ERROR_PREFIX}: {str(e)}"
+                await asyncio.sleep(delay)
+                delay *= 2
+            except Exception as e:
+                return f"{OLLAMA_ERROR_PREFIX}: {str(e)}"
+
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield generated text chunks as the provider produces them.
+
+        Ollama streams over the shared async client; the SDK providers'
+        blocking streams are advanced in a worker thread per chunk.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+
+        Yields:
+            Text chunks in order
+        """
+        if self.provider == 'ollama' and HTTPX_AVAILABLE:
+            async for chunk in self._astream_ollama(prompt, system_prompt):
+                yield chunk
+            return
+
+        chunks = self._stream_chunks(prompt, system_prompt)
+        done = object()
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, done)
+            if chunk is done:
+                return
+            yield chunk
+
+    async def _astream_ollama(self, prompt: str, system_prompt: Optional[str]) -> AsyncIterator[str]:
+        """Stream from Ollama's newline-delimited JSON generate endpoint."""
+        data = {
+            "model": self.model,
+            "prompt": prompt,
+            "temperature": self.temperature,
+            "stream": True
+        }
+
+        if system_prompt:
+            data["system"] = system_prompt
+
+        client = _get_ollama_client()
+        try:
+            async with client.stream(
+                "POST", f"{self.ollama_base_url}/api/generate",
+                content=_dumps(data), headers=_JSON_HEADERS
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+        except (httpx.HTTPError, ValueError) as e:
+            yield f"{OLLAMA_ERROR_PREFIX}: {str(e)}"
+
+    def _stream_chunks(self, prompt: str, system_prompt: Optional[str]) -> Iterator[str]:
+        """Blocking text-chunk iterator for the configured provider."""
+        if self.provider == 'openai' and self.client is not None:
+            for chunk in self._generate_openai(prompt, system_prompt, stream=True):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        elif self.provider == 'anthropic' and self.client is not None:
+            kwargs = {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "messages": [{"role": "user", "content": prompt}]
+            }
+            if system_prompt:
+                kwargs["system"] = system_prompt
+            with self.client.messages.stream(**kwargs) as stream:
+                yield from stream.text_stream
+        else:
+            yield self.generate(prompt, system_prompt)
+
+    def _response_key(self, prompt: str, system_prompt: Optional[str]) -> bytes:
+        """Hash everything that determines a response into a cache key."""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (
+            self.provider,
+            self.model,
+            repr(round(self.temperature, 3)),
+            str(self.max_tokens),
+            system_prompt or "",
+            prompt
+        ):
+            h.update(part.encode())
+            h.update(b"\x00")
+        return h.digest()
+
+    def _dispatch(self, prompt: str, system_prompt: Optional[str], stream: bool) -> str:
+        """Send a request to the configured provider."""
+        if self.provider == 'openai' and self.client is not None:
             return self._generate_openai(prompt, system_prompt, stream)
-        elif self.provider == 'anthropic' and ANTHROPIC_AVAILABLE:
+        elif self.provider == 'anthropic' and self.client is not None:
             return self._generate_anthropic(prompt, system_prompt, stream)
         elif self.provider == 'ollama':
             return self._generate_ollama(prompt, system_prompt, stream)
@@ -111,10 +438,7 @@ class LLMProvider:
 
     def _generate_openai(self, prompt: str, system_prompt: Optional[str], stream: bool) -> str:
         """Generate using OpenAI."""
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
+        messages = [*_system_messages(system_prompt), {"role": "user", "content": prompt}]
 
         response = self.client.chat.completions.create(
             model=self.model,
@@ -159,32 +483,151 @@ class LLMProvider:
             data["system"] = system_prompt
 
         try:
-            response = requests.post(url, json=data)
+            import requests
+            response = requests.post(url, data=_dumps(data), headers=_JSON_HEADERS)
             response.raise_for_status()
-            return response.json()["response"]
+            return _loads(response.content)["response"]
         except Exception as e:
-            return f"Error calling Ollama: {str(e)}"
+            return f"{OLLAMA_ERROR_PREFIX}: {str(e)}"
 
     def _generate_mock(self, prompt: str, system_prompt: Optional[str]) -> str:
         """Mock generation for testing."""
         return f"Mock response to: {prompt[:50]}..."
 
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> np.ndarray:
         """
         Generate embeddings for text.
+
+        Returns:
+            float32 embedding vector
         """
-        if self.provider == 'openai' and OPENAI_AVAILABLE:
+        if self.provider == 'openai' and self.client is not None:
             response = self.client.embeddings.create(
                 input=text,
                 model="text-embedding-ada-002"
             )
-            return response.data[0].embedding
+            return np.asarray(response.data[0].embedding, dtype=np.float32)
         else:
-            # Return mock embedding
-            import hashlib
-            hash_obj = hashlib.sha256(text.encode())
-            # Generate deterministic "embedding" from hash
-            return [float(b) / 255.0 for b in hash_obj.digest()[:384]]
+            # Deterministic mock embedding: one hash byte per dimension
+            digest = _hash_bytes(text.encode(), MOCK_EMBEDDING_DIM)
+            return np.frombuffer(digest, dtype=np.uint8).astype(np.float32) * np.float32(1.0 / 255.0)
+
+    def embed_batch(self, texts: List[str], batch_size: int = 100) -> np.ndarray:
+        """
+        Generate embeddings for many texts.
+
+        OpenAI accepts list input, so texts are sent ``batch_size`` per
+        request instead of one request each.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Maximum inputs per API request
+
+        Returns:
+            (len(texts), dim) float32 array, row i embedding texts[i]
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if not (self.provider == 'openai' and self.client is not None):
+            return np.stack([np.asarray(self.embed(text), dtype=np.float32) for text in texts])
+
+        out = None
+        for start in range(0, len(texts), batch_size):
+            response = self.client.embeddings.create(
+                input=texts[start:start + batch_size],
+                model="text-embedding-ada-002"
+            )
+            for offset, item in enumerate(response.data):
+                if out is None:
+                    out = np.empty((len(texts), len(item.embedding)), dtype=np.float32)
+                out[start + offset] = item.embedding
+        return out
+
+
+class BatchingEmbedder:
+    """
+    Coalesces concurrent single-text embedding requests into batches.
+
+    Callers await embed_one(); a background task gathers whatever arrives
+    within EMBED_BATCH_DELAY of the first request (up to EMBED_BATCH_SIZE
+    texts) and embeds them with one LLMProvider.embed_batch call.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_batch: int = EMBED_BATCH_SIZE,
+        max_delay: float = EMBED_BATCH_DELAY
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            provider: Provider whose embed_batch computes the embeddings
+            max_batch: Maximum texts per batch
+            max_delay: Seconds to wait for more texts after the first
+        """
+        self.provider = provider
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop = None
+
+    async def embed_one(self, text: str) -> np.ndarray:
+        """Embed one text as part of the next batch."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Queue and worker belong to one event loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect and embed batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await asyncio.to_thread(self.provider.embed_batch, texts, len(texts))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def aclose(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
 
 
 class RAGSystem:
@@ -196,7 +639,11 @@ class RAGSystem:
         self,
         vector_store,
         llm_provider: LLMProvider,
-        system_context: Optional[str] = None
+        system_context: Optional[str] = None,
+        semantic_cache_threshold: Optional[float] = None,
+        semantic_cache_size: int = SEMANTIC_CACHE_SIZE,
+        semantic_cache_path: Optional[str] = None,
+        semantic_cache_dtype: Any = SEMANTIC_CACHE_DTYPE
     ):
         """
         Initialize RAG system.
@@ -205,10 +652,54 @@ class RAGSystem:
             vector_store: Vector store for retrieval
             llm_provider: LLM provider for generation
             system_context: System context about the user
+            semantic_cache_threshold: Cosine similarity (between -1 and 1)
+                at or above which a question reuses the answer cached for an
+                earlier one, skipping retrieval and generation. Values near 1
+                only match rephrasings; lower values risk answering a
+                different question. None (the default) disables the semantic
+                cache; SEMANTIC_CACHE_THRESHOLD is a conservative setting.
+            semantic_cache_size: Maximum number of cached answers
+            semantic_cache_path: Optional file prefix for persisting the
+                semantic cache across restarts
+            semantic_cache_dtype: Storage dtype of cached question
+                embeddings; float16 halves memory, float32 keeps full precision
         """
         self.vector_store = vector_store
         self.llm = llm_provider
+        self._embedder = BatchingEmbedder(llm_provider)
         self.system_context = system_context or "You are a helpful AI assistant with access to personal memories and data."
+        # Static system prompts, formatted once rather than per call
+        self._persona_systems: Dict[str, str] = {}
+        self._qa_system = f"""{self.system_context}
+
+Guidelines:
+- Be accurate and cite sources when available
+- If you're not sure, say so
+- Be concise but thorough
+- Respect privacy and confidentiality"""
+
+        # Semantic cache: unit-norm question embeddings (one row per slot),
+        # the query parameters and response for each slot, and a use tick
+        # per slot for LRU eviction
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self.semantic_cache_size = semantic_cache_size
+        self.semantic_cache_dtype = np.dtype(semantic_cache_dtype)
+        self._cache_emb: Optional[np.ndarray] = None
+        self._cache_params: List[Any] = []
+        self._cache_responses: List[Dict[str, Any]] = []
+        self._cache_used = np.zeros(semantic_cache_size, dtype=np.int64)
+        self._cache_tick = 0
+
+        # Cached answers embed retrieval results, so they are dropped when
+        # the vector store's write counter moves (e.g. after /ingest)
+        self._cache_store_version = self._store_version()
+
+        # Persistence: embeddings live in a memory-mapped "<path>.emb" file,
+        # the rest of the slot state in an append-only "<path>.jsonl" log
+        self.semantic_cache_path = semantic_cache_path
+        self._log_records: Optional[int] = None
+        if semantic_cache_path:
+            self._load_semantic_cache()
 
     def query(
         self,
@@ -229,6 +720,14 @@ class RAGSystem:
         Returns:
             Response with answer and sources
         """
+        # Near-duplicate questions with the same parameters reuse an answer
+        params = (k, use_context, json.dumps(metadata_filter, sort_keys=True, default=str))
+        q = self._embed_question(question)
+        if q is not None:
+            cached = self._semantic_lookup(q, params)
+            if cached is not None:
+                return {**cached, 'timestamp_ns': time.time_ns()}
+
         # Retrieve relevant documents
         if use_context:
             retrieved_docs = self.vector_store.search(
@@ -245,12 +744,295 @@ class RAGSystem:
         # Generate answer
         answer = self._generate_answer(question, context)
 
-        return {
+        response = {
+            'answer': answer,
+            'sources': retrieved_docs,
+            'context_used': context,
+            'timestamp_ns': time.time_ns()
+        }
+        if q is not None:
+            self._semantic_store(q, params, response)
+        return response
+
+    async def aquery(
+        self,
+        question: str,
+        k: int = 5,
+        use_context: bool = True,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query().
+
+        Retrieval and generation run without blocking the event loop.
+        """
+        params = (k, use_context, json.dumps(metadata_filter, sort_keys=True, default=str))
+        q = await self._aembed_question(question)
+        if q is not None:
+            cached = self._semantic_lookup(q, params)
+            if cached is not None:
+                return {**cached, 'timestamp_ns': time.time_ns()}
+
+        if use_context:
+            retrieved_docs = await self._asearch(question, k=k, filter=metadata_filter)
+        else:
+            retrieved_docs = []
+
+        context = self._build_context(retrieved_docs)
+        prompt, system_prompt = self._answer_prompts(question, context)
+        answer = await self.llm.agenerate(prompt, system_prompt)
+
+        response = {
             'answer': answer,
             'sources': retrieved_docs,
             'context_used': context,
-            'timestamp': datetime.now().isoformat()
+            'timestamp_ns': time.time_ns()
         }
+        if q is not None:
+            self._semantic_store(q, params, response)
+        return response
+
+    async def query_stream(
+        self,
+        question: str,
+        k: int = 5,
+        use_context: bool = True,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Answer a question using RAG, yielding the answer as it is generated.
+
+        A semantic cache hit is yielded as a single chunk; a completed
+        stream is added to the cache like a query() answer.
+
+        Args:
+            question: User question
+            k: Number of documents to retrieve
+            use_context: Whether to use retrieved context
+            metadata_filter: Optional metadata filter for retrieval
+
+        Yields:
+            Answer text chunks
+        """
+        params = (k, use_context, json.dumps(metadata_filter, sort_keys=True, default=str))
+        q = await self._aembed_question(question)
+        if q is not None:
+            cached = self._semantic_lookup(q, params)
+            if cached is not None:
+                yield cached['answer']
+                return
+
+        if use_context:
+            retrieved_docs = await self._asearch(question, k=k, filter=metadata_filter)
+        else:
+            retrieved_docs = []
+
+        context = self._build_context(retrieved_docs)
+        prompt, system_prompt = self._answer_prompts(question, context)
+
+        chunks = []
+        async for chunk in self.llm.astream(prompt, system_prompt):
+            chunks.append(chunk)
+            yield chunk
+
+        answer = "".join(chunks)
+        if q is not None and OLLAMA_ERROR_PREFIX not in answer:
+            self._semantic_store(q, params, {
+                'answer': answer,
+                'sources': retrieved_docs,
+                'context_used': context,
+                'timestamp_ns': time.time_ns()
+            })
+
+    def _embed_question(self, question: str) -> Optional[np.ndarray]:
+        """Return the unit-norm question embedding, or None if not caching."""
+        if self.semantic_cache_threshold is None:
+            return None
+        try:
+            q = np.asarray(self.llm.embed(question), dtype=np.float32)
+        except Exception:
+            return None
+        return self._unit(q)
+
+    async def _aembed_question(self, question: str) -> Optional[np.ndarray]:
+        """Async _embed_question, batched with concurrent questions."""
+        if self.semantic_cache_threshold is None:
+            return None
+        try:
+            q = np.asarray(await self._embedder.embed_one(question), dtype=np.float32)
+        except Exception:
+            return None
+        return self._unit(q)
+
+    @staticmethod
+    def _unit(q: np.ndarray) -> Optional[np.ndarray]:
+        """Normalize a question embedding, or None if it is unusable."""
+        norm = np.linalg.norm(q)
+        if q.ndim != 1 or norm == 0:
+            return None
+        return q / norm
+
+    def _store_version(self) -> Any:
+        """Write counter of the vector store; None if it doesn't keep one."""
+        return getattr(self.vector_store, 'version', None)
+
+    def _check_store_version(self) -> None:
+        """Drop cached answers if the vector store changed since they were stored."""
+        version = self._store_version()
+        if version != self._cache_store_version:
+            self.clear_cache()
+            self._cache_store_version = version
+
+    def _semantic_lookup(self, q: np.ndarray, params: Any) -> Optional[Dict[str, Any]]:
+        """Find a cached response for a similar question with equal params."""
+        self._check_store_version()
+        if self._cache_emb is None or self._cache_emb.shape[1] != len(q):
+            return None
+
+        filled = len(self._cache_responses)
+        if filled == 0:
+            return None
+        allowed = np.fromiter((p == params for p in self._cache_params), dtype=np.bool_, count=filled)
+        slot = _best_match(
+            np.asarray(self._cache_emb[:filled]), q, allowed,
+            np.float32(self.semantic_cache_threshold)
+        )
+        if slot < 0:
+            return None
+        self._cache_tick += 1
+        self._cache_used[slot] = self._cache_tick
+        return self._cache_responses[slot]
+
+    def _semantic_store(self, q: np.ndarray, params: Any, response: Dict[str, Any]) -> None:
+        """Cache a response, replacing the least recently used slot if full."""
+        self._check_store_version()
+        if self._cache_emb is None or self._cache_emb.shape[1] != len(q):
+            # First entry, or the embedding model changed: start over
+            self.clear_cache()
+            self._cache_emb = self._new_cache_matrix(len(q))
+
+        filled = len(self._cache_responses)
+        if filled < self.semantic_cache_size:
+            slot = filled
+            self._cache_params.append(params)
+            self._cache_responses.append(response)
+        else:
+            slot = int(np.argmin(self._cache_used))
+            self._cache_params[slot] = params
+            self._cache_responses[slot] = response
+
+        self._cache_emb[slot] = q
+        self._cache_tick += 1
+        self._cache_used[slot] = self._cache_tick
+        self._save_semantic_cache(slot)
+
+    def clear_cache(self) -> None:
+        """Drop all semantically cached answers, e.g. after new ingestion."""
+        self._cache_emb = None
+        self._cache_params = []
+        self._cache_responses = []
+        self._cache_used[:] = 0
+        self._log_records = None
+        if self.semantic_cache_path:
+            for suffix in ('.emb', '.jsonl'):
+                try:
+                    os.remove(self.semantic_cache_path + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def _new_cache_matrix(self, dim: int) -> np.ndarray:
+        """Allocate the embedding matrix, backed by a file when persisting."""
+        if not self.semantic_cache_path:
+            return np.zeros((self.semantic_cache_size, dim), dtype=self.semantic_cache_dtype)
+        return np.memmap(
+            self.semantic_cache_path + '.emb', dtype=self.semantic_cache_dtype,
+            mode='w+', shape=(self.semantic_cache_size, dim)
+        )
+
+    def _slot_record(self, slot: int) -> str:
+        """
+        Serialize one slot's state as a log line.
+
+        Responses that aren't plain JSON are logged as an empty slot, so
+        they stay memory-only instead of coming back altered on reload.
+        """
+        try:
+            return json.dumps({
+                'slot': slot,
+                'params': self._cache_params[slot],
+                'response': self._cache_responses[slot],
+                'used': int(self._cache_used[slot])
+            })
+        except (TypeError, ValueError):
+            return json.dumps({'slot': slot, 'params': None, 'response': None, 'used': 0})
+
+    def _save_semantic_cache(self, slot: int) -> None:
+        """Flush a written embedding row and log that slot's metadata."""
+        if not self.semantic_cache_path:
+            return
+        self._cache_emb.flush()
+        limit = SEMANTIC_LOG_FACTOR * self.semantic_cache_size
+        if self._log_records is None or self._log_records >= limit:
+            self._rewrite_semantic_log()
+            return
+        with open(self.semantic_cache_path + '.jsonl', 'a') as f:
+            f.write(self._slot_record(slot) + '\n')
+        self._log_records += 1
+
+    def _rewrite_semantic_log(self) -> None:
+        """Replace the log with a header and one record per filled slot."""
+        header = json.dumps({
+            'dim': self._cache_emb.shape[1],
+            'dtype': self.semantic_cache_dtype.str
+        })
+        records = [self._slot_record(slot) for slot in range(len(self._cache_responses))]
+        tmp = self.semantic_cache_path + '.jsonl.tmp'
+        with open(tmp, 'w') as f:
+            f.write('\n'.join([header] + records) + '\n')
+        os.replace(tmp, self.semantic_cache_path + '.jsonl')
+        self._log_records = len(records)
+
+    def _load_semantic_cache(self) -> None:
+        """Map a previously persisted cache, ignoring missing or stale files."""
+        emb_path = self.semantic_cache_path + '.emb'
+        params: List[Any] = []
+        responses: List[Any] = []
+        used: List[int] = []
+        try:
+            with open(self.semantic_cache_path + '.jsonl') as f:
+                header = json.loads(f.readline())
+                dim = header['dim']
+                if np.dtype(header['dtype']) != self.semantic_cache_dtype:
+                    return
+                if os.path.getsize(emb_path) != self.semantic_cache_size * dim * self.semantic_cache_dtype.itemsize:
+                    return
+                # Later records for a slot replace earlier ones; a torn last
+                # line fails the whole load rather than mismatching a row
+                records = 0
+                for line in f:
+                    record = json.loads(line)
+                    slot = record['slot']
+                    while len(params) <= slot:
+                        params.append(None)
+                        responses.append(None)
+                        used.append(0)
+                    # JSON turns the params tuples into lists
+                    params[slot] = tuple(record['params']) if record['params'] is not None else None
+                    responses[slot] = record['response']
+                    used[slot] = record['used']
+                    records += 1
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+
+        self._cache_emb = np.memmap(
+            emb_path, dtype=self.semantic_cache_dtype, mode='r+',
+            shape=(self.semantic_cache_size, dim)
+        )
+        self._cache_params = params
+        self._cache_responses = responses
+        self._cache_used[:len(used)] = used
+        self._cache_tick = max(used, default=0)
+        self._log_records = records
 
     def _build_context(self, documents: List[Dict[str, Any]]) -> str:
         """
@@ -259,41 +1041,49 @@ class RAGSystem:
         if not documents:
             return ""
 
-        context_parts = ["Based on the following information:\n"]
+        # One slot per header and document, filled by index and joined once
+        parts = [None] * (2 * len(documents) + 1)
+        parts[0] = CONTEXT_HEADER
 
+        idx = 1
         for i, doc in enumerate(documents, 1):
             metadata = doc.get('metadata', {})
             timestamp = metadata.get('timestamp', 'unknown time')
             source = metadata.get('source', 'unknown source')
 
-            context_parts.append(f"\n[{i}] From {source} at {timestamp}:")
-            context_parts.append(doc['document'][:500])  # Limit length
+            parts[idx] = f"\n\n[{i}] From {source} at {timestamp}:\n"
+            # Stores may precompute the truncated text at index time
+            parts[idx + 1] = doc.get('preview') or doc['document'][:CONTEXT_DOC_CHARS]
+            idx += 2
 
-        return "\n".join(context_parts)
+        return "".join(parts)
 
     def _generate_answer(self, question: str, context: str) -> str:
         """
         Generate answer using LLM.
         """
+        prompt, system_prompt = self._answer_prompts(question, context)
+        return self.llm.generate(prompt, system_prompt)
+
+    def _answer_prompts(self, question: str, context: str) -> Tuple[str, str]:
+        """
+        Build the prompt and system prompt for answering a question.
+        """
+        # Static instructions lead and the question trails so the prompt
+        # prefix stays identical across queries for server-side caching
         if context:
-            prompt = f"""Context:
-{context}
+            prompt = f"""{QA_INSTRUCTIONS}
 
-Question: {question}
+Context:
+{context}
 
-Please provide a comprehensive answer based on the context above. If the context doesn't contain relevant information, say so."""
+Question: {question}"""
         else:
             prompt = question
 
-        system_prompt = f"""{self.system_context}
+        system_prompt = self._qa_system
 
-Guidelines:
-- Be accurate and cite sources when available
-- If you're not sure, say so
-- Be concise but thorough
-- Respect privacy and confidentiality"""
-
-        return self.llm.generate(prompt, system_prompt)
+        return prompt, system_prompt
 
     def reflect(
         self,
@@ -310,7 +1100,34 @@ Guidelines:
         Returns:
             Reflective insights
         """
-        # Build reflection query
+        query = self._reflection_query(time_period, focus_areas)
+
+        # Retrieve relevant memories
+        retrieved = self.vector_store.search(query, k=10)
+
+        # Generate reflection
+        context = self._build_context(retrieved)
+        return self.llm.generate(self._reflection_prompt(context, focus_areas), REFLECTION_SYSTEM_PROMPT)
+
+    async def areflect(
+        self,
+        time_period: Optional[Dict[str, str]] = None,
+        focus_areas: Optional[List[str]] = None
+    ) -> str:
+        """
+        Async variant of reflect().
+        """
+        query = self._reflection_query(time_period, focus_areas)
+        retrieved = await self._asearch(query, k=10)
+        context = self._build_context(retrieved)
+        return await self.llm.agenerate(self._reflection_prompt(context, focus_areas), REFLECTION_SYSTEM_PROMPT)
+
+    @staticmethod
+    def _reflection_query(
+        time_period: Optional[Dict[str, str]],
+        focus_areas: Optional[List[str]]
+    ) -> str:
+        """Build the retrieval query for a reflection."""
         query_parts = ["Generate insights about"]
 
         if time_period:
@@ -319,15 +1136,12 @@ Guidelines:
         if focus_areas:
             query_parts.append(f"focusing on {', '.join(focus_areas)}")
 
-        query = " ".join(query_parts)
-
-        # Retrieve relevant memories
-        retrieved = self.vector_store.search(query, k=10)
-
-        # Generate reflection
-        context = self._build_context(retrieved)
+        return " ".join(query_parts)
 
-        prompt = f"""Based on these memories and experiences:
+    @staticmethod
+    def _reflection_prompt(context: str, focus_areas: Optional[List[str]]) -> str:
+        """Build the reflection prompt around retrieved memories."""
+        return f"""Based on these memories and experiences:
 {context}
 
 Please provide a thoughtful reflection covering:
@@ -339,12 +1153,10 @@ Please provide a thoughtful reflection covering:
 
 Focus areas: {focus_areas or ['general life experiences']}"""
 
-        return self.llm.generate(prompt, "You are a thoughtful life coach providing insights based on personal experiences.")
-
     def chat(
         self,
         message: str,
-        conversation_history: Optional[List[Dict[str, str]]] = None,
+        conversation_history: Optional[Sequence[Dict[str, str]]] = None,
         persona: Optional[str] = None
     ) -> str:
         """
@@ -352,7 +1164,8 @@ Focus areas: {focus_areas or ['general life experiences']}"""
 
         Args:
             message: User message
-            conversation_history: Previous messages
+            conversation_history: Previous messages; callers keeping a
+                running history can pass a deque(maxlen=HISTORY_MESSAGES)
             persona: Persona to use
 
         Returns:
@@ -360,31 +1173,96 @@ Focus areas: {focus_areas or ['general life experiences']}"""
         """
         # Retrieve relevant context
         retrieved = self.vector_store.search(message, k=3)
-        context = self._build_context(retrieved)
-
-        # Build conversation prompt
-        prompt_parts = []
+        history = self._format_history(conversation_history)
+        prompt = self._build_chat_prompt(message, self._build_context(retrieved), history)
+        return self.llm.generate(prompt, self._persona_system(persona))
 
-        if conversation_history:
-            for msg in conversation_history[-5:]:  # Last 5 messages
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                prompt_parts.append(f"{role.capitalize()}: {content}")
+    async def achat(
+        self,
+        message: str,
+        conversation_history: Optional[Sequence[Dict[str, str]]] = None,
+        persona: Optional[str] = None
+    ) -> str:
+        """
+        Async variant of chat().
 
-        prompt_parts.append(f"User: {message}")
+        History formatting runs while the vector search is in flight, and
+        the LLM call does not block the event loop.
+        """
+        retrieved, history = await asyncio.gather(
+            self._asearch(message, k=3),
+            self._aformat_history(conversation_history)
+        )
+        prompt = self._build_chat_prompt(message, self._build_context(retrieved), history)
+        return await self.llm.agenerate(prompt, self._persona_system(persona))
 
-        if context:
-            prompt_parts.insert(0, f"Relevant memories:\n{context}\n")
+    async def _asearch(
+        self,
+        query: str,
+        k: int,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search the vector store, in a thread if it has no asearch()."""
+        asearch = getattr(self.vector_store, 'asearch', None)
+        if asearch is not None:
+            return await asearch(query, k=k, filter=filter)
+        return await asyncio.to_thread(self.vector_store.search, query, k=k, filter=filter)
 
-        prompt = "\n".join(prompt_parts)
+    @staticmethod
+    def _format_history(conversation_history: Optional[Sequence[Dict[str, str]]]) -> List[str]:
+        """
+        Format the last HISTORY_MESSAGES messages as 'Role: content' lines.
 
-        # Set persona
-        if persona:
-            system = f"You are responding as '{persona}' persona based on the user's consciousness data. {self.system_context}"
+        Accepts a list or a ``deque(maxlen=HISTORY_MESSAGES)``; a bounded
+        deque is iterated as-is with no slicing.
+        """
+        if not conversation_history:
+            return []
+        if isinstance(conversation_history, deque):
+            recent = conversation_history
+            if recent.maxlen is None or recent.maxlen > HISTORY_MESSAGES:
+                recent = islice(conversation_history, max(0, len(conversation_history) - HISTORY_MESSAGES), None)
         else:
-            system = self.system_context
+            recent = conversation_history[-HISTORY_MESSAGES:]
+        return [
+            f"{msg.get('role', 'user').capitalize()}: {msg.get('content', '')}"
+            for msg in recent
+        ]
+
+    async def _aformat_history(
+        self,
+        conversation_history: Optional[Sequence[Dict[str, str]]]
+    ) -> List[str]:
+        """Coroutine wrapper so history formatting can be gathered."""
+        return self._format_history(conversation_history)
+
+    @staticmethod
+    def _build_chat_prompt(message: str, context: str, history: List[str]) -> str:
+        """
+        Assemble the chat prompt: history, then retrieved memories, then
+        the new message.
+
+        History only grows between turns while memories change with every
+        message, so this order keeps the longest stable prompt prefix.
+        """
+        prompt_parts = list(history)
 
-        return self.llm.generate(prompt, system)
+        if context:
+            prompt_parts.append(f"Relevant memories:\n{context}\n")
+
+        prompt_parts.append(f"User: {message}")
+        return "\n".join(prompt_parts)
+
+    def _persona_system(self, persona: Optional[str]) -> str:
+        """System prompt for the requested persona, built once per persona."""
+        if not persona:
+            return self.system_context
+        system = self._persona_systems.get(persona)
+        if system is None:
+            system = f"You are responding as '{persona}' persona based on the user's consciousness data. {self.system_context}"
+            if len(self._persona_systems) < PERSONA_CACHE_SIZE:
+                self._persona_systems[persona] = system
+        return system
 
 
 class PromptTemplates:
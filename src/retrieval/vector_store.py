@@ -2,9 +2,17 @@
 Vector database integration for RAG (Retrieval-Augmented Generation).
 """
 
+import asyncio
+import heapq
 import os
 import json
-from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
 from datetime import datetime
 import numpy as np
 
@@ -20,6 +28,31 @@ except ImportError:
     CHROMADB_AVAILABLE = False
     print("ChromaDB not installed. Install with: pip install chromadb")
 
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    import hashlib
+    XXHASH_AVAILABLE = False
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
 try:
     from sentence_transformers import SentenceTransformer
     EMBEDDINGS_AVAILABLE = True
@@ -27,6 +60,214 @@ except ImportError:
     EMBEDDINGS_AVAILABLE = False
     print("Sentence transformers not installed. Install with: pip install sentence-transformers")
 
+# Search results kept by CachedVectorStore, and for how many seconds
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 300.0
+
+# Query embeddings kept by VectorStore.search
+QUERY_CACHE_SIZE = 4096
+
+# Output dimensions of common sentence-transformers models, so the store can
+# size its matrices without loading the model
+KNOWN_EMBEDDING_DIMENSIONS = {
+    "all-MiniLM-L6-v2": 384,
+    "all-MiniLM-L12-v2": 384,
+    "paraphrase-MiniLM-L6-v2": 384,
+    "multi-qa-MiniLM-L6-cos-v1": 384,
+    "all-mpnet-base-v2": 768,
+    "multi-qa-mpnet-base-dot-v1": 768,
+    "all-distilroberta-v1": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+}
+
+# Texts per forward pass when encoding with sentence-transformers
+ENCODE_BATCH_SIZE = 64
+
+# Initial row capacity of the in-memory embedding matrix
+INITIAL_CAPACITY = 1024
+
+# File name stem of the persisted in-memory store inside persist_directory
+MEMORY_STORE_FILE = "memory_store"
+
+# Byte alignment of in-memory row arrays: one cache line, one AVX-512 load
+ARRAY_ALIGNMENT = 64
+
+# Threads that score large in-memory stores; set CHRIST_SCORE_THREADS=1 when
+# NumPy's BLAS already parallelizes matrix-vector products
+SCORE_THREADS = int(os.getenv("CHRIST_SCORE_THREADS", "0")) or min(os.cpu_count() or 1, 8)
+
+# Rows below which scoring stays on the calling thread
+PARALLEL_SCORE_ROWS = 65536
+
+# Fraction of tombstoned rows at which the in-memory store compacts
+COMPACT_RATIO = 0.3
+
+# Rows upcast to float32 at a time when scoring int8 embeddings without SimSIMD
+INT8_BLOCK_ROWS = 4096
+
+# HNSW graph parameters for the in-memory store; below HNSW_MIN_ROWS live
+# rows an exact scan is as fast, so the index is only built (in one bulk
+# load) and queried once the store reaches that size
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+HNSW_MIN_ROWS = 10000
+
+# Approximate candidates fetched per requested result before re-ranking
+HNSW_OVERSAMPLE = 2
+
+# Word tokens for keyword search
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Metadata value types indexed for exact-match filtering
+INDEXED_METADATA_TYPES = (str, int, float, bool)
+
+# Leading characters of each document kept for prompt context; matches
+# the per-document limit in retrieval.llm_integration
+PREVIEW_CHARS = 500
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the ``k`` highest scores, best first.
+
+    Partitions in O(n) and sorts only the k survivors; falls back to a
+    full sort when k covers every score. Returned equal scores keep index
+    order; which of several scores tied for k-th place survive is arbitrary.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= len(scores):
+        return np.argsort(-scores, kind='stable')
+    part = np.sort(np.argpartition(scores, -k)[-k:])
+    return part[np.argsort(-scores[part], kind='stable')]
+
+
+_score_pool: Optional[ThreadPoolExecutor] = None
+_score_pool_lock = threading.Lock()
+
+
+def _score_in_shards(n: int, score_block: Callable[[int, int], None]) -> None:
+    """
+    Call ``score_block(start, stop)`` over row shards covering ``n`` rows.
+
+    Large inputs are split across a shared thread pool; NumPy releases the
+    GIL inside its kernels, so shards run in parallel.
+    """
+    global _score_pool
+    if SCORE_THREADS <= 1 or n < PARALLEL_SCORE_ROWS:
+        score_block(0, n)
+        return
+    if _score_pool is None:
+        with _score_pool_lock:
+            if _score_pool is None:
+                _score_pool = ThreadPoolExecutor(max_workers=SCORE_THREADS, thread_name_prefix="christ-score")
+    step = -(-n // SCORE_THREADS)
+    futures = [
+        _score_pool.submit(score_block, start, min(start + step, n))
+        for start in range(0, n, step)
+    ]
+    for future in futures:
+        future.result()
+
+
+def aligned_zeros(shape: Tuple[int, ...], dtype: Any, alignment: int = ARRAY_ALIGNMENT) -> np.ndarray:
+    """Zeroed C-contiguous array whose data starts on an ``alignment``-byte boundary."""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buffer = np.zeros(nbytes + alignment, dtype=np.uint8)
+    offset = -buffer.ctypes.data % alignment
+    return buffer[offset:offset + nbytes].view(dtype).reshape(shape)
+
+
+def cosine_scores(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity of each unit-length row of ``matrix`` to unit ``query``.
+
+    Uses SimSIMD's fused SIMD kernel when installed, else a BLAS
+    matrix-vector product; either way large matrices are scored on
+    SCORE_THREADS threads.
+    """
+    if SIMSIMD_AVAILABLE and len(matrix):
+        distances = simsimd.cdist(query[None, :], matrix, metric="cosine", threads=SCORE_THREADS)
+        return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+    scores = np.empty(len(matrix), dtype=np.result_type(matrix, query))
+
+    def score_block(start: int, stop: int) -> None:
+        np.dot(matrix[start:stop], query, out=scores[start:stop])
+
+    _score_in_shards(len(matrix), score_block)
+    return scores
+
+
+def _text_seed(text: str) -> int:
+    """64-bit non-cryptographic seed for a text."""
+    data = text.encode()
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def hash_embeddings(texts: List[str], dim: int) -> np.ndarray:
+    """
+    Deterministic pseudo-embeddings in [0, 1) for when no model is installed.
+
+    Each text's hash seeds a vectorized splitmix64 stream, one value per
+    dimension. Not cryptographic and not semantic: equal texts embed
+    equally, nothing else is meaningful.
+    """
+    seeds = np.fromiter((_text_seed(text) for text in texts), dtype=np.uint64, count=len(texts))
+    with np.errstate(over='ignore'):
+        z = seeds[:, None] + np.arange(1, dim + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+    # Top 24 bits are exact in float32
+    return (z >> np.uint64(40)).astype(np.float32) * np.float32(1.0 / (1 << 24))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a text, as indexed for keyword search."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def quantize_rows(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+
+    Each row is scaled so its largest magnitude maps to 127; returns the
+    int8 codes and the float32 scale with ``rows ~= codes * scale[:, None]``.
+    """
+    peak = np.abs(rows).max(axis=1)
+    peak[peak == 0] = 1.0
+    scales = (peak / 127.0).astype(np.float32)
+    codes = np.rint(rows / scales[:, None]).astype(np.int8)
+    return codes, scales
+
+
+def int8_scores(codes: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Approximate cosine similarity of int8-quantized unit rows to unit ``query``.
+
+    SimSIMD scores the int8 codes against a quantized query directly;
+    otherwise codes are upcast to float32 a block at a time so the full
+    matrix is never materialized.
+    """
+    if SIMSIMD_AVAILABLE and len(codes):
+        query_codes, _ = quantize_rows(query[None, :])
+        distances = simsimd.cdist(query_codes, codes, metric="cosine", threads=SCORE_THREADS)
+        return 1.0 - np.asarray(distances, dtype=np.float32)[0]
+    scores = np.empty(len(codes), dtype=np.float32)
+
+    def score_block(start: int, stop: int) -> None:
+        for block_start in range(start, stop, INT8_BLOCK_ROWS):
+            block = codes[block_start:min(block_start + INT8_BLOCK_ROWS, stop)]
+            np.dot(block.astype(np.float32), query, out=scores[block_start:block_start + len(block)])
+
+    _score_in_shards(len(codes), score_block)
+    return scores * scales[:len(codes)]
+
 
 class VectorStore:
     """
@@ -38,7 +279,11 @@ class VectorStore:
         self,
         collection_name: str = "consciousness",
         persist_directory: str = "./data/chroma",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        embedding_model: str = "all-MiniLM-L6-v2",
+        quantize: bool = False,
+        persist_memory: bool = False,
+        embedder: Optional[Any] = None,
+        client: Optional[Any] = None
     ):
         """
         Initialize vector store.
@@ -47,26 +292,47 @@ class VectorStore:
             collection_name: Name of the collection
             persist_directory: Directory to persist ChromaDB
             embedding_model: Name of the embedding model
+            quantize: Keep in-memory embeddings as int8 with per-row scales,
+                a quarter of the float32 footprint at a small accuracy cost
+            persist_memory: Without ChromaDB, keep the in-memory store in
+                persist_directory, with memory-mapped embeddings, and
+                reload it on startup
+            embedder: Already-loaded sentence-transformers model to use
+                instead of loading embedding_model, so stores can share one
+            client: Already-open ChromaDB client to use instead of opening
+                persist_directory
         """
         self.collection_name = collection_name
+        self.quantize = quantize
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
         self.persist_directory = persist_directory
+        self.persist_memory = persist_memory
+        self._memory_path = os.path.join(persist_directory, MEMORY_STORE_FILE)
         self.embedding_model_name = embedding_model
 
-        # Initialize embedding model
-        if EMBEDDINGS_AVAILABLE:
-            self.embedding_model = SentenceTransformer(embedding_model)
-            self.embedding_dimension = self.embedding_model.get_sentence_embedding_dimension()
-        else:
-            self.embedding_model = None
+        # Bumped on every write, so callers caching answers derived from
+        # search results can tell when they are stale
+        self.version = 0
+
+        # The embedding model loads on first use; only models of unknown
+        # dimension are loaded up front
+        self._embedding_model = embedder
+        self._model_lock = threading.Lock()
+        if embedder is not None:
+            self.embedding_dimension = embedder.get_sentence_embedding_dimension()
+        elif not EMBEDDINGS_AVAILABLE:
             self.embedding_dimension = 384  # Default dimension
+        elif embedding_model in KNOWN_EMBEDDING_DIMENSIONS:
+            self.embedding_dimension = KNOWN_EMBEDDING_DIMENSIONS[embedding_model]
+        else:
+            self.embedding_dimension = self.embedding_model.get_sentence_embedding_dimension()
 
         # Initialize ChromaDB if available
         if CHROMADB_AVAILABLE:
             # Disable telemetry completely to avoid warnings
-            import os
             os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
-            self.client = chromadb.PersistentClient(
+            self.client = client or chromadb.PersistentClient(
                 path=persist_directory,
                 settings=Settings(
                     anonymized_telemetry=False,
@@ -87,12 +353,10 @@ class VectorStore:
             self.client = None
             self.collection = None
             # Fallback to in-memory storage
-            self.memory_store = {
-                'ids': [],
-                'embeddings': [],
-                'documents': [],
-                'metadatas': []
-            }
+            if persist_memory:
+                os.makedirs(persist_directory, exist_ok=True)
+            if not (persist_memory and self._load_memory_store()):
+                self._reset_memory_store()
 
     def add_documents(
         self,
@@ -131,28 +395,54 @@ class VectorStore:
             if 'timestamp' not in metadata:
                 metadata['timestamp'] = datetime.now().isoformat()
 
-        # Store in vector database
+        # Store in vector database; Chroma takes the float32 array as is
         if self.collection is not None:
             self.collection.add(
-                embeddings=embeddings.tolist() if isinstance(embeddings, np.ndarray) else embeddings,
+                embeddings=embeddings,
                 documents=documents,
                 metadatas=metadatas,
                 ids=ids
             )
         else:
-            # Fallback to memory store
-            self.memory_store['ids'].extend(ids)
-            self.memory_store['embeddings'].extend(embeddings.tolist())
-            self.memory_store['documents'].extend(documents)
-            self.memory_store['metadatas'].extend(metadatas)
-
+            # Fallback to memory store; re-added IDs replace their old row
+            self._delete_rows(ids)
+            start = self._n_rows
+            rows = self._claim_rows(len(documents))
+            self._store_embeddings(embeddings, rows)
+            rows = rows.tolist()
+            columns = {
+                'ids': ids,
+                'documents': documents,
+                'metadatas': metadatas,
+                'previews': [doc[:PREVIEW_CHARS] for doc in documents],
+                'tokens': [frozenset(tokenize(doc)) for doc in documents]
+            }
+            for key, values in columns.items():
+                column = self.memory_store[key]
+                for row, value in zip(rows, values):
+                    if row < len(column):
+                        column[row] = value
+                    else:
+                        column.append(value)
+            self._index_rows(rows)
+            self._id_to_row.update(zip(ids, rows))
+            if len(set(ids)) < len(ids):
+                # An ID repeated within the batch keeps only its last row
+                for row, doc_id in zip(rows, ids):
+                    if self._id_to_row[doc_id] != row:
+                        self._tombstone(row)
+            self._ensure_hnsw()
+            self._save_memory_store(start)
+
+        self.version += 1
         return ids
 
     def search(
         self,
         query: str,
         k: int = 5,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Search for similar documents.
@@ -161,37 +451,106 @@ class VectorStore:
             query: Query string
             k: Number of results to return
             filter: Optional metadata filter
+            use_cache: Reuse the embedding of a recently seen query
 
         Returns:
             List of search results with documents, metadata, and scores
         """
         # Generate query embedding
-        query_embedding = self._embed_texts([query])[0]
+        if use_cache:
+            query_embedding = self._embed_query(query)
+        else:
+            query_embedding = self._embed_texts([query])[0]
 
         if self.collection is not None:
             # Use ChromaDB search
             results = self.collection.query(
-                query_embeddings=[query_embedding.tolist()],
+                query_embeddings=query_embedding.reshape(1, -1),
                 n_results=k,
                 where=filter
             )
 
-            # Format results
-            formatted_results = []
-            for i in range(len(results['ids'][0])):
-                formatted_results.append({
-                    'id': results['ids'][0][i],
-                    'document': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i],
-                    'score': 1 - results['distances'][0][i]  # Convert distance to similarity
-                })
-
-            return formatted_results
+            return self._format_chroma_results(results, 0)
         else:
             # Fallback to numpy search
             return self._numpy_search(query_embedding, k, filter)
 
+    def batch_search(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries at once.
+
+        Queries not in the embedding cache are encoded in a single model
+        call, and ChromaDB receives all embeddings in one query.
+
+        Args:
+            queries: Query strings
+            k: Number of results per query
+            filter: Optional metadata filter applied to every query
+
+        Returns:
+            One result list per query, in input order
+        """
+        if not queries:
+            return []
+
+        embeddings = [self._query_cache.get(query) for query in queries]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fresh = self._embed_texts([queries[i] for i in missing])
+            for i, embedding in zip(missing, fresh):
+                embedding.flags.writeable = False
+                embeddings[i] = self._query_cache[queries[i]] = embedding
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+        if self.collection is not None:
+            results = self.collection.query(
+                query_embeddings=np.stack(embeddings),
+                n_results=k,
+                where=filter
+            )
+            return [self._format_chroma_results(results, i) for i in range(len(queries))]
+
+        return [self._numpy_search(embedding, k, filter) for embedding in embeddings]
+
+    @staticmethod
+    def _format_chroma_results(results: Dict[str, Any], i: int) -> List[Dict[str, Any]]:
+        """Format the hits of the i-th query in a ChromaDB query result."""
+        return [
+            {
+                'id': doc_id,
+                'document': document,
+                'metadata': metadata,
+                'distance': distance,
+                'score': 1 - distance  # Convert distance to similarity
+            }
+            for doc_id, document, metadata, distance in zip(
+                results['ids'][i],
+                results['documents'][i],
+                results['metadatas'][i],
+                results['distances'][i]
+            )
+        ]
+
+    async def asearch(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search without blocking the event loop.
+
+        Embedding and the backend query are synchronous, so search() runs
+        in a worker thread.
+        """
+        return await asyncio.to_thread(self.search, query, k, filter)
+
     def _numpy_search(
         self,
         query_embedding: np.ndarray,
@@ -200,71 +559,444 @@ class VectorStore:
     ) -> List[Dict[str, Any]]:
         """
         Fallback numpy-based similarity search.
+
+        Large stores take approximate candidates from the HNSW index when
+        hnswlib is installed and re-rank them exactly; the full scan is
+        used otherwise, or when filtering leaves fewer than k candidates.
         """
-        if not self.memory_store['embeddings']:
+        live = len(self._id_to_row)
+        if not live or k <= 0:
             return []
 
-        # Convert to numpy array
-        embeddings = np.array(self.memory_store['embeddings'])
-
-        # Calculate cosine similarity
+        # Stored rows are unit length, so cosine similarity is one matmul
+        query_embedding = np.asarray(query_embedding, dtype=np.float32)
         query_norm = query_embedding / np.linalg.norm(query_embedding)
-        embeddings_norm = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
-        similarities = np.dot(embeddings_norm, query_norm)
 
-        # Apply filter if provided
-        if filter:
-            valid_indices = []
-            for i, metadata in enumerate(self.memory_store['metadatas']):
-                if all(metadata.get(key) == value for key, value in filter.items()):
-                    valid_indices.append(i)
+        if live >= HNSW_MIN_ROWS and self._ensure_hnsw():
+            results = self._rank_rows(query_norm, k, filter, self._hnsw_candidates(query_norm, k))
+            if len(results) >= min(k, live):
+                return results
 
-            if not valid_indices:
-                return []
+        return self._rank_rows(query_norm, k, filter)
+
+    def _rank_rows(
+        self,
+        query_norm: np.ndarray,
+        k: int,
+        filter: Optional[Dict[str, Any]] = None,
+        rows: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """Score the given rows (default: all rows) and format the top k."""
+        select = slice(0, self._n_rows) if rows is None else rows
 
-            similarities = similarities[valid_indices]
-            filtered_indices = np.array(valid_indices)
+        if self.quantize:
+            similarities = int8_scores(self._emb_matrix[select], self._scales[select], query_norm)
         else:
-            filtered_indices = np.arange(len(similarities))
+            similarities = cosine_scores(self._emb_matrix[select], query_norm)
+
+        # Skip deleted rows and apply filter if provided; a full scan of a
+        # store without tombstones needs neither mask nor row mapping
+        candidates = None
+        if rows is not None or filter or len(self._id_to_row) < self._n_rows:
+            valid = self._alive[select].copy()
+            matching = self._filter_rows(filter) if filter else None
+            if matching is not None:
+                mask = np.zeros(self._n_rows, dtype=bool)
+                mask[np.fromiter(matching, dtype=np.intp, count=len(matching))] = True
+                valid &= mask[select]
+            elif filter:
+                metadatas = self.memory_store['metadatas']
+                for i in np.flatnonzero(valid):
+                    row = i if rows is None else rows[i]
+                    if not all(metadatas[row].get(key) == value for key, value in filter.items()):
+                        valid[i] = False
+
+            candidates = np.flatnonzero(valid)
+            if not len(candidates):
+                return []
+            similarities = similarities[candidates]
+            if rows is not None:
+                candidates = rows[candidates]
 
         # Get top k results
-        top_k_indices = np.argsort(similarities)[-k:][::-1]
+        top_k_indices = top_k(similarities, k)
 
         # Format results
         results = []
         for idx in top_k_indices:
-            original_idx = filtered_indices[idx]
+            original_idx = idx if candidates is None else candidates[idx]
             results.append({
                 'id': self.memory_store['ids'][original_idx],
                 'document': self.memory_store['documents'][original_idx],
                 'metadata': self.memory_store['metadatas'][original_idx],
+                'preview': self.memory_store['previews'][original_idx],
                 'score': float(similarities[idx])
             })
 
         return results
 
+    def _hnsw_candidates(self, query_norm: np.ndarray, k: int) -> np.ndarray:
+        """Rows of the approximate nearest neighbours of the query."""
+        fetch = min(k * HNSW_OVERSAMPLE, len(self._id_to_row))
+        self._hnsw.set_ef(max(HNSW_EF_SEARCH, fetch))
+        labels, _ = self._hnsw.knn_query(query_norm, k=fetch)
+        return labels[0].astype(np.intp)
+
+    def _ensure_hnsw(self) -> bool:
+        """
+        Bulk-load the HNSW index once the store reaches HNSW_MIN_ROWS.
+
+        Smaller stores are scanned exactly, so until then inserts and
+        deletes skip the index entirely.
+
+        Returns:
+            Whether an index is available
+        """
+        if self._hnsw is not None:
+            return True
+        if not HNSWLIB_AVAILABLE or len(self._id_to_row) < HNSW_MIN_ROWS:
+            return False
+
+        index = hnswlib.Index(space='cosine', dim=self.embedding_dimension)
+        index.init_index(
+            max_elements=len(self._emb_matrix), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M
+        )
+        rows = self._live_rows()
+        vectors = self._emb_matrix[rows]
+        if self.quantize:
+            vectors = vectors.astype(np.float32) * self._scales[rows, None]
+        index.add_items(vectors, rows)
+        self._hnsw = index
+        return True
+
+    def _claim_rows(self, count: int) -> np.ndarray:
+        """
+        Rows for ``count`` new documents: freed slots first, then new rows
+        at the end, doubling capacity as needed.
+
+        Persistent stores append only, since their row file is append-only;
+        compaction reclaims their dead rows instead.
+        """
+        reused = []
+        if not self.persist_memory:
+            while self._free_rows and len(reused) < count:
+                reused.append(self._free_rows.pop())
+
+        n = self._n_rows
+        needed = n + count - len(reused)
+        capacity = len(self._emb_matrix)
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            self._emb_matrix = self._allocate('.emb', (capacity, self.embedding_dimension), self._emb_matrix, n)
+            self._alive = self._allocate('.alive', (capacity,), self._alive, n)
+            if self.quantize:
+                self._scales = self._allocate('.scales', (capacity,), self._scales, n)
+        if self._hnsw is not None and needed > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(len(self._emb_matrix))
+        self._n_rows = needed
+        return np.array(reused + list(range(n, needed)), dtype=np.intp)
+
+    def _store_embeddings(self, embeddings: np.ndarray, rows: np.ndarray) -> None:
+        """Normalize embeddings into the given rows and mark them live."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        normalized = embeddings / norms
+
+        if self.quantize:
+            self._emb_matrix[rows], self._scales[rows] = quantize_rows(normalized)
+        else:
+            self._emb_matrix[rows] = normalized
+        if self._hnsw is not None:
+            # Re-adding a freed row's label replaces its vector and undeletes it
+            self._hnsw.add_items(normalized, rows)
+        self._alive[rows] = True
+
+    def _reset_memory_store(self) -> None:
+        """
+        Empty the in-memory store.
+
+        Rows are struct-of-arrays: the ``memory_store`` lists and the
+        L2-normalized ``_emb_matrix`` share a row index, and ``_id_to_row``
+        maps live IDs to rows. The matrix is float32, or int8 codes with
+        per-row ``_scales`` when the store quantizes. Deleted rows are
+        tombstoned in ``_alive`` and dropped by ``_compact`` once they pass
+        ``COMPACT_RATIO`` of all rows; until then ``_free_rows`` lists their
+        slots for reuse by later inserts. Each row's word tokens are kept
+        as a frozenset, and ``_inverted`` maps each token to the live rows
+        containing it; ``_meta_index`` likewise maps metadata keys and
+        scalar values to live rows for filtering. With hnswlib installed
+        ``_hnsw`` indexes the same rows by row number once there are
+        ``HNSW_MIN_ROWS`` live rows, and is None before that.
+
+        With ``persist_memory`` the arrays are memory-mapped files next to
+        a JSON-lines file of row data and a small JSON header.
+        """
+        self.memory_store = {
+            'ids': [],
+            'documents': [],
+            'metadatas': [],
+            'previews': [],
+            'tokens': []
+        }
+        dtype = np.int8 if self.quantize else np.float32
+        self._emb_matrix = self._allocate('.emb', (INITIAL_CAPACITY, self.embedding_dimension), dtype=dtype)
+        self._scales = self._allocate('.scales', (INITIAL_CAPACITY,), dtype=np.float32) if self.quantize else None
+        self._alive = self._allocate('.alive', (INITIAL_CAPACITY,), dtype=bool)
+        self._id_to_row: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._n_rows = 0
+        self._inverted: Dict[str, set] = {}
+        self._meta_index: Dict[str, Dict[Any, set]] = {}
+        self._hnsw = None
+        self._save_memory_store()
+
+    def _allocate(
+        self,
+        suffix: str,
+        shape: Tuple[int, ...],
+        old: Optional[np.ndarray] = None,
+        keep: int = 0,
+        dtype: Any = None
+    ) -> np.ndarray:
+        """
+        Allocate a zeroed, 64-byte aligned row array, copying the first
+        ``keep`` rows of ``old``.
+
+        Persistent stores map ``<path><suffix>`` instead (page aligned);
+        growing extends the file in place, so kept rows are not copied.
+        """
+        dtype = old.dtype if old is not None else np.dtype(dtype)
+        if not self.persist_memory:
+            array = aligned_zeros(shape, dtype)
+            if keep:
+                array[:keep] = old[:keep]
+            return array
+
+        path = self._memory_path + suffix
+        if old is None:
+            return np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+        old.flush()
+        with open(path, 'r+b') as f:
+            f.truncate(int(np.prod(shape)) * dtype.itemsize)
+        return np.memmap(path, dtype=dtype, mode='r+', shape=shape)
+
+    def _save_memory_store(self, start: Optional[int] = None) -> None:
+        """
+        Flush a persistent store to disk.
+
+        Row data from ``start`` on is appended to the JSON-lines file, or
+        the whole file is rewritten when ``start`` is None. The header is
+        written last, so a crash mid-save leaves the previous row count.
+        """
+        if not self.persist_memory:
+            return
+        path = self._memory_path
+        documents = self.memory_store['documents']
+        metadatas = self.memory_store['metadatas']
+        lines = (
+            json.dumps({'id': doc_id, 'document': documents[row], 'metadata': metadatas[row]}, default=str) + '\n'
+            for row, doc_id in enumerate(self.memory_store['ids'][start or 0:], start or 0)
+        )
+        if start is None:
+            with open(path + '.jsonl.tmp', 'w') as f:
+                f.writelines(lines)
+            os.replace(path + '.jsonl.tmp', path + '.jsonl')
+        else:
+            with open(path + '.jsonl', 'a') as f:
+                f.writelines(lines)
+
+        for array in (self._emb_matrix, self._alive, self._scales):
+            if array is not None:
+                array.flush()
+        state = {
+            'dim': self.embedding_dimension,
+            'quantize': self.quantize,
+            'capacity': len(self._emb_matrix),
+            'n_rows': self._n_rows
+        }
+        with open(path + '.json.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(path + '.json.tmp', path + '.json')
+
+    def _load_memory_store(self) -> bool:
+        """Map a previously persisted store; False if missing or incompatible."""
+        path = self._memory_path
+        try:
+            with open(path + '.json') as f:
+                state = json.load(f)
+            if state['dim'] != self.embedding_dimension or state['quantize'] != self.quantize:
+                return False
+            capacity, n = state['capacity'], state['n_rows']
+            with open(path + '.jsonl') as f:
+                rows = [json.loads(line) for line in islice(f, n)]
+                trailing = bool(f.readline())
+            if len(rows) != n:
+                return False
+            dtype = np.int8 if self.quantize else np.float32
+            emb_matrix = np.memmap(path + '.emb', dtype=dtype, mode='r+', shape=(capacity, self.embedding_dimension))
+            alive = np.memmap(path + '.alive', dtype=bool, mode='r+', shape=(capacity,))
+            scales = None
+            if self.quantize:
+                scales = np.memmap(path + '.scales', dtype=np.float32, mode='r+', shape=(capacity,))
+        except (OSError, ValueError, KeyError):
+            return False
+
+        documents = [row['document'] for row in rows]
+        self.memory_store = {
+            'ids': [row['id'] for row in rows],
+            'documents': documents,
+            'metadatas': [row['metadata'] for row in rows],
+            'previews': [doc[:PREVIEW_CHARS] for doc in documents],
+            'tokens': [frozenset(tokenize(doc)) for doc in documents]
+        }
+        self._emb_matrix, self._alive, self._scales = emb_matrix, alive, scales
+        self._n_rows = n
+        live_rows = self._live_rows().tolist()
+        self._id_to_row = {self.memory_store['ids'][row]: row for row in live_rows}
+        self._free_rows = []
+        self._inverted = {}
+        self._meta_index = {}
+        self._index_rows(live_rows)
+        self._rebuild_hnsw()
+        if trailing:
+            # Rows appended by an interrupted save
+            self._save_memory_store()
+        return True
+
+    def _index_rows(self, rows: Iterable[int]) -> None:
+        """Add live rows to the token and metadata indexes."""
+        tokens = self.memory_store['tokens']
+        metadatas = self.memory_store['metadatas']
+        for row in rows:
+            for token in tokens[row]:
+                self._inverted.setdefault(token, set()).add(row)
+            for key, value in metadatas[row].items():
+                if isinstance(value, INDEXED_METADATA_TYPES):
+                    self._meta_index.setdefault(key, {}).setdefault(value, set()).add(row)
+
+    def _filter_rows(self, filter: Dict[str, Any]) -> Optional[set]:
+        """
+        Live rows whose metadata matches every filter item.
+
+        Returns None when a filter value is not an indexed scalar (None
+        also matches rows lacking the key), so callers scan instead.
+        """
+        postings = []
+        for key, value in filter.items():
+            if not isinstance(value, INDEXED_METADATA_TYPES):
+                return None
+            postings.append(self._meta_index.get(key, {}).get(value, set()))
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def _delete_rows(self, ids: List[str]) -> None:
+        """Tombstone the rows of the given IDs, compacting if many are dead."""
+        for doc_id in ids:
+            row = self._id_to_row.pop(doc_id, None)
+            if row is not None:
+                self._tombstone(row)
+        if self._n_rows - len(self._id_to_row) > COMPACT_RATIO * self._n_rows:
+            self._compact()
+            self._save_memory_store()
+        else:
+            self._save_memory_store(self._n_rows)
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows and renumber the live ones."""
+        keep = np.flatnonzero(self._alive[:self._n_rows])
+        n = len(keep)
+        self._emb_matrix[:n] = self._emb_matrix[keep]
+        if self.quantize:
+            self._scales[:n] = self._scales[keep]
+        self._alive[:n] = True
+        self._alive[n:self._n_rows] = False
+        for key, values in self.memory_store.items():
+            self.memory_store[key] = [values[i] for i in keep]
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(self.memory_store['ids'])}
+        self._n_rows = n
+        self._free_rows = []
+        # Row numbers changed, so the indexes are rebuilt over the survivors
+        self._inverted = {}
+        self._meta_index = {}
+        self._index_rows(range(n))
+        self._rebuild_hnsw()
+
+    def _rebuild_hnsw(self) -> None:
+        """Drop the index after rows were renumbered or reloaded, rebuilding it if large enough."""
+        self._hnsw = None
+        self._ensure_hnsw()
+
+    def _tombstone(self, row: int) -> None:
+        """Mark a row deleted, remove it from the indexes and free its slot."""
+        self._alive[row] = False
+        self._free_rows.append(row)
+        for token in self.memory_store['tokens'][row]:
+            rows = self._inverted[token]
+            rows.discard(row)
+            if not rows:
+                del self._inverted[token]
+        for key, value in self.memory_store['metadatas'][row].items():
+            values = self._meta_index.get(key, {})
+            if isinstance(value, INDEXED_METADATA_TYPES) and value in values:
+                values[value].discard(row)
+                if not values[value]:
+                    del values[value]
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(row)
+
+    def _live_rows(self) -> np.ndarray:
+        """Row indices of documents that have not been deleted."""
+        return np.flatnonzero(self._alive[:self._n_rows])
+
+    @property
+    def embedding_model(self):
+        """The sentence-transformers model, loaded on first access; None if unavailable."""
+        if self._embedding_model is None and EMBEDDINGS_AVAILABLE:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    # device=None lets sentence-transformers pick CUDA/MPS when present
+                    self._embedding_model = SentenceTransformer(
+                        self.embedding_model_name,
+                        device=os.getenv("CHRIST_EMBEDDING_DEVICE") or None
+                    )
+        return self._embedding_model
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, keeping the last QUERY_CACHE_SIZE embeddings."""
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            self._query_cache.move_to_end(query)
+            return cached
+        embedding = self._embed_texts([query])[0]
+        embedding.flags.writeable = False
+        self._query_cache[query] = embedding
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return embedding
+
     def _embed_texts(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for texts.
+
+        Returns a C-contiguous float32 array, one row per text, so it can be
+        handed to ChromaDB and numpy kernels without conversion.
         """
-        if self.embedding_model is not None:
-            return self.embedding_model.encode(texts, convert_to_numpy=True)
+        model = self.embedding_model
+        if model is not None:
+            # encode() length-sorts each call internally, so batches pad little
+            embeddings = model.encode(
+                texts,
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
         else:
-            # Fallback to random embeddings (for testing only)
-            import hashlib
-            embeddings = []
-            for text in texts:
-                # Generate deterministic "embedding" from text hash
-                hash_obj = hashlib.sha256(text.encode())
-                hash_bytes = hash_obj.digest()
-                # Convert to float array
-                embedding = np.frombuffer(hash_bytes, dtype=np.uint8)[:self.embedding_dimension]
-                embedding = embedding.astype(np.float32) / 255.0
-                # Pad if necessary
-                if len(embedding) < self.embedding_dimension:
-                    embedding = np.pad(embedding, (0, self.embedding_dimension - len(embedding)))
-                embeddings.append(embedding)
-            return np.array(embeddings)
+            # Fallback to hash-seeded embeddings (for testing only)
+            return hash_embeddings(texts, self.embedding_dimension)
 
     def delete(self, ids: List[str]):
         """
@@ -274,13 +1006,8 @@ class VectorStore:
             self.collection.delete(ids=ids)
         else:
             # Remove from memory store
-            for id_to_remove in ids:
-                if id_to_remove in self.memory_store['ids']:
-                    idx = self.memory_store['ids'].index(id_to_remove)
-                    self.memory_store['ids'].pop(idx)
-                    self.memory_store['embeddings'].pop(idx)
-                    self.memory_store['documents'].pop(idx)
-                    self.memory_store['metadatas'].pop(idx)
+            self._delete_rows(ids)
+        self.version += 1
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -289,7 +1016,7 @@ class VectorStore:
         if self.collection is not None:
             count = self.collection.count()
         else:
-            count = len(self.memory_store['ids'])
+            count = len(self._id_to_row)
 
         return {
             'total_documents': count,
@@ -321,7 +1048,7 @@ class VectorStore:
         else:
             # Get from memory store
             documents = []
-            for i in range(len(self.memory_store['ids'])):
+            for i in self._live_rows():
                 doc = {
                     'id': self.memory_store['ids'][i],
                     'text': self.memory_store['documents'][i],
@@ -341,12 +1068,8 @@ class VectorStore:
             self.collection.delete(ids=[doc_id])
         else:
             # Delete from memory store
-            if doc_id in self.memory_store['ids']:
-                idx = self.memory_store['ids'].index(doc_id)
-                self.memory_store['ids'].pop(idx)
-                self.memory_store['embeddings'].pop(idx)
-                self.memory_store['documents'].pop(idx)
-                self.memory_store['metadatas'].pop(idx)
+            self._delete_rows([doc_id])
+        self.version += 1
 
     def clear(self):
         """
@@ -361,12 +1084,120 @@ class VectorStore:
             )
         else:
             # Clear memory store
-            self.memory_store = {
-                'ids': [],
-                'embeddings': [],
-                'documents': [],
-                'metadatas': []
-            }
+            self._reset_memory_store()
+        self.version += 1
+
+
+class _SimpleTTLCache:
+    """Minimal stand-in for ``cachetools.TTLCache`` (get/set/clear only)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        if time.monotonic() - entry[0] > self.ttl:
+            del self._data[key]
+            return default
+        return entry[1]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class CachedVectorStore:
+    """
+    Vector store wrapper that remembers recent search results.
+
+    Repeated searches with the same query, k and filter within
+    ``SEARCH_CACHE_TTL`` seconds skip the embedding and similarity search.
+    Writes through the wrapper drop the cache; other attributes are
+    forwarded to the wrapped store.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        maxsize: int = SEARCH_CACHE_SIZE,
+        ttl: float = SEARCH_CACHE_TTL
+    ):
+        """
+        Initialize the cache wrapper.
+
+        Args:
+            store: Vector store to wrap
+            maxsize: Maximum number of cached searches
+            ttl: Seconds a cached search stays valid
+        """
+        self.store = store
+        if CACHETOOLS_AVAILABLE:
+            self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        else:
+            self._cache = _SimpleTTLCache(maxsize, ttl)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.store, name)
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search, answering repeats from the cache.
+
+        Every result carries ``cache_hit`` so callers can tell whether the
+        context was freshly retrieved.
+        """
+        key = (query, k, json.dumps(filter, sort_keys=True, default=str))
+        results = self._cache.get(key)
+        if results is not None:
+            return [{**result, 'cache_hit': True} for result in results]
+
+        results = self.store.search(query, k=k, filter=filter)
+        self._cache[key] = results
+        return [{**result, 'cache_hit': False} for result in results]
+
+    async def asearch(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search without blocking the event loop."""
+        return await asyncio.to_thread(self.search, query, k, filter)
+
+    def add_documents(self, *args, **kwargs) -> List[str]:
+        """Add documents and invalidate cached searches."""
+        ids = self.store.add_documents(*args, **kwargs)
+        self._cache.clear()
+        return ids
+
+    def delete(self, ids: List[str]):
+        """Delete documents and invalidate cached searches."""
+        self.store.delete(ids)
+        self._cache.clear()
+
+    def delete_document(self, doc_id: str):
+        """Delete a document and invalidate cached searches."""
+        self.store.delete_document(doc_id)
+        self._cache.clear()
+
+    def clear(self):
+        """Clear the store and cached searches."""
+        self.store.clear()
+        self._cache.clear()
 
 
 class HybridRetriever:
@@ -409,14 +1240,13 @@ class HybridRetriever:
         keyword_results = self._keyword_search(query, k=k*2, filter=filter)
 
         # Merge and rerank
-        merged_results = self._merge_results(
+        return self._merge_results(
             semantic_results,
             keyword_results,
-            semantic_weight
+            semantic_weight,
+            k
         )
 
-        return merged_results[:k]
-
     def _keyword_search(
         self,
         query: str,
@@ -425,36 +1255,43 @@ class HybridRetriever:
     ) -> List[Dict[str, Any]]:
         """
         Simple keyword search.
+
+        Scores each document by the fraction of query words it contains,
+        visiting only rows listed under a query word in the store's
+        inverted index.
         """
         # This is a placeholder - in production, use Elasticsearch or similar
         results = []
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
+        query_words = set(tokenize(query))
 
         # Search in memory store or get all documents
-        if hasattr(self.vector_store, 'memory_store'):
+        if query_words and hasattr(self.vector_store, 'memory_store'):
             documents = self.vector_store.memory_store['documents']
             metadatas = self.vector_store.memory_store['metadatas']
             ids = self.vector_store.memory_store['ids']
+            inverted = self.vector_store._inverted
+
+            # Count matched query words per live row
+            matches: Dict[int, int] = {}
+            for word in query_words:
+                for row in inverted.get(word, ()):
+                    matches[row] = matches.get(row, 0) + 1
 
-            for i, doc in enumerate(documents):
+            matching = self.vector_store._filter_rows(filter) if filter else None
+            for i in sorted(matches):
                 # Apply filter
-                if filter and not all(metadatas[i].get(k) == v for k, v in filter.items()):
+                if matching is not None:
+                    if i not in matching:
+                        continue
+                elif filter and not all(metadatas[i].get(k) == v for k, v in filter.items()):
                     continue
 
-                # Calculate keyword score
-                doc_lower = doc.lower()
-                doc_words = set(doc_lower.split())
-                common_words = query_words.intersection(doc_words)
-                score = len(common_words) / len(query_words) if query_words else 0
-
-                if score > 0:
-                    results.append({
-                        'id': ids[i],
-                        'document': doc,
-                        'metadata': metadatas[i],
-                        'score': score
-                    })
+                results.append({
+                    'id': ids[i],
+                    'document': documents[i],
+                    'metadata': metadatas[i],
+                    'score': matches[i] / len(query_words)
+                })
 
         # Sort by score
         results.sort(key=lambda x: x['score'], reverse=True)
@@ -464,10 +1301,13 @@ class HybridRetriever:
         self,
         semantic_results: List[Dict[str, Any]],
         keyword_results: List[Dict[str, Any]],
-        semantic_weight: float
+        semantic_weight: float,
+        k: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Merge and rerank results from different search methods.
+
+        Returns the ``k`` best merged results, or all of them if k is None.
         """
         # Create a unified score for each document
         doc_scores = {}
@@ -502,8 +1342,12 @@ class HybridRetriever:
                     'final_score': result['score'] * keyword_weight
                 }
 
-        # Convert to list and sort
-        final_results = [
+        # Keep the k best in O(M log k); equal scores keep insertion order
+        if k is None:
+            k = len(doc_scores)
+        best = heapq.nlargest(k, doc_scores.items(), key=lambda item: item[1]['final_score'])
+
+        return [
             {
                 'id': doc_id,
                 'document': data['document'],
@@ -512,8 +1356,5 @@ class HybridRetriever:
                 'semantic_score': data['semantic_score'],
                 'keyword_score': data['keyword_score']
             }
-            for doc_id, data in doc_scores.items()
-        ]
-
-        final_results.sort(key=lambda x: x['score'], reverse=True)
-        return final_results
\ No newline at end of file
+            for doc_id, data in best
+        ]
\ No newline at end of file
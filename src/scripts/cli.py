@@ -6,6 +6,8 @@ Command-line interface for C.H.R.I.S.T. data ingestion.
 import click
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -17,6 +19,19 @@ from consciousness.parsers import UniversalParser
 from consciousness.database import init_database, get_db_manager
 from consciousness.encryption import get_encryption_manager, ConsentBasedEncryption
 
+# Items processed and written per database transaction by `ingest`
+INGEST_BATCH_SIZE = 64
+
+
+def _chunks(items, size):
+    """Yield successive lists of at most ``size`` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 @click.group()
 @click.pass_context
@@ -59,14 +74,25 @@ def ingest(ctx, file, type, consent, user_id):
 
         # Process based on consent
         if isinstance(data, list):
-            # Multiple items (e.g., mbox file)
+            # Multiple items (e.g., mbox file): encrypt one batch while a
+            # writer thread commits the previous one
             count = 0
-            for item in data:
-                processed = consent_encryption.process_data(item, consent)
-                if processed:
-                    processed['user_id'] = user_id
-                    db_manager.store_event(processed)
-                    count += 1
+            with ThreadPoolExecutor(max_workers=1) as writer:
+                pending = None
+                for chunk in _chunks(data, INGEST_BATCH_SIZE):
+                    batch = []
+                    for item in chunk:
+                        processed = consent_encryption.process_data(item, consent)
+                        if processed:
+                            processed['user_id'] = user_id
+                            batch.append(processed)
+                    if pending is not None:
+                        count += len(pending.result())
+                        pending = None
+                    if batch:
+                        pending = writer.submit(db_manager.store_events_batch, batch)
+                if pending is not None:
+                    count += len(pending.result())
             click.echo(f"✅ Successfully ingested {count} items")
         else:
             # Single item
@@ -212,18 +238,22 @@ def stats(ctx, output):
         session = db_manager.get_session()
 
         from consciousness.database import Event, Entity, Artifact, ConsentRecord
-
-        # Get counts
-        stats_data = {
-            'timestamp': datetime.now().isoformat(),
-            'events': session.query(Event).count(),
-            'entities': session.query(Entity).count(),
-            'artifacts': session.query(Artifact).count(),
-            'consent_records': session.query(ConsentRecord).count(),
+        from sqlalchemy import func, select
+
+        # Get all counts in one round-trip
+        models = {
+            'events': Event,
+            'entities': Entity,
+            'artifacts': Artifact,
+            'consent_records': ConsentRecord,
         }
+        counts = session.execute(select(*(
+            select(func.count()).select_from(model).scalar_subquery()
+            for model in models.values()
+        ))).one()
+        stats_data = {'timestamp': datetime.now().isoformat(), **dict(zip(models, counts))}
 
-        # Get event types breakdown
-        from sqlalchemy import func
+        # Get event types breakdown (served by the event_type index)
         event_types = session.query(
             Event.event_type,
             func.count(Event.id)
@@ -275,14 +305,16 @@ def delete_all(ctx, confirm, user_id):
 
         from consciousness.database import Event, Entity, Artifact, Relationship
 
-        # Delete all user data
-        session.query(Event).filter(Event.user_id == user_id).delete()
-        session.query(Entity).filter(Entity.user_id == user_id).delete()
-        session.query(Artifact).filter(Artifact.user_id == user_id).delete()
-        session.query(Relationship).filter(Relationship.user_id == user_id).delete()
-
-        session.commit()
-        session.close()
+        # Delete all user data in one transaction; nothing is loaded into
+        # the session, so skip synchronizing it
+        try:
+            with session.begin():
+                for model in (Event, Entity, Artifact, Relationship):
+                    session.query(model).filter(model.user_id == user_id).delete(
+                        synchronize_session=False
+                    )
+        finally:
+            session.close()
 
         click.echo(f"✅ All data deleted for user: {user_id}")
 
@@ -5,9 +5,49 @@ Manages life goals, purpose tracking, legacy modes, and the evolution
 of the consciousness over time.
 """
 
-from typing import Dict, Any, List, Optional
+import sys
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
+# Goal arrays start with this many rows and double when full
+GOAL_CAPACITY = 64
+
+# Life-review periods in seconds; other periods cover every goal
+REVIEW_PERIODS = {
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400
+}
+
+# Legacy modes accepted by set_legacy_mode
+VALID_LEGACY_MODES = frozenset({"executor", "archivist", "muse"})
+
+# Buckets for the progress histogram over 0-100
+PROGRESS_BINS = 10
+
+# Timestamp of the last whole second seen by _now_stamp
+_last_sec = 0
+_last_stamp: Tuple[str, np.datetime64] = ("", np.datetime64("NaT"))
+
+
+def _now_stamp() -> Tuple[str, np.datetime64]:
+    """
+    Current local time as (ISO string, datetime64[s]).
+
+    Formatting is redone at most once per second, so bulk goal imports
+    mostly reuse the previous result.
+    """
+    global _last_sec, _last_stamp
+    sec = int(time.time())
+    if sec != _last_sec:
+        moment = datetime.fromtimestamp(sec)
+        _last_sec, _last_stamp = sec, (moment.isoformat(), np.datetime64(moment, "s"))
+    return _last_stamp
+
 
 class TeleologyTransformation:
     """
@@ -17,6 +57,17 @@ class TeleologyTransformation:
     def __init__(self):
         """Initialize the Teleology & Transformation component."""
         self.goals = []
+        self._goal_rows: Dict[str, int] = {}
+
+        # Struct-of-arrays copy of the goal fields used for analytics; row i
+        # mirrors self.goals[i] and categories are codes into _categories
+        self._progress = np.zeros(GOAL_CAPACITY, dtype=np.float64)
+        self._created_at = np.zeros(GOAL_CAPACITY, dtype="datetime64[s]")
+        self._target_at = np.full(GOAL_CAPACITY, np.datetime64("NaT"), dtype="datetime64[s]")
+        self._category = np.zeros(GOAL_CAPACITY, dtype=np.int32)
+        self._categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+
         self.life_themes = []
         self.legacy_mode = None
         self.is_initialized = False
@@ -42,13 +93,53 @@ class TeleologyTransformation:
         if not self.is_initialized:
             await self.initialize()
 
-        goal_id = f"goal_{len(self.goals)}"
+        row = len(self.goals)
+        goal_id = f"goal_{row}"
+        created_iso, created_at = _now_stamp()
         goal["id"] = goal_id
-        goal["created_at"] = datetime.now().isoformat()
+        goal["created_at"] = created_iso
         goal["progress"] = 0.0
         self.goals.append(goal)
+        self._goal_rows[goal_id] = row
+
+        self._ensure_goal_capacity(row + 1)
+        self._progress[row] = 0.0
+        self._created_at[row] = created_at
+        self._target_at[row] = self._parse_target(goal.get("target_date"))
+        self._category[row] = self._category_code(goal.get("category") or "uncategorized")
         return goal_id
 
+    def _ensure_goal_capacity(self, needed: int) -> None:
+        """Double the goal arrays until they hold ``needed`` rows."""
+        capacity = len(self._progress)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_progress", "_created_at", "_target_at", "_category"):
+            old = getattr(self, name)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def _category_code(self, category: str) -> int:
+        """Return the integer code for a category, assigning a new one if needed."""
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self._categories)
+            self._categories.append(category)
+        return code
+
+    @staticmethod
+    def _parse_target(target: Any) -> np.datetime64:
+        """Convert a goal's target date to datetime64, NaT if missing or invalid."""
+        if target is None:
+            return np.datetime64("NaT")
+        try:
+            return np.datetime64(target, "s")
+        except (ValueError, TypeError):
+            return np.datetime64("NaT")
+
     async def update_goal_progress(
         self,
         goal_id: str,
@@ -67,13 +158,16 @@ class TeleologyTransformation:
             True if update was successful
         """
         # TODO: Implement goal progress tracking
-        for goal in self.goals:
-            if goal["id"] == goal_id:
-                goal["progress"] = progress
-                if milestones:
-                    goal["milestones"] = milestones
-                return True
-        return False
+        row = self._goal_rows.get(goal_id)
+        if row is None:
+            return False
+
+        goal = self.goals[row]
+        goal["progress"] = progress
+        self._progress[row] = progress
+        if milestones:
+            goal["milestones"] = milestones
+        return True
 
     async def generate_life_review(
         self,
@@ -90,11 +184,44 @@ class TeleologyTransformation:
         Returns:
             Life review with insights and recommendations
         """
-        # TODO: Implement life review generation
+        n = len(self.goals)
+        now = _now_stamp()[1]
+
+        # Select goals in the period and focus areas without a Python loop
+        mask = np.ones(n, dtype=bool)
+        if period in REVIEW_PERIODS:
+            mask &= self._created_at[:n] >= now - np.timedelta64(REVIEW_PERIODS[period], "s")
+        if focus_areas:
+            codes = [self._category_codes[a] for a in focus_areas if a in self._category_codes]
+            mask &= np.isin(self._category[:n], codes)
+
+        rows = np.flatnonzero(mask)
+        progress = self._progress[rows]
+        completed = progress >= 100.0
+        overdue = (self._target_at[rows] < now) & ~completed
+        by_category = np.bincount(self._category[rows], minlength=len(self._categories))
+        histogram, _ = np.histogram(progress, bins=PROGRESS_BINS, range=(0.0, 100.0))
+
+        # TODO: Implement narrative and recommendation generation
         return {
             "period": period,
             "narrative": "Life review narrative placeholder",
-            "achievements": [],
+            "goals": {
+                "total": int(rows.size),
+                "completed": int(completed.sum()),
+                "overdue": int(overdue.sum()),
+                "mean_progress": float(progress.mean()) if rows.size else 0.0,
+                "progress_histogram": histogram.tolist(),
+                "by_category": {
+                    category: int(count)
+                    for category, count in zip(self._categories, by_category)
+                    if count
+                }
+            },
+            "achievements": [
+                self.goals[row].get("title", self.goals[row]["id"])
+                for row in rows[completed]
+            ],
             "challenges": [],
             "growth_areas": [],
             "recommendations": []
@@ -115,14 +242,13 @@ class TeleologyTransformation:
         Returns:
             True if configuration was successful
         """
-        valid_modes = ["executor", "archivist", "muse"]
-        if mode not in valid_modes:
+        if mode not in VALID_LEGACY_MODES:
             return False
 
         self.legacy_mode = {
-            "mode": mode,
+            "mode": sys.intern(mode),
             "settings": settings or {},
-            "activated_at": datetime.now().isoformat()
+            "activated_at": _now_stamp()[0]
         }
         return True
 
@@ -2,11 +2,25 @@
 Web interface routes for C.H.R.I.S.T. system.
 """
 
-from fastapi import APIRouter, Request, Form, UploadFile, File
-from fastapi.responses import HTMLResponse, RedirectResponse
+import gzip
+import hashlib
+import os
+from email.utils import formatdate
+from typing import Dict, List, Optional, Tuple
+
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.routing import Mount, Route
+from starlette.staticfiles import NotModifiedResponse
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 # Setup templates
 templates_dir = Path(__file__).parent / "templates"
@@ -14,58 +28,274 @@ static_dir = Path(__file__).parent / "static"
 
 templates = Jinja2Templates(directory=str(templates_dir))
 
-# Create router
-web_router = APIRouter()
+# Templates ship with the package and don't change while the server runs,
+# so compile them all once here and skip Jinja's per-render mtime check.
+templates.env.auto_reload = False
+compiled_templates = {
+    path.name: templates.get_template(path.name)
+    for path in templates_dir.glob("*.html")
+}
+
+# Dashboard pages: URL path -> template name
+PAGES = {
+    "/": "index.html",             # Dashboard
+    "/ingest": "ingest.html",      # Data ingestion
+    "/search": "search.html",      # Search
+    "/chat": "chat.html",          # Chat interface
+    "/reflections": "reflections.html",
+    "/goals": "goals.html",
+    "/settings": "settings.html",
+}
+
+HTML_HEADERS = [(b"content-type", b"text/html; charset=utf-8")]
+
+# Static assets aren't fingerprinted, so let browsers reuse them for an
+# hour and revalidate with the precomputed ETag after that
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+# ASGI extension that lets the server send a file itself (sendfile(2))
+PATHSEND = "http.response.pathsend"
+
+# Read size when files are streamed through Python; 1 MiB chunks mean
+# fewer read()/send() round trips than Starlette's 64 KiB default
+STATIC_CHUNK_SIZE = 1 << 20
+
+
+class StaticHTMLEndpoint:
+    """
+    ASGI endpoint that serves one pre-rendered HTML page.
+
+    The page never depends on the request, so the body is encoded once and
+    written straight to ``send`` without building Request/Response objects.
+    Gzip and, with the brotli package, Brotli copies are compressed up
+    front and picked from ``Accept-Encoding``; each copy has its own ETag,
+    and a matching ``If-None-Match`` gets a bodyless 304.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        digest = hashlib.md5(body).hexdigest().encode("latin-1")
+        self.identity = self._variant(body, digest, None)
+        self.gzip = self._variant(gzip.compress(body, 9, mtime=0), digest, b"gzip")
+        self.br = (
+            self._variant(brotli.compress(body, quality=11), digest, b"br")
+            if BROTLI_AVAILABLE else None
+        )
+
+    @staticmethod
+    def _variant(payload: bytes, digest: bytes, encoding: Optional[bytes]):
+        """Build (payload, etag, headers, 304 headers) for one content encoding."""
+        etag = b'"' + digest + (b"-" + encoding if encoding else b"") + b'"'
+        not_modified_headers = [(b"etag", etag), (b"vary", b"accept-encoding")]
+        headers = HTML_HEADERS + not_modified_headers + [
+            (b"content-length", str(len(payload)).encode("latin-1"))
+        ]
+        if encoding:
+            headers.append((b"content-encoding", encoding))
+        return payload, etag, headers, not_modified_headers
+
+    def negotiate(self, scope):
+        """
+        Pick the copy to send and whether the client already holds it.
+
+        Returns:
+            (variant, cached)
+        """
+        accept = match = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value
+            elif name == b"if-none-match":
+                match = value
+
+        variant = self.identity
+        if accept:
+            if self.br is not None and b"br" in accept:
+                variant = self.br
+            elif b"gzip" in accept:
+                variant = self.gzip
 
+        cached = match is not None and (match.strip() == b"*" or variant[1] in match)
+        return variant, cached
 
-@web_router.get("/", response_class=HTMLResponse)
-async def index(request: Request):
-    """Dashboard page."""
-    return templates.TemplateResponse("index.html", {"request": request})
+    async def __call__(self, scope, receive, send):
+        (payload, _, headers, not_modified_headers), cached = self.negotiate(scope)
+        if cached:
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": not_modified_headers,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
 
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": headers,
+        })
+        await send({
+            "type": "http.response.body",
+            "body": b"" if scope["method"] == "HEAD" else payload,
+        })
 
-@web_router.get("/ingest", response_class=HTMLResponse)
-async def ingest_page(request: Request):
-    """Data ingestion page."""
-    return templates.TemplateResponse("ingest.html", {"request": request})
 
+class PathsendFileResponse(FileResponse):
+    """
+    FileResponse that hands whole files to the server via ``pathsend``.
 
-@web_router.get("/search", response_class=HTMLResponse)
-async def search_page(request: Request):
-    """Search page."""
-    return templates.TemplateResponse("search.html", {"request": request})
+    When the server advertises the extension, the body never passes through
+    Python; otherwise (ranges, HEAD, servers without it) this falls back to
+    FileResponse's chunked reads.
+    """
 
+    chunk_size = STATIC_CHUNK_SIZE
 
-@web_router.get("/chat", response_class=HTMLResponse)
-async def chat_page(request: Request):
-    """Chat interface page."""
-    return templates.TemplateResponse("chat.html", {"request": request})
+    async def __call__(self, scope, receive, send):
+        if (
+            PATHSEND not in scope.get("extensions", {})
+            or self.status_code != 200
+            or scope["method"] == "HEAD"
+            or any(name == b"range" for name, _ in scope["headers"])
+        ):
+            await super().__call__(scope, receive, send)
+            return
 
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        await send({"type": PATHSEND, "path": str(self.path)})
 
-@web_router.get("/reflections", response_class=HTMLResponse)
-async def reflections_page(request: Request):
-    """Reflections page."""
-    return templates.TemplateResponse("reflections.html", {"request": request})
 
+def static_entry(full_path: str, stat_result: os.stat_result) -> Tuple[str, os.stat_result, Dict[str, str]]:
+    """Build a manifest entry: (full path, stat result, cache headers)."""
+    headers = {
+        "etag": f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": STATIC_CACHE_CONTROL,
+    }
+    return full_path, stat_result, headers
 
-@web_router.get("/goals", response_class=HTMLResponse)
-async def goals_page(request: Request):
-    """Goals tracking page."""
-    return templates.TemplateResponse("goals.html", {"request": request})
 
+def scan_static(directory: str) -> Dict[str, Tuple[str, os.stat_result, Dict[str, str]]]:
+    """
+    Stat every file under ``directory`` once.
 
-@web_router.get("/settings", response_class=HTMLResponse)
-async def settings_page(request: Request):
-    """Settings page."""
-    return templates.TemplateResponse("settings.html", {"request": request})
+    Returns:
+        Map of relative path to (full path, stat result, cache headers)
+    """
+    manifest = {}
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    manifest[os.path.relpath(entry.path, directory)] = static_entry(
+                        entry.path, entry.stat()
+                    )
+    return manifest
 
 
-# Additional pages can be added here
+class StaticAssets(StaticFiles):
+    """
+    StaticFiles that serves files through PathsendFileResponse.
+
+    Files present at startup are served from a precomputed manifest, so
+    conditional requests are answered with a 304 without touching the disk;
+    full responses re-stat the file and refresh its entry if it changed.
+    Canonical URLs of those files skip path normalization after first use.
+    """
+
+    def __init__(self, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.manifest = scan_static(directory)
+        self._resolved: Dict[str, str] = {}
+
+    def get_path(self, scope):
+        path = self._resolved.get(scope["path"])
+        if path is not None:
+            return path
+
+        path = super().get_path(scope)
+        # Only exact canonical URLs are remembered, which bounds the cache
+        # by the manifest size however the client spells its paths
+        if path in self.manifest:
+            url_path = "/" + path.replace(os.sep, "/")
+            if scope["path"] in (url_path, scope.get("root_path", "") + url_path):
+                self._resolved[scope["path"]] = path
+        return path
+
+    async def get_response(self, path, scope):
+        asset = self.manifest.get(path)
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        full_path, stat_result, headers = asset
+        request_headers = Headers(scope=scope)
+        if self.is_not_modified(headers, request_headers):
+            return NotModifiedResponse(headers)
+
+        # A body is about to be sent, so check the file still matches the
+        # manifest; an asset edited while serving gets fresh validators
+        try:
+            current = os.stat(full_path)
+        except OSError:
+            self.manifest.pop(path, None)
+            return await super().get_response(path, scope)
+        if (current.st_mtime_ns, current.st_size) != (stat_result.st_mtime_ns, stat_result.st_size):
+            full_path, stat_result, headers = self.manifest[path] = static_entry(full_path, current)
+            if self.is_not_modified(headers, request_headers):
+                return NotModifiedResponse(headers)
+        return PathsendFileResponse(full_path, headers=headers, stat_result=stat_result)
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = PathsendFileResponse(
+            full_path,
+            status_code=status_code,
+            headers={"cache-control": STATIC_CACHE_CONTROL},
+            stat_result=stat_result
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def render_page(name: str) -> bytes:
+    """Render a precompiled template to UTF-8 bytes."""
+    return compiled_templates[name].render().encode("utf-8")
+
+
+def page_routes() -> List[Route]:
+    """
+    Build plain Starlette routes for the dashboard pages.
+
+    Each endpoint is an ASGI app, so FastAPI's dependency resolution and
+    signature validation never run for these pages. Pages without a
+    template yet are left unrouted rather than failing.
+    """
+    return [
+        Route(
+            path,
+            StaticHTMLEndpoint(render_page(name)),
+            methods=["GET"],
+            name=name[:-len(".html")],
+            include_in_schema=False
+        )
+        for path, name in PAGES.items()
+        if name in compiled_templates
+    ]
+
 
 def setup_web_routes(app):
     """Setup web routes and static files."""
-    # Mount static files
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    # Mount static files first so asset requests match before any other route
+    app.router.routes.insert(
+        0, Mount("/static", app=StaticAssets(directory=str(static_dir)), name="static")
+    )
+
+    app.router.routes.extend(page_routes())
 
-    # Include web routes
-    app.include_router(web_router)
\ No newline at end of file
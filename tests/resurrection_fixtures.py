@@ -0,0 +1,79 @@
+"""
+Shared fixtures for the resurrection test modules.
+"""
+
+import os
+import shutil
+import stat
+import subprocess
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from retrieval.vector_store import CHROMADB_AVAILABLE, EMBEDDINGS_AVAILABLE
+
+if CHROMADB_AVAILABLE:
+    import chromadb
+    from chromadb.config import Settings
+if EMBEDDINGS_AVAILABLE:
+    from sentence_transformers import SentenceTransformer
+
+
+def fast_rmtree(path) -> None:
+    """
+    Remove a directory tree, ignoring errors.
+
+    On POSIX this runs ``rm -rf``, which unlinks the many small files a
+    Chroma store leaves behind far faster than shutil.rmtree. Elsewhere it
+    uses shutil.rmtree, clearing read-only bits and retrying entries that
+    fail with PermissionError.
+    """
+    if os.name == "posix":
+        subprocess.run(["rm", "-rf", str(path)], check=False)
+        return
+
+    def retry_writable(func, failed_path, exc):
+        if isinstance(exc, PermissionError):
+            try:
+                os.chmod(failed_path, stat.S_IWRITE)
+                func(failed_path)
+            except OSError:
+                pass
+
+    # onerror is deprecated from 3.12 in favour of onexc
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=retry_writable)
+    else:
+        shutil.rmtree(path, onerror=lambda func, failed_path, exc_info: retry_writable(
+            func, failed_path, exc_info[1]
+        ))
+
+
+class SharedEmbedder:
+    """
+    Embedding model and ChromaDB client shared by every resurrection test.
+
+    Loading the sentence-transformers model dominates construction time,
+    so it is loaded once and handed to each ResurrectionConsciousness.
+    """
+
+    model = None
+    client = None
+
+    @classmethod
+    def load(cls):
+        """Load the shared objects on first use; None for missing backends."""
+        if cls.model is None and EMBEDDINGS_AVAILABLE:
+            cls.model = SentenceTransformer("all-MiniLM-L6-v2")
+        if cls.client is None and CHROMADB_AVAILABLE:
+            cls.client = chromadb.EphemeralClient(
+                settings=Settings(anonymized_telemetry=False, allow_reset=True)
+            )
+        return cls.model, cls.client
+
+    @classmethod
+    def reset(cls):
+        """Drop all collections on the shared client."""
+        if cls.client is not None:
+            cls.client.reset()
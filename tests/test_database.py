@@ -56,6 +56,38 @@ class TestDatabaseManager(unittest.TestCase):
         event_id = self.db_manager.store_event(event_data)
         self.assertEqual(event_id, 'test-event-001')
 
+    def test_store_events_batch(self):
+        """Test storing several events in one transaction."""
+        events = [
+            {
+                'id': f'batch-event-{i:03d}',
+                'user_id': 'test-user',
+                'timestamp': datetime.now().isoformat(),
+                'type': 'test_event',
+                'content_encrypted': {'ciphertext': 'abc'},
+                'metadata': {'index': i}
+            }
+            for i in range(5)
+        ]
+
+        event_ids = self.db_manager.store_events_batch(events)
+
+        self.assertEqual(event_ids, [e['id'] for e in events])
+        stored = self.db_manager.query_events(user_id='test-user', limit=10)
+        self.assertEqual(len(stored), 5)
+        self.assertEqual(self.db_manager.store_events_batch([]), [])
+
+    def test_store_events_batch_is_atomic(self):
+        """Test that a failing batch stores none of its events."""
+        events = [
+            {'id': 'ok-event', 'user_id': 'test-user', 'timestamp': datetime.now().isoformat(), 'type': 'test'},
+            {'id': 'bad-event', 'user_id': 'test-user', 'timestamp': 'invalid-timestamp', 'type': 'test'}
+        ]
+
+        with self.assertRaises(Exception):
+            self.db_manager.store_events_batch(events)
+        self.assertEqual(self.db_manager.query_events(user_id='test-user'), [])
+
     def test_query_events(self):
         """Test querying events."""
         # Store some test events
@@ -4,12 +4,42 @@ Test the Gospel-Based Jesus Resurrection
 Verifies responses are conversational and biblically grounded
 """
 
+import re
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from resurrections.jesus_gospel_based import JesusGospelBased, ConversationalJesusBot
 
+# Archaic pronouns that mark a response as biblical rather than conversational
+ARCHAIC_RE = re.compile(r"\b(?:thee|thou|thy|thine)\b", re.IGNORECASE)
+
+# Test cases matching user's requirements
+_TEST_QUERIES = (
+    # Identity questions
+    ("Who are you?", "Identity"),
+
+    # Daily life questions (user specifically wanted this)
+    ("Tell me about your daily life", "Daily Life"),
+    ("Who were your companions?", "Companions"),
+    ("What was it like walking with the disciples?", "Disciples"),
+
+    # Conversational questions
+    ("I'm afraid", "Fear/Comfort"),
+    ("How should I pray?", "Prayer"),
+    ("What about forgiveness?", "Forgiveness"),
+    ("Tell me about love", "Love"),
+
+    # Teaching questions
+    ("Teach me something", "Teaching"),
+    ("What should I do?", "Guidance"),
+
+    # Personal struggles
+    ("I'm suffering", "Healing/Comfort"),
+    ("Help me", "Help"),
+)
+
+
 def test_responses():
     """Test various types of responses"""
     print("\n" + "="*60)
@@ -19,34 +49,9 @@ def test_responses():
     # Initialize
     bot = ConversationalJesusBot()
 
-    # Test cases matching user's requirements
-    test_queries = [
-        # Identity questions
-        ("Who are you?", "Identity"),
-
-        # Daily life questions (user specifically wanted this)
-        ("Tell me about your daily life", "Daily Life"),
-        ("Who were your companions?", "Companions"),
-        ("What was it like walking with the disciples?", "Disciples"),
-
-        # Conversational questions
-        ("I'm afraid", "Fear/Comfort"),
-        ("How should I pray?", "Prayer"),
-        ("What about forgiveness?", "Forgiveness"),
-        ("Tell me about love", "Love"),
-
-        # Teaching questions
-        ("Teach me something", "Teaching"),
-        ("What should I do?", "Guidance"),
-
-        # Personal struggles
-        ("I'm suffering", "Healing/Comfort"),
-        ("Help me", "Help"),
-    ]
-
     print("\nTesting responses for conversational tone and biblical grounding:\n")
 
-    for query, category in test_queries:
+    for query, category in _TEST_QUERIES:
         print(f"Category: {category}")
         print(f"You: {query}")
         response = bot.respond(query)
@@ -62,15 +67,14 @@ def test_responses():
             checks.append("✗ Too long")
 
         # Is it conversational (not poetic)?
-        poetic_words = ["thee", "thou", "thy", "thine"]
-        has_archaic = any(word in response.lower() for word in poetic_words)
+        has_archaic = bool(ARCHAIC_RE.search(response))
         if has_archaic or not any(c.isalpha() for c in response):
             checks.append("✓ Uses biblical language appropriately")
         else:
             checks.append("✓ Conversational tone")
 
         # Does it avoid being preachy?
-        if len(response.split('.')) <= 3:
+        if response.count('.') <= 2:
             checks.append("✓ Not preachy")
 
         print(f"Checks: {', '.join(checks)}")
@@ -0,0 +1,200 @@
+"""
+Unit tests for the Holistic Self-Model knowledge graph.
+"""
+
+import asyncio
+import pytest
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from holistic import HolisticSelfModel
+
+
+def run(coro):
+    """Run a coroutine to completion."""
+    return asyncio.run(coro)
+
+
+class TestHolisticGraph:
+    """Test entity/relationship storage and graph queries."""
+
+    def setup_method(self):
+        """Set up a small graph: alice -> bob -> paris, alice -> paris."""
+        self.model = HolisticSelfModel()
+        self.alice = run(self.model.add_entity("person", {"name": "Alice"}))
+        self.bob = run(self.model.add_entity("person", {"name": "Bob"}))
+        self.paris = run(self.model.add_entity("location", {"name": "Paris"}))
+        run(self.model.add_relationship(self.alice, self.bob, "knows"))
+        run(self.model.add_relationship(self.bob, self.paris, "lives_in", {"since": 2020}))
+        run(self.model.add_relationship(self.alice, self.paris, "visited"))
+
+    def test_relationship_ids(self):
+        """Relationship IDs count up from one."""
+        rel_id = run(self.model.add_relationship(self.bob, self.alice, "knows"))
+        assert rel_id == "rel_4"
+
+    def test_full_graph(self):
+        """An empty query returns every node and edge."""
+        result = run(self.model.query_graph({}))
+
+        assert [n["id"] for n in result["nodes"]] == [self.alice, self.bob, self.paris]
+        assert len(result["edges"]) == 3
+        assert result["edges"][1] == {
+            "source": self.bob,
+            "target": self.paris,
+            "type": "lives_in",
+            "properties": {"since": 2020}
+        }
+
+    def test_filter_by_entity_type(self):
+        """Edges to filtered-out nodes are dropped."""
+        result = run(self.model.query_graph({"entity_types": ["person"]}))
+
+        assert {n["id"] for n in result["nodes"]} == {self.alice, self.bob}
+        assert [e["type"] for e in result["edges"]] == ["knows"]
+
+    def test_traversal_depth(self):
+        """Traversal follows outgoing edges up to the requested depth."""
+        one = run(self.model.query_graph({"entity_id": self.alice, "depth": 1}))
+        assert {e["type"] for e in one["edges"]} == {"knows", "visited"}
+
+        two = run(self.model.query_graph({"entity_id": self.alice, "depth": 2}))
+        assert {e["type"] for e in two["edges"]} == {"knows", "visited", "lives_in"}
+        assert {n["id"] for n in two["nodes"]} == {self.alice, self.bob, self.paris}
+
+    def test_traversal_relationship_filter(self):
+        """Relationship type filters restrict traversal."""
+        result = run(self.model.query_graph({
+            "entity_id": self.alice,
+            "depth": 3,
+            "relationship_types": ["knows"]
+        }))
+        assert {n["id"] for n in result["nodes"]} == {self.alice, self.bob}
+
+    def test_unknown_start(self):
+        """Traversal from an unknown entity returns an empty result."""
+        result = run(self.model.query_graph({"entity_id": "missing"}))
+        assert result == {"nodes": [], "edges": []}
+
+    def test_types_are_dictionary_encoded(self):
+        """Repeated type names share one int8 code."""
+        assert self.model._entity_type_ids.dtype == np.int8
+        assert self.model._entity_types.names == ["person", "location"]
+        assert self.model._relationship_types.names == ["knows", "lives_in", "visited"]
+        assert self.model.entities[self.paris] == {
+            "type": "location",
+            "properties": {"name": "Paris"}
+        }
+
+    def test_type_dictionaries_are_separate(self):
+        """Entity and relationship types each get the full int8 code range."""
+        run(self.model.add_entities([(f"kind{i}", {}) for i in range(126)]))
+        run(self.model.add_relationships([
+            (self.alice, self.bob, f"rel{i}", None) for i in range(125)
+        ]))
+
+        assert len(self.model._entity_types.names) == 128
+        assert len(self.model._relationship_types.names) == 128
+
+    def test_type_overflow_leaves_graph_unchanged(self):
+        """A batch with too many new types fails before adding anything."""
+        entities = dict(self.model.entities)
+        version = self.model._graph_version
+
+        with pytest.raises(ValueError):
+            run(self.model.add_entities([(f"kind{i}", {}) for i in range(127)]))
+        with pytest.raises(ValueError):
+            run(self.model.add_relationships([
+                (self.alice, "stranger", f"rel{i}", None) for i in range(126)
+            ]))
+
+        assert self.model.entities == entities
+        assert self.model._graph_version == version
+        assert len(self.model._entity_types.names) == 2
+        assert not self.model.has_entity("kind0_3")
+        assert "stranger" not in self.model._rid_to_dense
+
+    def test_edges_without_properties_share_no_slot(self):
+        """Only relationships with properties use the properties side list."""
+        assert len(self.model._props) == 1
+        assert self.model.relationships[0]["properties"] == {}
+        assert self.model.relationships[1]["properties"] == {"since": 2020}
+
+    def test_has_entity(self):
+        """Existence checks cover added entities only."""
+        assert self.model.has_entity(self.alice)
+        assert not self.model.has_entity("person_99")
+        assert self.model.has_relationship(self.alice, self.bob, "knows")
+        assert not self.model.has_relationship(self.bob, self.alice, "knows")
+        assert not self.model.has_relationship(self.alice, self.bob, "unknown")
+
+    def test_duplicate_relationship_suppressed(self):
+        """Re-adding an identical relationship returns the existing ID."""
+        rel_id = run(self.model.add_relationship(self.alice, self.bob, "knows"))
+
+        assert rel_id == "rel_1"
+        assert len(self.model.relationships) == 3
+
+        rel_ids = run(self.model.add_relationships([
+            (self.bob, self.alice, "knows", None),
+            (self.bob, self.alice, "knows", None)
+        ]))
+        assert rel_ids == ["rel_4", "rel_4"]
+
+    def test_unknown_type_filter(self):
+        """Filtering by a type that was never added matches nothing."""
+        result = run(self.model.query_graph({"relationship_types": ["unknown"]}))
+        assert result["edges"] == []
+        assert len(result["nodes"]) == 3
+
+    def test_query_cache(self):
+        """Repeated queries hit the cache until the graph changes."""
+        query = {"entity_id": self.alice, "depth": 2}
+        first = run(self.model.query_graph(query))
+        second = run(self.model.query_graph(dict(reversed(list(query.items())))))
+        assert second is first
+        assert self.model.cache_stats()["hits"] == 1
+
+        run(self.model.add_relationship(self.paris, self.alice, "home_of"))
+        third = run(self.model.query_graph(query))
+        assert third is not first
+        assert len(third["edges"]) == 4
+        assert self.model.cache_stats()["misses"] == 2
+
+    def test_batch_inserts(self):
+        """Batch inserts assign sequential IDs and are queryable."""
+        ids = run(self.model.add_entities([
+            ("person", {"name": "Carol"}),
+            ("event", {"name": "Wedding"})
+        ]))
+        assert ids == ["person_3", "event_4"]
+
+        rel_ids = run(self.model.add_relationships([
+            (ids[0], ids[1], "attended", None),
+            (self.alice, ids[1], "attended", {"role": "guest"})
+        ]))
+        assert rel_ids == ["rel_4", "rel_5"]
+
+        result = run(self.model.query_graph({"relationship_types": ["attended"]}))
+        assert [e["source"] for e in result["edges"]] == [ids[0], self.alice]
+        assert result["edges"][0]["properties"] == {}
+        assert self.model.entities[ids[1]]["type"] == "event"
+
+    def test_edges_after_compaction(self):
+        """Edges added after a CSR rebuild are merged with compacted ones."""
+        self.model._finalize()
+        assert self.model._delta.size == 0
+
+        carol = run(self.model.add_entity("person", {"name": "Carol"}))
+        run(self.model.add_relationship(self.alice, carol, "knows"))
+
+        result = run(self.model.query_graph({"entity_id": self.alice}))
+        assert {e["target"] for e in result["edges"]} == {self.bob, self.paris, carol}
+        assert len(self.model.relationships) == 4
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
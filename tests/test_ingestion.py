@@ -0,0 +1,156 @@
+"""
+Unit tests for consciousness ingestion.
+"""
+
+import math
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from consciousness.ingestion import ConsciousnessIngestor
+
+
+class RecordingDBManager:
+    """Minimal stand-in for DatabaseManager that records stored events."""
+
+    def __init__(self):
+        self.events = []
+
+    def store_event(self, event_data):
+        self.events.append(event_data)
+        return event_data['id']
+
+    def store_events_batch(self, events):
+        self.events.extend(events)
+        return [event_data['id'] for event_data in events]
+
+
+class RecordingVectorStore:
+    """Minimal stand-in for VectorStore that records add_documents calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def add_documents(self, documents, metadatas=None, ids=None):
+        self.calls.append((documents, metadatas, ids))
+        return ids
+
+
+class TestIngestDirectory:
+    """Test directory ingestion."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.db = RecordingDBManager()
+        self.ingestor = ConsciousnessIngestor(
+            db_manager=self.db,
+            encryption_enabled=False
+        )
+
+    def _make_tree(self, root: Path):
+        (root / "a.txt").write_text("alpha")
+        (root / "b.md").write_text("# beta")
+        (root / "skip.xyz").write_text("unsupported")
+        nested = root / "nested"
+        nested.mkdir()
+        (nested / "c.txt").write_text("gamma")
+
+    def test_non_recursive(self, tmp_path):
+        """Only top-level files are ingested without recursion."""
+        self._make_tree(tmp_path)
+
+        results = self.ingestor.ingest_directory(str(tmp_path), extensions=['.txt', '.md'])
+
+        files = sorted(Path(r['file']).name for r in results)
+        assert files == ['a.txt', 'b.md']
+        assert all(r['status'] == 'success' for r in results)
+
+    def test_recursive(self, tmp_path):
+        """Nested files are ingested when recursive is set."""
+        self._make_tree(tmp_path)
+
+        results = self.ingestor.ingest_directory(
+            str(tmp_path), recursive=True, extensions=['.txt']
+        )
+
+        files = sorted(Path(r['file']).name for r in results)
+        assert files == ['a.txt', 'c.txt']
+        assert len(self.db.events) == 2
+
+    def test_errors_are_reported(self, tmp_path):
+        """Unsupported files are reported as errors, not raised."""
+        self._make_tree(tmp_path)
+
+        results = self.ingestor.ingest_directory(str(tmp_path))
+
+        errors = [r for r in results if r['status'] == 'error']
+        assert [Path(r['file']).name for r in errors] == ['skip.xyz']
+
+    def test_not_a_directory(self, tmp_path):
+        """A file path is rejected."""
+        target = tmp_path / "file.txt"
+        target.write_text("x")
+
+        with pytest.raises(ValueError, match="Not a directory"):
+            self.ingestor.ingest_directory(str(target))
+
+
+class TestIngestTexts:
+    """Test batched text ingestion."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.db = RecordingDBManager()
+        self.store = RecordingVectorStore()
+        self.ingestor = ConsciousnessIngestor(
+            db_manager=self.db,
+            vector_store=self.store,
+            encryption_enabled=False
+        )
+
+    def test_one_call_per_batch(self):
+        """Texts reach the vector store in ceil(N / batch_size) calls."""
+        items = [{'content': f"text {i}", 'source': f"s{i}.txt"} for i in range(23)]
+
+        results = self.ingestor.ingest_texts(items, batch_size=5)
+
+        assert len(self.store.calls) == math.ceil(23 / 5)
+        assert [len(docs) for docs, _, _ in self.store.calls] == [5, 5, 5, 5, 3]
+        assert [r['source'] for r in results] == [item['source'] for item in items]
+
+    def test_ids_and_metadata_line_up(self):
+        """Each document keeps its own ID, source and metadata."""
+        items = [
+            {'content': "alpha", 'source': "a.txt", 'metadata': {'category': 'x'}},
+            {'content': "beta"}
+        ]
+
+        results = self.ingestor.ingest_texts(items)
+
+        documents, metadatas, ids = self.store.calls[0]
+        assert documents == ["alpha", "beta"]
+        assert ids == [r['event_id'] for r in results]
+        assert metadatas[0]['category'] == 'x' and metadatas[0]['source'] == "a.txt"
+        assert metadatas[1]['source'] == "direct_text"
+        assert [e['id'] for e in self.db.events] == ids
+
+
+    def test_failed_event_batch_is_reported(self):
+        """A batch whose events can't be stored is marked as failed."""
+        def fail(events):
+            raise RuntimeError("database is locked")
+
+        self.db.store_events_batch = fail
+        items = [{'content': f"text {i}"} for i in range(3)]
+
+        results = self.ingestor.ingest_texts(items, batch_size=2)
+
+        assert [r['status'] for r in results] == ['error'] * 3
+        assert "database is locked" in results[0]['error']
+        assert len(self.store.calls) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,346 @@
+"""
+Unit tests for the intelligence (LLM/RAG) layer.
+"""
+
+import asyncio
+import time
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from intelligence import llm
+from intelligence.consciousness_prompts import RAG_PROMPT_TEMPLATE, render_rag
+
+# Nothing listens here, so any real probe would fail
+UNREACHABLE_URL = "http://127.0.0.1:9"
+
+
+class TestPrompts:
+    """Test prompt rendering."""
+
+    def test_render_rag_matches_format(self):
+        """render_rag produces the same text as str.format."""
+        context = "[Memory from notes]:\nBraces {like this} stay literal\n"
+        question = "What is {question}?"
+
+        assert render_rag(context, question) == RAG_PROMPT_TEMPLATE.format(
+            context=context,
+            question=question
+        )
+
+
+class TestOllamaProbeCache:
+    """Test that server probes are shared between OllamaLLM instances."""
+
+    def teardown_method(self):
+        """Forget probes made by the test."""
+        llm._PROBE_CACHE.pop(UNREACHABLE_URL, None)
+
+    def test_cached_probe_skips_network(self):
+        """A fresh positive probe supplies the detected model."""
+        llm._PROBE_CACHE[UNREACHABLE_URL] = (time.monotonic(), True, "llama2:7b")
+
+        assert llm.OllamaLLM(base_url=UNREACHABLE_URL).model_name == "llama2:7b"
+        assert llm.OllamaLLM("mistral", base_url=UNREACHABLE_URL).model_name == "mistral"
+
+    def test_failed_probe_is_cached(self):
+        """A failed probe is remembered and fails fast."""
+        with pytest.raises(ConnectionError):
+            llm.OllamaLLM("mistral", base_url=UNREACHABLE_URL)
+        assert llm._PROBE_CACHE[UNREACHABLE_URL][1] is False
+
+        llm._PROBE_CACHE[UNREACHABLE_URL] = (time.monotonic(), False, None)
+        start = time.monotonic()
+        with pytest.raises(ConnectionError):
+            llm.OllamaLLM("mistral", base_url=UNREACHABLE_URL)
+        assert time.monotonic() - start < 0.5
+
+    def test_expired_probe_is_retried(self):
+        """Expired probes are repeated against the server."""
+        llm._PROBE_CACHE[UNREACHABLE_URL] = (
+            time.monotonic() - llm.PROBE_TTL - 1, True, "stale"
+        )
+        with pytest.raises(ConnectionError):
+            llm.OllamaLLM(base_url=UNREACHABLE_URL)
+
+
+class TestSelectDocuments:
+    """Test retrieved-document selection for prompts."""
+
+    def test_duplicates_skipped(self):
+        """Documents sharing a leading prefix are kept only once."""
+        shared = "x" * llm.DEDUP_PREFIX_CHARS
+        results = [
+            {'document': shared + " first"},
+            {'document': shared + " second"},
+            {'document': "different"}
+        ]
+
+        docs = [doc for _, doc in llm._select_documents(results, budget=1000)]
+        assert docs == [shared + " first", "different"]
+
+    def test_budget_and_truncation(self):
+        """Selection stops once the budget is spent; docs are truncated."""
+        results = [{'document': str(i) * 500} for i in range(10)]
+
+        selected = llm._select_documents(results, budget=700, doc_chars=300)
+        assert [len(doc) for _, doc in selected] == [300, 300, 300]
+        assert selected[0][0] is results[0]
+
+
+class RecordingLLM:
+    """Stand-in LLM that records prompts and messages."""
+
+    model_name = "fake"
+
+    def __init__(self):
+        self.prompts = []
+        self.messages = []
+
+    def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return "answer"
+
+    async def agenerate(self, prompt, **kwargs):
+        return self.generate(prompt, **kwargs)
+
+    def chat(self, messages, **kwargs):
+        self.messages.append(messages)
+        return "reply"
+
+
+class StaticVectorStore:
+    """Returns the same search results for every query."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def search(self, query, k=5):
+        return self.results[:k]
+
+
+class TestRAGSystemContext:
+    """Test context assembly in RAGSystem."""
+
+    def setup_method(self):
+        """Create a RAG system over two documents."""
+        self.llm = RecordingLLM()
+        self.rag = llm.RAGSystem(
+            llm=self.llm,
+            vector_store=StaticVectorStore([
+                {'document': 'First memory', 'metadata': {'source': 'journal'}, 'score': 0.9},
+                {'document': 'Second memory', 'metadata': {'source': 'email'}, 'score': 0.5}
+            ])
+        )
+
+    def test_query_context_layout(self):
+        """Each document is labelled with its source and separated by a blank line."""
+        result = self.rag.query("What happened?")
+
+        expected = "[Memory from journal]:\nFirst memory\n\n[Memory from email]:\nSecond memory\n"
+        assert render_rag(expected, "What happened?") in self.llm.prompts[0]
+        assert [s['source'] for s in result['sources']] == ['journal', 'email']
+
+    def test_chat_context(self):
+        """Chat passes retrieved documents as a system message."""
+        result = self.rag.chat("Hello")
+
+        system = self.llm.messages[0][0]
+        assert system['role'] == 'system'
+        assert system['content'].endswith("First memory\n\nSecond memory")
+        assert result['sources'] == [{'source': 'journal'}, {'source': 'email'}]
+
+    def test_async_variants_match(self):
+        """aquery and achat build the same prompts as the sync methods."""
+        sync_query = self.rag.query("What happened?")
+        async_query = asyncio.run(self.rag.aquery("What happened?"))
+        assert self.llm.prompts[0] == self.llm.prompts[1]
+        assert async_query == sync_query
+
+        sync_chat = self.rag.chat("Hello", history=[{"role": "user", "content": "Hi"}])
+        async_chat = asyncio.run(self.rag.achat("Hello", history=[{"role": "user", "content": "Hi"}]))
+        assert self.llm.messages[0] == self.llm.messages[1]
+        assert async_chat == sync_chat
+
+    def test_aquery_many_in_order(self):
+        """Pipelined answers come back in question order, like query()."""
+        questions = ["First?", "Second?", "Third?"]
+
+        async def collect():
+            return [result async for result in self.rag.aquery_many(questions, k=1)]
+
+        results = asyncio.run(collect())
+
+        assert [r['question'] for r in results] == questions
+        assert results == [self.rag.query(q, k=1) for q in questions]
+
+    def test_aquery_all_bounded_and_ordered(self):
+        """Concurrent answers keep input order and respect the limit."""
+        in_flight = []
+        peak = []
+
+        async def agenerate(prompt, **kwargs):
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(prompt)
+            return "answer"
+
+        self.llm.agenerate = agenerate
+        questions = [f"Question {i}?" for i in range(6)]
+
+        results = asyncio.run(self.rag.aquery_all(questions, k=1, concurrency=2))
+
+        assert [r['question'] for r in results] == questions
+        assert max(peak) == 2
+
+
+class FakeStreamResponse:
+    """Minimal streaming response yielding NDJSON lines."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+class FakeSession:
+    """Records posts and returns a canned streaming response."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return FakeStreamResponse(self.lines)
+
+
+class TestOllamaStreaming:
+    """Test streaming generation."""
+
+    def setup_method(self):
+        """Create a client without contacting a server."""
+        llm._PROBE_CACHE[UNREACHABLE_URL] = (time.monotonic(), True, "llama2")
+        self.client = llm.OllamaLLM(base_url=UNREACHABLE_URL)
+
+    def teardown_method(self):
+        """Forget the seeded probe."""
+        llm._PROBE_CACHE.pop(UNREACHABLE_URL, None)
+
+    def test_stream_yields_chunks(self):
+        """Each NDJSON line becomes one chunk; iteration stops at done."""
+        self.client._session = FakeSession([
+            b'{"response": "Hel", "done": false}',
+            b'',
+            b'{"response": "lo", "done": false}',
+            b'{"response": "", "done": true}',
+            b'{"response": "ignored", "done": false}'
+        ])
+
+        chunks = self.client.generate("Hi", stream=True)
+
+        assert not isinstance(chunks, str)
+        assert self.client._session.calls == []
+        assert list(chunks) == ["Hel", "lo"]
+        assert self.client._session.calls[0][1]["stream"] is True
+
+    @pytest.mark.skipif(not llm.HTTPX_AVAILABLE, reason="httpx not installed")
+    def test_async_stream_yields_chunks(self):
+        """agenerate(stream=True) decodes NDJSON lines from the async client."""
+        import httpx
+
+        body = (
+            b'{"response": "Hel", "done": false}\n\n'
+            b'{"response": "lo", "done": false}\n'
+            b'{"response": "", "done": true}\n'
+        )
+        payloads = []
+
+        def handler(request):
+            payloads.append(llm._loads(request.content))
+            return httpx.Response(200, content=body)
+
+        async def collect():
+            llm._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            llm._async_client_loop = asyncio.get_running_loop()
+            chunks = await self.client.agenerate("Hi", stream=True)
+            return [chunk async for chunk in chunks]
+
+        try:
+            assert asyncio.run(collect()) == ["Hel", "lo"]
+        finally:
+            llm._async_client = llm._async_client_loop = None
+        assert payloads[0]["stream"] is True
+
+
+class FakeJSONResponse:
+    """Minimal non-streaming response."""
+
+    def __init__(self, body):
+        self.content = body
+
+    def raise_for_status(self):
+        pass
+
+
+class CountingSession:
+    """Returns a fixed embedding and counts posts."""
+
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        return FakeJSONResponse(b'{"embedding": [0.1, 0.2]}')
+
+
+class TestEmbeddingCache:
+    """Test the per-instance embedding cache."""
+
+    def setup_method(self):
+        """Create a client without contacting a server."""
+        llm._PROBE_CACHE[UNREACHABLE_URL] = (time.monotonic(), True, "llama2")
+        self.client = llm.OllamaLLM(base_url=UNREACHABLE_URL)
+        self.client._session = CountingSession()
+
+    def teardown_method(self):
+        """Forget the seeded probe."""
+        llm._PROBE_CACHE.pop(UNREACHABLE_URL, None)
+
+    def test_repeated_text_hits_cache(self):
+        """The second request for a text does not reach the server."""
+        assert self.client.get_embeddings("hello") == [0.1, 0.2]
+        assert self.client.get_embeddings("hello") == [0.1, 0.2]
+        assert self.client._session.posts == 1
+
+        self.client.get_embeddings("other")
+        assert self.client._session.posts == 2
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """The least recently used embedding is evicted when full."""
+        monkeypatch.setattr(llm, "EMBED_CACHE_SIZE", 2)
+        for text in ("a", "b", "a", "c"):
+            self.client.get_embeddings(text)
+
+        assert self.client._session.posts == 3
+        self.client.get_embeddings("a")
+        assert self.client._session.posts == 3
+        self.client.get_embeddings("b")
+        assert self.client._session.posts == 4
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
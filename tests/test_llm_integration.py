@@ -0,0 +1,522 @@
+"""
+Unit tests for the provider-agnostic LLM integration.
+"""
+
+import asyncio
+import time
+import numpy as np
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from retrieval import llm_integration
+from retrieval.llm_integration import LLMProvider, RAGSystem
+from retrieval.vector_store import VectorStore, CachedVectorStore
+
+# The semantic cache is opt-in, so its tests enable it explicitly
+THRESHOLD = llm_integration.SEMANTIC_CACHE_THRESHOLD
+
+
+class TestResponseCache:
+    """Test the exact-match response cache in LLMProvider."""
+
+    def setup_method(self):
+        """Create a mock provider that counts generations."""
+        self.provider = LLMProvider(provider="mock")
+        self.calls = 0
+        original = self.provider._generate_mock
+
+        def counting(prompt, system_prompt):
+            self.calls += 1
+            return original(prompt, system_prompt)
+
+        self.provider._generate_mock = counting
+
+    def test_repeated_prompt_is_cached(self):
+        """The same prompt and system prompt only generate once."""
+        first = self.provider.generate("Hello", "system")
+        second = self.provider.generate("Hello", "system")
+
+        assert first == second
+        assert self.calls == 1
+
+    def test_key_covers_system_prompt_and_settings(self):
+        """Changing the system prompt or temperature misses the cache."""
+        self.provider.generate("Hello", "system")
+        self.provider.generate("Hello", "other system")
+        self.provider.temperature = 0.1
+        self.provider.generate("Hello", "system")
+
+        assert self.calls == 3
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """The least recently used response is evicted when full."""
+        monkeypatch.setattr(llm_integration, "RESPONSE_CACHE_SIZE", 2)
+
+        for prompt in ("a", "b", "a", "c", "a", "b"):
+            self.provider.generate(prompt)
+
+        assert self.calls == 4
+
+
+class TestAsyncGenerate:
+    """Test LLMProvider.agenerate over the shared async client."""
+
+    def setup_method(self):
+        """Route Ollama calls through an in-process transport."""
+        httpx = pytest.importorskip("httpx")
+        self.statuses = []
+
+        def handler(request):
+            status = self.statuses.pop(0) if self.statuses else 200
+            return httpx.Response(status, json={"response": "async answer"})
+
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.provider = LLMProvider(provider="ollama")
+
+    def run(self, monkeypatch, prompt="Hello"):
+        monkeypatch.setattr(llm_integration, "_get_ollama_client", lambda: self.client)
+        monkeypatch.setattr(llm_integration, "OLLAMA_BACKOFF", 0)
+        return asyncio.run(self.provider.agenerate(prompt))
+
+    def test_retries_server_errors(self, monkeypatch):
+        """A 5xx response is retried before giving up."""
+        self.statuses = [503, 502]
+        assert self.run(monkeypatch) == "async answer"
+        assert self.statuses == []
+
+    def test_gives_up_after_retries(self, monkeypatch):
+        """Persistent failures return an error string that is not cached."""
+        self.statuses = [503] * llm_integration.OLLAMA_RETRIES
+        assert self.run(monkeypatch).startswith(llm_integration.OLLAMA_ERROR_PREFIX)
+        assert len(self.provider._response_cache) == 0
+
+    def test_shares_response_cache(self, monkeypatch):
+        """An async answer is served to later calls from the cache."""
+        self.run(monkeypatch)
+        self.statuses = [500] * llm_integration.OLLAMA_RETRIES
+        assert self.run(monkeypatch) == "async answer"
+
+
+class TestSharedClient:
+    """Test the module-level SDK client cache."""
+
+    def test_clients_shared_per_provider_and_key(self, monkeypatch):
+        """Clients are created once per (provider, api_key)."""
+        monkeypatch.setattr(llm_integration, "_CLIENT_CACHE", {})
+        created = []
+
+        def factory(api_key):
+            created.append(api_key)
+            return object()
+
+        a = llm_integration._shared_client("openai", "k1", factory)
+        b = llm_integration._shared_client("openai", "k1", factory)
+        c = llm_integration._shared_client("openai", "k2", factory)
+
+        assert a is b
+        assert a is not c
+        assert created == ["k1", "k2"]
+
+
+class TestMockEmbedding:
+    """Test the hash-based fallback embedding."""
+
+    def test_shape_and_determinism(self):
+        """Mock embeddings fill every dimension and are stable per text."""
+        provider = LLMProvider(provider="mock")
+        vec = provider.embed("hello")
+
+        assert vec.shape == (llm_integration.MOCK_EMBEDDING_DIM,)
+        assert vec.dtype == np.float32
+        assert 0.0 <= vec.min() and vec.max() <= 1.0
+        assert np.array_equal(vec, provider.embed("hello"))
+        assert not np.array_equal(vec, provider.embed("hello!"))
+
+
+class TestEmbedBatch:
+    """Test LLMProvider.embed_batch."""
+
+    def test_matches_single_embeddings(self):
+        """Each row equals the embedding of the matching text."""
+        provider = LLMProvider(provider="mock")
+        texts = ["alpha", "beta", "gamma"]
+
+        batch = provider.embed_batch(texts, batch_size=2)
+
+        assert batch.shape == (3, len(provider.embed("alpha")))
+        assert batch.dtype == np.float32
+        for row, text in zip(batch, texts):
+            assert np.allclose(row, provider.embed(text))
+
+    def test_empty_input(self):
+        """No texts give an empty array."""
+        assert LLMProvider(provider="mock").embed_batch([]).shape[0] == 0
+
+
+class TestBatchingEmbedder:
+    """Test coalescing of concurrent embedding requests."""
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Concurrent embed_one calls become one embed_batch call."""
+        provider = LLMProvider(provider="mock")
+        batches = []
+        original = provider.embed_batch
+
+        def recording(texts, batch_size=100):
+            batches.append(list(texts))
+            return original(texts, batch_size)
+
+        provider.embed_batch = recording
+        embedder = llm_integration.BatchingEmbedder(provider, max_delay=0.05)
+        texts = [f"text {i}" for i in range(5)]
+
+        async def main():
+            vectors = await asyncio.gather(*(embedder.embed_one(t) for t in texts))
+            await embedder.aclose()
+            return vectors
+
+        vectors = asyncio.run(main())
+
+        assert batches == [texts]
+        for text, vector in zip(texts, vectors):
+            assert np.allclose(vector, provider.embed(text))
+
+    def test_errors_reach_every_caller(self):
+        """A failing batch raises in each waiting coroutine."""
+        provider = LLMProvider(provider="mock")
+
+        def failing(texts, batch_size=100):
+            raise RuntimeError("embedding backend down")
+
+        provider.embed_batch = failing
+        embedder = llm_integration.BatchingEmbedder(provider)
+
+        async def main():
+            results = await asyncio.gather(
+                embedder.embed_one("a"), embedder.embed_one("b"), return_exceptions=True
+            )
+            await embedder.aclose()
+            return results
+
+        assert all(isinstance(r, RuntimeError) for r in asyncio.run(main()))
+
+
+class KeywordEmbedProvider(LLMProvider):
+    """Mock provider whose embeddings depend only on a few keywords."""
+
+    KEYWORDS = ("dog", "cat", "weather")
+
+    def __init__(self):
+        super().__init__(provider="mock")
+        self.generations = 0
+
+    def embed(self, text):
+        return [float(word in text.lower()) for word in self.KEYWORDS]
+
+    def generate(self, prompt, system_prompt=None, stream=False):
+        self.generations += 1
+        return f"answer {self.generations}"
+
+
+class ListVectorStore:
+    """Vector store stand-in that returns no documents."""
+
+    def search(self, query, k=5, filter=None):
+        return []
+
+
+class TestSemanticCache:
+    """Test the semantic answer cache in RAGSystem.query."""
+
+    def setup_method(self):
+        """Create a RAG system with keyword embeddings."""
+        self.llm = KeywordEmbedProvider()
+        self.rag = RAGSystem(ListVectorStore(), self.llm, semantic_cache_size=2, semantic_cache_threshold=THRESHOLD)
+
+    def test_similar_question_reuses_answer(self):
+        """A question with the same embedding returns the cached answer."""
+        first = self.rag.query("Tell me about my dog")
+        second = self.rag.query("What about the dog?")
+
+        assert second['answer'] == first['answer']
+        assert self.llm.generations == 1
+
+        self.rag.query("And the cat?")
+        assert self.llm.generations == 2
+
+    def test_parameters_must_match(self):
+        """Different retrieval parameters are never served from cache."""
+        self.rag.query("my dog", k=5)
+        self.rag.query("my dog", k=3)
+        self.rag.query("my dog", metadata_filter={"type": "email"})
+
+        assert self.llm.generations == 3
+
+    def test_lru_eviction(self):
+        """The least recently used answer is evicted when full."""
+        self.rag.query("dog")
+        self.rag.query("cat")
+        self.rag.query("dog")
+        self.rag.query("weather")
+        assert self.llm.generations == 3
+
+        self.rag.query("dog")
+        assert self.llm.generations == 3
+        self.rag.query("cat")
+        assert self.llm.generations == 4
+
+    def test_disabled(self):
+        """The cache is off unless a threshold is given."""
+        rag = RAGSystem(ListVectorStore(), self.llm)
+        rag.query("dog")
+        rag.query("dog")
+
+        assert self.llm.generations == 2
+
+    def test_ingest_invalidates(self):
+        """Writes to the vector store drop answers built from older results."""
+        store = CachedVectorStore(VectorStore(collection_name="semantic_ingest"))
+        if store.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+        rag = RAGSystem(store, self.llm, semantic_cache_threshold=THRESHOLD)
+
+        assert rag.query("Where is my dog?")['sources'] == []
+        store.add_documents(["The dog sleeps by the door."])
+
+        after = rag.query("Where is my dog?")
+        assert self.llm.generations == 2
+        assert [s['document'] for s in after['sources']] == ["The dog sleeps by the door."]
+
+        assert rag.query("Where is my dog?")['answer'] == after['answer']
+        assert self.llm.generations == 2
+
+    def test_best_match_kernel(self):
+        """The scan picks the most similar allowed row above the threshold."""
+        emb = np.array([[1, 0], [0.8, 0.6], [0, 1]], dtype=np.float32)
+        q = np.array([1, 0], dtype=np.float32)
+        best_match = llm_integration._best_match
+
+        assert best_match(emb.astype(np.float16), q, np.array([False, True, True]), np.float32(0.5)) == 1
+        assert best_match(emb, q, np.array([True, True, True]), np.float32(0.5)) == 0
+        assert best_match(emb, q, np.array([False, True, True]), np.float32(0.5)) == 1
+        assert best_match(emb, q, np.array([False, True, True]), np.float32(0.9)) == -1
+
+    def test_persisted_across_instances(self, tmp_path):
+        """A new RAGSystem with the same path reuses persisted answers."""
+        path = str(tmp_path / "semantic")
+        first = RAGSystem(ListVectorStore(), self.llm, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        answer = first.query("Is the dog hungry?")['answer']
+
+        second = RAGSystem(ListVectorStore(), self.llm, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        assert second.query("is the dog hungry")['answer'] == answer
+        assert self.llm.generations == 1
+
+        second.clear_cache()
+        third = RAGSystem(ListVectorStore(), self.llm, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        third.query("Is the dog hungry?")
+        assert self.llm.generations == 2
+
+
+    def test_persisted_store_appends_one_record(self, tmp_path):
+        """Each new answer appends a line instead of rewriting the log."""
+        path = str(tmp_path / "semantic")
+        rag = RAGSystem(ListVectorStore(), self.llm, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        rag.query("dog")
+        first = (tmp_path / "semantic.jsonl").read_text()
+
+        rag.query("cat")
+        second = (tmp_path / "semantic.jsonl").read_text()
+
+        assert second.startswith(first)
+        assert second.count('\n') == first.count('\n') + 1
+
+    def test_log_compacts_and_reloads(self, tmp_path, monkeypatch):
+        """A long log is rewritten with one record per slot and still reloads."""
+        monkeypatch.setattr(llm_integration, "SEMANTIC_LOG_FACTOR", 1)
+        path = str(tmp_path / "semantic")
+        rag = RAGSystem(ListVectorStore(), self.llm, semantic_cache_size=2, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        for question in ("dog", "cat", "weather", "dog", "cat"):
+            rag.query(question)
+
+        assert len((tmp_path / "semantic.jsonl").read_text().splitlines()) <= 1 + 2 * 2
+        reloaded = RAGSystem(ListVectorStore(), self.llm, semantic_cache_size=2, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        generations = self.llm.generations
+        reloaded.query("cat")
+        assert self.llm.generations == generations
+
+    def test_non_json_response_not_persisted(self, tmp_path):
+        """Responses JSON can't hold stay in memory rather than reload altered."""
+        class ObjectStore:
+            def search(self, query, k=5, filter=None):
+                return [{'document': "walk the dog", 'metadata': {'when': object()}, 'score': 1.0}]
+
+        path = str(tmp_path / "semantic")
+        rag = RAGSystem(ObjectStore(), self.llm, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        answer = rag.query("dog")['answer']
+        assert rag.query("the dog")['answer'] == answer
+
+        reloaded = RAGSystem(ObjectStore(), self.llm, semantic_cache_path=path, semantic_cache_threshold=THRESHOLD)
+        assert reloaded.query("dog")['answer'] != answer
+
+
+class MemoryVectorStore:
+    """Sync-only vector store returning a fixed memory."""
+
+    def search(self, query, k=5, filter=None):
+        return [{'document': f"memory about {query}", 'metadata': {'source': 'notes'}}]
+
+
+class TestAsyncRAG:
+    """Test the async RAGSystem variants against their sync counterparts."""
+
+    def setup_method(self):
+        """Create a RAG system with a mock provider and no semantic cache."""
+        self.rag = RAGSystem(
+            MemoryVectorStore(),
+            LLMProvider(provider="mock"),
+            semantic_cache_threshold=None
+        )
+
+    def test_achat_matches_chat(self):
+        """achat builds the same prompt as chat for a sync-only store."""
+        history = [{'role': 'user', 'content': 'hi'}, {'role': 'assistant', 'content': 'hello'}]
+        prompt = self.rag._build_chat_prompt(
+            "dogs?", self.rag._build_context(self.rag.vector_store.search("dogs?")),
+            self.rag._format_history(history)
+        )
+
+        assert prompt.startswith("User: hi\nAssistant: hello\nRelevant memories:")
+        assert prompt.endswith("\nUser: dogs?")
+        assert asyncio.run(self.rag.achat("dogs?", history)) == self.rag.chat("dogs?", history)
+
+    def test_query_stream_yields_answer(self):
+        """query_stream yields the query() answer and caches the result."""
+        async def collect(rag, question):
+            return [chunk async for chunk in rag.query_stream(question)]
+
+        expected = self.rag.query("dogs?")['answer']
+        assert "".join(asyncio.run(collect(self.rag, "dogs?"))) == expected
+
+        llm = KeywordEmbedProvider()
+        rag = RAGSystem(MemoryVectorStore(), llm, semantic_cache_threshold=THRESHOLD)
+        first = asyncio.run(collect(rag, "my dog"))
+        assert asyncio.run(collect(rag, "my dog!")) == ["".join(first)]
+        assert llm.generations == 1
+
+    def test_history_accepts_bounded_deque(self):
+        """A running deque history formats like the equivalent list."""
+        from collections import deque
+        history = [{'role': 'user', 'content': str(i)} for i in range(8)]
+        limit = llm_integration.HISTORY_MESSAGES
+
+        expected = self.rag._format_history(history)
+        assert len(expected) == limit
+        assert self.rag._format_history(deque(history, maxlen=limit)) == expected
+        assert self.rag._format_history(deque(history)) == expected
+
+    def test_aquery_matches_query(self):
+        """aquery returns the same answer and sources as query."""
+        expected = self.rag.query("dogs?")
+        result = asyncio.run(self.rag.aquery("dogs?"))
+
+        assert result['answer'] == expected['answer']
+        assert result['sources'] == expected['sources']
+        assert result['context_used'] == expected['context_used']
+        assert result['timestamp_ns'] >= expected['timestamp_ns']
+
+
+class TestBuildContext:
+    """Test RAGSystem._build_context formatting."""
+
+    def test_format(self):
+        """Documents are numbered, attributed and truncated."""
+        rag = RAGSystem(ListVectorStore(), LLMProvider(provider="mock"))
+        docs = [
+            {'document': 'x' * 600, 'metadata': {'source': 'email', 'timestamp': 't1'}},
+            {'document': 'short', 'metadata': {}},
+        ]
+
+        assert rag._build_context(docs) == (
+            "Based on the following information:\n"
+            "\n\n[1] From email at t1:\n" + 'x' * 500 +
+            "\n\n[2] From unknown source at unknown time:\nshort"
+        )
+        assert rag._build_context([]) == ""
+
+    def test_uses_precomputed_preview(self):
+        """A store-supplied preview replaces slicing the document."""
+        rag = RAGSystem(ListVectorStore(), LLMProvider(provider="mock"))
+        docs = [{'document': 'full text', 'preview': 'full', 'metadata': {}}]
+
+        assert rag._build_context(docs).endswith(":\nfull")
+
+    def test_memory_store_returns_preview(self):
+        """The in-memory VectorStore slices previews once at insert time."""
+        from retrieval.vector_store import VectorStore, PREVIEW_CHARS
+        store = VectorStore()
+        if store.collection is not None:
+            pytest.skip("ChromaDB backend does not store previews")
+        store.add_documents(['y' * (PREVIEW_CHARS + 10)])
+
+        [result] = store.search('y', k=1)
+        assert result['preview'] == 'y' * PREVIEW_CHARS
+
+
+class CountingStore(MemoryVectorStore):
+    """MemoryVectorStore that counts searches and accepts writes."""
+
+    def __init__(self):
+        self.searches = 0
+
+    def search(self, query, k=5, filter=None):
+        self.searches += 1
+        return super().search(query, k, filter)
+
+    def add_documents(self, documents, metadatas=None, ids=None):
+        return ids or []
+
+
+class TestCachedVectorStore:
+    """Test the TTL search cache wrapper."""
+
+    def setup_method(self):
+        """Wrap a counting store."""
+        from retrieval.vector_store import CachedVectorStore
+        self.inner = CountingStore()
+        self.store = CachedVectorStore(self.inner)
+
+    def test_repeat_search_is_cached(self):
+        """Identical searches hit the store once and are flagged."""
+        first = self.store.search("dogs", k=3, filter={'source': 'notes'})
+        second = self.store.search("dogs", k=3, filter={'source': 'notes'})
+
+        assert self.inner.searches == 1
+        assert [r['cache_hit'] for r in first + second] == [False, True]
+        assert first[0]['document'] == second[0]['document']
+
+        self.store.search("dogs", k=4, filter={'source': 'notes'})
+        assert self.inner.searches == 2
+
+    def test_writes_invalidate(self):
+        """Adding documents drops cached searches."""
+        self.store.search("dogs")
+        self.store.add_documents(["new"])
+        self.store.search("dogs")
+
+        assert self.inner.searches == 2
+
+    def test_entries_expire(self):
+        """Entries older than the TTL are searched again."""
+        from retrieval.vector_store import CachedVectorStore
+        store = CachedVectorStore(self.inner, ttl=0.01)
+        store.search("dogs")
+        time.sleep(0.02)
+        store.search("dogs")
+
+        assert self.inner.searches == 2
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
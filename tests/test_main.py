@@ -0,0 +1,45 @@
+"""
+Unit tests for the application entry point.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+class TestRouteRegistration:
+    """Test that routes are registered once per process."""
+
+    @pytest.fixture(autouse=True)
+    def temp_database(self, tmp_path, monkeypatch):
+        """Keep the database the API module opens out of the working dir."""
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'christ.db'}")
+
+    def test_repeated_lifespan_keeps_routes(self):
+        """Entering the lifespan twice doesn't duplicate any route."""
+        with TestClient(main.app):
+            routes = list(main.app.router.routes)
+        with TestClient(main.app):
+            pass
+
+        assert main.app.router.routes == routes
+        assert sum(getattr(r, "path", None) == "/static" for r in routes) <= 1
+
+    def test_register_routes_is_idempotent(self):
+        """Direct calls after startup leave the routes unchanged."""
+        main.register_routes()
+        count = len(main.app.router.routes)
+
+        main.register_routes()
+        assert len(main.app.router.routes) == count
+        assert any(getattr(r, "path", None) == "/" for r in main.app.router.routes)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
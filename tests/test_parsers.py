@@ -74,6 +74,47 @@ Content-Disposition: attachment; filename="document.pdf"
         assert len(result['attachments']) > 0
         assert result['metadata']['has_attachments'] is True
 
+    def test_parse_multiple_text_parts(self, tmp_path):
+        """Test that multiple text/plain parts are joined and hashed together."""
+        import hashlib
+
+        email_content = """From: sender@example.com
+Subject: Multipart
+Message-ID: <abc@example.com>
+Date: Mon, 20 Jan 2025 10:30:00 +0000
+Content-Type: multipart/mixed; boundary="b"
+
+--b
+Content-Type: text/plain; charset=utf-8
+
+First part.
+--b
+Content-Type: text/plain; charset=utf-8
+
+Second part.
+--b--
+"""
+        email_file = tmp_path / "multi.eml"
+        email_file.write_text(email_content)
+
+        result = self.parser.parse_eml_file(str(email_file))
+
+        plain = result['content']['plain']
+        assert 'First part.' in plain and 'Second part.' in plain
+        assert plain.index('First') < plain.index('Second')
+
+        # The ID must match hashing the concatenated raw body in one go
+        import email
+        msg = email.message_from_string(email_content)
+        body = b''.join(
+            p.get_payload(decode=True) for p in msg.walk()
+            if p.get_content_type() == 'text/plain'
+        )
+        expected = hashlib.sha256(
+            b'<abc@example.com>' + body + result['timestamp'].encode()
+        ).hexdigest()[:16]
+        assert result['id'] == expected
+
     def test_extract_message_data_handles_errors(self):
         """Test that message extraction handles errors gracefully."""
         import email
@@ -119,6 +160,44 @@ class TestTextFileParser:
         assert result['content']['format'] == '.md'
         assert '# Title' in result['content']['text']
 
+    def test_parse_non_utf8_file(self, tmp_path):
+        """Test that non-UTF-8 files fall back to encoding detection."""
+        text_file = tmp_path / "latin1.txt"
+        text_file.write_bytes("Café crème brûlée\r\nsecond line".encode('latin-1'))
+
+        result = self.parser.parse_file(str(text_file))
+
+        assert result['metadata']['encoding'].lower() != 'utf-8'
+        assert result['content']['text'].startswith('Caf')
+        assert result['metadata']['line_count'] == 2
+        assert '\r' not in result['content']['text']
+
+    def test_parse_utf8_bom_file(self, tmp_path):
+        """Test that a leading UTF-8 BOM is not part of the text."""
+        text_file = tmp_path / "bom.txt"
+        text_file.write_bytes(b"\xef\xbb\xbfHello world")
+        plain_file = tmp_path / "plain.txt"
+        plain_file.write_bytes(b"Hello world")
+
+        result = self.parser.parse_file(str(text_file))
+
+        assert result['content']['text'] == "Hello world"
+        assert result['metadata']['encoding'] == 'utf-8-sig'
+        assert result['id'] == self.parser.parse_file(str(plain_file))['id']
+
+    def test_crlf_file_id_matches_lf(self, tmp_path):
+        """Test that IDs are computed from newline-normalized text."""
+        crlf_file = tmp_path / "crlf.txt"
+        crlf_file.write_bytes(b"first line\r\nsecond line\r\n")
+        lf_file = tmp_path / "lf.txt"
+        lf_file.write_bytes(b"first line\nsecond line\n")
+
+        crlf = self.parser.parse_file(str(crlf_file))
+        lf = self.parser.parse_file(str(lf_file))
+
+        assert crlf['content']['text'] == lf['content']['text']
+        assert crlf['id'] == lf['id']
+
     def test_parse_nonexistent_file(self):
         """Test parsing a file that doesn't exist."""
         with pytest.raises(FileNotFoundError):
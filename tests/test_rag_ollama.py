@@ -4,6 +4,7 @@ Test RAG (Retrieval-Augmented Generation) with Ollama.
 Demonstrates consciousness data retrieval and AI-enhanced responses.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -14,6 +15,49 @@ from consciousness.database import init_database
 from retrieval.vector_store import VectorStore
 from intelligence.llm import OllamaLLM, RAGSystem
 
+# Test queries
+_TEST_QUERIES = (
+    "What insights about consciousness were discovered during meditation?",
+    "What did grandmother say about libraries and consciousness?",
+    "Explain the relationship between quantum mechanics and consciousness",
+    "What are the ethical implications of digital consciousness?",
+    "How does the C.H.R.I.S.T. project capture and preserve consciousness?"
+)
+
+
+async def run_test_queries(rag: RAGSystem, test_queries):
+    """Answer the fixed test questions concurrently, then show them in order."""
+    print("\n⏳ Answering all questions concurrently...")
+    results = await rag.aquery_all(
+        test_queries,
+        k=3,  # Use top 3 relevant documents
+        temperature=0.7,
+        max_tokens=200
+    )
+
+    for i, result in enumerate(results, 1):
+        print(f"\n🤔 Question {i}: {result['question']}")
+        print("-" * 40)
+
+        # Show answer
+        print(f"🤖 Answer: {result['answer']}")
+
+        # Show sources
+        if result['sources']:
+            print("\n📚 Sources used:")
+            for j, source in enumerate(result['sources'], 1):
+                source_name = source['source'].split('/')[-1]
+                score = source['score']
+                print(f"  {j}. {source_name} (relevance: {score:.2f})")
+
+        print("=" * 60)
+
+        # Ask if user wants to continue
+        if i < len(results):
+            response = input("\nPress Enter for next question (or 'q' to quit): ")
+            if response.lower() == 'q':
+                break
+
 
 def test_rag_system():
     """Test the complete RAG pipeline with Ollama."""
@@ -62,45 +106,8 @@ def test_rag_system():
     print("Testing RAG Queries")
     print("=" * 60)
 
-    # Test queries
-    test_queries = [
-        "What insights about consciousness were discovered during meditation?",
-        "What did grandmother say about libraries and consciousness?",
-        "Explain the relationship between quantum mechanics and consciousness",
-        "What are the ethical implications of digital consciousness?",
-        "How does the C.H.R.I.S.T. project capture and preserve consciousness?"
-    ]
-
-    for i, question in enumerate(test_queries, 1):
-        print(f"\n🤔 Question {i}: {question}")
-        print("-" * 40)
-
-        # Get RAG response
-        result = rag.query(
-            question=question,
-            k=3,  # Use top 3 relevant documents
-            temperature=0.7,
-            max_tokens=200
-        )
-
-        # Show answer
-        print(f"🤖 Answer: {result['answer']}")
-
-        # Show sources
-        if result['sources']:
-            print("\n📚 Sources used:")
-            for j, source in enumerate(result['sources'], 1):
-                source_name = source['source'].split('/')[-1]
-                score = source['score']
-                print(f"  {j}. {source_name} (relevance: {score:.2f})")
-
-        print("=" * 60)
-
-        # Ask if user wants to continue
-        if i < len(test_queries):
-            response = input("\nPress Enter for next question (or 'q' to quit): ")
-            if response.lower() == 'q':
-                break
+    # Independent questions are answered in parallel, bounded by a semaphore
+    asyncio.run(run_test_queries(rag, _TEST_QUERIES))
 
     # Interactive mode
     print("\n" + "=" * 60)
@@ -124,10 +131,15 @@ def test_rag_system():
             question=question,
             k=5,
             temperature=0.8,
-            max_tokens=300
+            max_tokens=300,
+            stream=True
         )
 
-        print(f"\n🤖 Response:\n{result['answer']}")
+        print("\n🤖 Response:")
+        for chunk in result['answer']:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        print()
 
         if result['sources']:
             print("\n📚 Based on:")
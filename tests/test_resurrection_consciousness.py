@@ -6,14 +6,19 @@ Tests vector database indexing, querying, and portability
 
 import unittest
 import tempfile
-import shutil
+import os
 from pathlib import Path
 import sys
 import json
+from collections import OrderedDict
+from unittest import mock
 
 sys.path.append(str(Path(__file__).parent))
 
-from resurrections.resurrection_consciousness import ResurrectionConsciousness
+from resurrections.resurrection_consciousness import ResurrectionConsciousness, ResurrectionBot
+from resurrection_fixtures import SharedEmbedder, fast_rmtree
+from retrieval import vector_store
+from retrieval.vector_store import hash_embeddings
 
 
 class TestResurrectionConsciousness(unittest.TestCase):
@@ -46,7 +51,7 @@ This is my commandment.
 
     def tearDown(self):
         """Clean up after tests."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        fast_rmtree(self.temp_dir)
 
     def test_initialization(self):
         """Test resurrection consciousness initialization."""
@@ -246,7 +251,7 @@ He ate with sinners and tax collectors, causing controversy.
 
     def tearDown(self):
         """Clean up."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        fast_rmtree(self.temp_dir)
 
     def test_thomas_queries(self):
         """Test queries about Thomas."""
@@ -296,6 +301,123 @@ He ate with sinners and tax collectors, causing controversy.
             self.assertGreaterEqual(scores[0], scores[-1])
 
 
+
+class StubConsciousness:
+    """Counts queries instead of searching a bundle."""
+
+    def __init__(self):
+        self.corpus_version = 0
+        self.calls = 0
+        self.method = "rag"
+
+    def query(self, question):
+        self.calls += 1
+        return {"response": f"answer {self.calls}", "metadata": {"method": self.method}}
+
+
+class TestResurrectionBotCache(unittest.TestCase):
+    """Test memoized bot responses."""
+
+    def setUp(self):
+        """Set up a bot around a stub consciousness."""
+        self.consciousness = StubConsciousness()
+        self.bot = ResurrectionBot.__new__(ResurrectionBot)
+        self.bot.consciousness = self.consciousness
+        self.bot.figure_name = "test"
+        self.bot._responses = OrderedDict()
+        self.bot._responses_version = 0
+
+    def test_repeat_served_from_cache(self):
+        """Test that normalized repeats don't query again."""
+        first = self.bot.chat("Who are you?")
+        self.assertEqual(self.bot.chat("  who ARE   you? "), first)
+        self.assertEqual(self.consciousness.calls, 1)
+
+    def test_corpus_change_invalidates(self):
+        """Test that new texts expire cached answers."""
+        self.bot.chat("Help me")
+        self.consciousness.corpus_version += 1
+        self.assertEqual(self.bot.chat("Help me"), "answer 2")
+
+    def test_fallback_not_cached(self):
+        """Test that answers from a failed LLM call are retried."""
+        self.consciousness.method = "retrieval_fallback"
+        self.bot.chat("Help me")
+        self.bot.chat("Help me")
+        self.assertEqual(self.consciousness.calls, 2)
+
+
+class FakeEmbedder:
+    """Stands in for a loaded SentenceTransformer."""
+
+    def get_sentence_embedding_dimension(self):
+        return 8
+
+    def encode(self, texts, **kwargs):
+        return hash_embeddings(texts, 8)
+
+
+class FakeChromaClient:
+    """Records the collections a vector store opens."""
+
+    def __init__(self):
+        self.opened = []
+
+    def get_collection(self, name):
+        self.opened.append(name)
+        return object()
+
+
+class TestSharedBackends(unittest.TestCase):
+    """Test handing one model and client to several consciousnesses."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the shared backends and keep the database in a temp dir."""
+        cls.embedder, cls.chroma_client = SharedEmbedder.load()
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.database_env = mock.patch.dict(
+            os.environ, {"DATABASE_URL": f"sqlite:///{Path(cls.temp_dir) / 'christ.db'}"}
+        )
+        cls.database_env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop every collection the class created and its database."""
+        SharedEmbedder.reset()
+        cls.database_env.stop()
+        fast_rmtree(cls.temp_dir)
+
+    def test_shared_objects_reused(self):
+        """Test that consciousnesses built from the fixture share its backends."""
+        first = ResurrectionConsciousness(
+            "shared_backend_a", embedder=self.embedder, chroma_client=self.chroma_client
+        )
+        second = ResurrectionConsciousness(
+            "shared_backend_b", embedder=self.embedder, chroma_client=self.chroma_client
+        )
+
+        self.assertIs(first.vector_store._embedding_model, second.vector_store._embedding_model)
+        self.assertIs(first.vector_store.client, second.vector_store.client)
+
+    def test_embedder_passthrough(self):
+        """Test that the given model embeds instead of a freshly loaded one."""
+        embedder = FakeEmbedder()
+        consciousness = ResurrectionConsciousness("shared_backend_a", embedder=embedder)
+
+        self.assertIs(consciousness.vector_store.embedding_model, embedder)
+        self.assertEqual(consciousness.vector_store.embedding_dimension, 8)
+
+    def test_chroma_client_passthrough(self):
+        """Test that the given client opens the collection instead of a new one."""
+        client = FakeChromaClient()
+        with mock.patch.object(vector_store, "CHROMADB_AVAILABLE", True):
+            consciousness = ResurrectionConsciousness("shared_backend_a", chroma_client=client)
+
+        self.assertIs(consciousness.vector_store.client, client)
+        self.assertEqual(client.opened, ["resurrection_shared_backend_a"])
+
+
 if __name__ == "__main__":
     # Run tests
     print("\n" + "="*70)
@@ -303,7 +425,6 @@ if __name__ == "__main__":
     print("="*70)
 
     # Check environment
-    import os
     if 'VIRTUAL_ENV' in os.environ:
         print("✓ Virtual environment active")
     else:
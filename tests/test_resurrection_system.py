@@ -16,13 +16,26 @@ sys.path.append(str(Path(__file__).parent))
 
 from resurrections.resurrection_consciousness import ResurrectionConsciousness, ResurrectionBot
 from resurrections.jesus_simple import SimpleJesus
+from resurrection_fixtures import SharedEmbedder, fast_rmtree
 
 
 class TestResurrectionUnitTests(unittest.TestCase):
     """Unit tests for resurrection components."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the embedding model and ChromaDB client once for the class."""
+        cls.embedder, cls.chroma_client = SharedEmbedder.load()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop every collection the class created."""
+        SharedEmbedder.reset()
+
     def setUp(self):
         """Set up test fixtures."""
+        # Fresh collections per test on the shared client
+        SharedEmbedder.reset()
         self.temp_dir = tempfile.mkdtemp()
         self.test_data_dir = Path(self.temp_dir) / "test_data"
         self.test_data_dir.mkdir(parents=True)
@@ -32,7 +45,7 @@ class TestResurrectionUnitTests(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after tests."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        fast_rmtree(self.temp_dir)
 
     def create_test_gospels(self):
         """Create test Gospel files."""
@@ -77,7 +90,9 @@ Do unto others as you would have them do unto you.
         """Test that ResurrectionConsciousness initializes correctly."""
         consciousness = ResurrectionConsciousness(
             figure_name="test_figure",
-            bundle_dir=Path(self.temp_dir) / "test_bundle"
+            bundle_dir=Path(self.temp_dir) / "test_bundle",
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         # Check that directories are created
@@ -94,7 +109,9 @@ Do unto others as you would have them do unto you.
         """Test indexing Gospel texts into vector database."""
         consciousness = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=Path(self.temp_dir) / "test_bundle"
+            bundle_dir=Path(self.temp_dir) / "test_bundle",
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         # Index the test data
@@ -110,7 +127,9 @@ Do unto others as you would have them do unto you.
         """Test handling of missing data directory."""
         consciousness = ResurrectionConsciousness(
             figure_name="nonexistent",
-            bundle_dir=Path(self.temp_dir) / "test_bundle"
+            bundle_dir=Path(self.temp_dir) / "test_bundle",
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         # Try to index non-existent data
@@ -125,7 +144,9 @@ Do unto others as you would have them do unto you.
         """Test querying about Thomas."""
         consciousness = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=Path(self.temp_dir) / "test_bundle"
+            bundle_dir=Path(self.temp_dir) / "test_bundle",
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         # Index data first
@@ -147,7 +168,9 @@ Do unto others as you would have them do unto you.
         """Test querying about daily life."""
         consciousness = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=Path(self.temp_dir) / "test_bundle"
+            bundle_dir=Path(self.temp_dir) / "test_bundle",
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         # Index data first
@@ -187,7 +210,9 @@ Do unto others as you would have them do unto you.
         # First session
         consciousness1 = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=bundle_dir
+            bundle_dir=bundle_dir,
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
         consciousness1.index_texts(self.test_data_dir)
 
@@ -197,7 +222,9 @@ Do unto others as you would have them do unto you.
         # Second session - should load existing metadata
         consciousness2 = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=bundle_dir
+            bundle_dir=bundle_dir,
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         doc_count2 = consciousness2.metadata["statistics"]["total_documents"]
@@ -210,7 +237,9 @@ Do unto others as you would have them do unto you.
         bundle_dir1 = Path(self.temp_dir) / "export_test"
         consciousness1 = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=bundle_dir1
+            bundle_dir=bundle_dir1,
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
         consciousness1.index_texts(self.test_data_dir)
 
@@ -224,7 +253,9 @@ Do unto others as you would have them do unto you.
         bundle_dir2 = Path(self.temp_dir) / "import_test"
         consciousness2 = ResurrectionConsciousness(
             figure_name="test_jesus",
-            bundle_dir=bundle_dir2 / "test_jesus"
+            bundle_dir=bundle_dir2 / "test_jesus",
+            embedder=self.embedder,
+            chroma_client=self.chroma_client
         )
 
         success = consciousness2.import_bundle(str(export_path))
@@ -260,7 +291,7 @@ class TestResurrectionIntegration(unittest.TestCase):
 
     def tearDown(self):
         """Clean up."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        fast_rmtree(self.temp_dir)
 
     def create_gospel_files(self):
         """Create realistic Gospel file structure."""
@@ -370,22 +401,37 @@ They followed Jesus throughout his ministry, witnessing miracles and teachings.
 class TestResurrectionRobustness(unittest.TestCase):
     """Test error handling and edge cases."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the embedding model and ChromaDB client once for the class."""
+        embedder, chroma_client = SharedEmbedder.load()
+        cls.shared = {"embedder": embedder, "chroma_client": chroma_client}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop every collection the class created."""
+        SharedEmbedder.reset()
+
+    def setUp(self):
+        """Start each test from empty collections."""
+        SharedEmbedder.reset()
+
     def test_empty_query(self):
         """Test handling of empty queries."""
-        consciousness = ResurrectionConsciousness("test")
+        consciousness = ResurrectionConsciousness("test", **self.shared)
         result = consciousness.query("", use_llm=False)
         self.assertIn("response", result)
 
     def test_very_long_query(self):
         """Test handling of very long queries."""
-        consciousness = ResurrectionConsciousness("test")
+        consciousness = ResurrectionConsciousness("test", **self.shared)
         long_query = "Thomas " * 1000
         result = consciousness.query(long_query, use_llm=False)
         self.assertIn("response", result)
 
     def test_special_characters_in_query(self):
         """Test queries with special characters."""
-        consciousness = ResurrectionConsciousness("test")
+        consciousness = ResurrectionConsciousness("test", **self.shared)
         queries = [
             "Who was Thomas???",
             "Thomas & the disciples",
@@ -399,8 +445,8 @@ class TestResurrectionRobustness(unittest.TestCase):
 
     def test_concurrent_resurrections(self):
         """Test multiple resurrections don't interfere."""
-        jesus = ResurrectionConsciousness("jesus")
-        buddha = ResurrectionConsciousness("buddha")
+        jesus = ResurrectionConsciousness("jesus", **self.shared)
+        buddha = ResurrectionConsciousness("buddha", **self.shared)
 
         # Different collections
         self.assertNotEqual(
@@ -0,0 +1,125 @@
+"""
+Unit tests for the Teleology & Transformation component.
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import teleology
+from teleology import TeleologyTransformation
+
+
+class TestGoals:
+    """Test goal creation and progress tracking."""
+
+    def setup_method(self):
+        """Create a fresh component."""
+        self.teleology = TeleologyTransformation()
+
+    def test_update_progress_by_id(self):
+        """Progress and milestones land on the goal with the given ID."""
+        first = asyncio.run(self.teleology.create_goal({"title": "Run", "category": "health"}))
+        second = asyncio.run(self.teleology.create_goal({"title": "Write", "category": "craft"}))
+
+        milestones = [{"name": "Draft"}]
+        assert asyncio.run(self.teleology.update_goal_progress(second, 40.0, milestones))
+
+        goals = {goal["id"]: goal for goal in self.teleology.goals}
+        assert goals[first]["progress"] == 0.0
+        assert goals[second]["progress"] == 40.0
+        assert goals[second]["milestones"] == milestones
+
+    def test_update_unknown_goal(self):
+        """Updating a missing goal reports failure."""
+        assert not asyncio.run(self.teleology.update_goal_progress("goal_99", 10.0))
+
+
+
+class TestTimestamps:
+    """Test the cached per-second timestamps."""
+
+    def test_same_second_reuses_stamp(self, monkeypatch):
+        """Calls within one second share a stamp; the next second refreshes it."""
+        now = [1_700_000_000.2]
+        monkeypatch.setattr(teleology.time, "time", lambda: now[0])
+
+        first = teleology._now_stamp()
+        now[0] += 0.5
+        assert teleology._now_stamp() is first
+
+        now[0] += 1.0
+        iso, stamp = teleology._now_stamp()
+        assert iso == datetime.fromtimestamp(1_700_000_001).isoformat()
+        assert stamp == np.datetime64(datetime.fromtimestamp(1_700_000_001), "s")
+
+    def test_legacy_mode_timestamp(self):
+        """Legacy mode activation records an ISO timestamp."""
+        component = TeleologyTransformation()
+        assert asyncio.run(component.set_legacy_mode("muse"))
+        datetime.fromisoformat(component.legacy_mode["activated_at"])
+
+    def test_invalid_legacy_mode(self):
+        """Unknown legacy modes are rejected."""
+        component = TeleologyTransformation()
+        assert not asyncio.run(component.set_legacy_mode("oracle"))
+        assert component.legacy_mode is None
+
+
+class TestLifeReview:
+    """Test goal aggregation in the life review."""
+
+    def setup_method(self):
+        """Create goals across two categories."""
+        self.teleology = TeleologyTransformation()
+        specs = [
+            ("Run", "health", 100.0, "2000-01-01"),
+            ("Swim", "health", 30.0, "2000-01-01"),
+            ("Write", "craft", 55.0, "2999-01-01"),
+            ("Read", "craft", 100.0, None),
+        ]
+        for title, category, progress, target in specs:
+            goal_id = asyncio.run(self.teleology.create_goal(
+                {"title": title, "category": category, "target_date": target}
+            ))
+            asyncio.run(self.teleology.update_goal_progress(goal_id, progress))
+
+    def test_goal_statistics(self):
+        """Counts, histogram and categories cover every goal."""
+        review = asyncio.run(self.teleology.generate_life_review("all"))
+        goals = review["goals"]
+
+        assert goals["total"] == 4
+        assert goals["completed"] == 2
+        assert goals["overdue"] == 1
+        assert goals["mean_progress"] == pytest.approx(71.25)
+        assert sum(goals["progress_histogram"]) == 4
+        assert goals["by_category"] == {"health": 2, "craft": 2}
+        assert review["achievements"] == ["Run", "Read"]
+
+    def test_focus_areas(self):
+        """Focus areas restrict the review to their categories."""
+        review = asyncio.run(self.teleology.generate_life_review("year", ["craft"]))
+
+        assert review["goals"]["total"] == 2
+        assert review["goals"]["by_category"] == {"craft": 2}
+        assert review["achievements"] == ["Read"]
+
+    def test_arrays_grow(self):
+        """Goal arrays double past their initial capacity."""
+        for i in range(100):
+            asyncio.run(self.teleology.create_goal({"title": f"Goal {i}"}))
+
+        review = asyncio.run(self.teleology.generate_life_review("all"))
+        assert review["goals"]["total"] == 104
+        assert review["goals"]["by_category"]["uncategorized"] == 100
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,506 @@
+"""
+Unit tests for the in-memory vector store fallback.
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from retrieval import vector_store
+from retrieval.vector_store import (
+    VectorStore, HybridRetriever, cosine_scores, hash_embeddings, int8_scores, quantize_rows, top_k
+)
+
+
+def brute_force(store, query, k):
+    """Reference ranking: cosine similarity over freshly embedded documents."""
+    docs = store.memory_store['documents']
+    emb = store._embed_texts(docs).astype(np.float64)
+    q = store._embed_texts([query])[0].astype(np.float64)
+    sims = emb @ q / (np.linalg.norm(emb, axis=1) * np.linalg.norm(q))
+    order = np.argsort(-sims)[:k]
+    return [store.memory_store['ids'][i] for i in order]
+
+
+class TestMemoryVectorStore:
+    """Test search and deletion without ChromaDB."""
+
+    def setup_method(self):
+        """Create a memory-backed store with a few documents."""
+        self.store = VectorStore()
+        if self.store.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+        self.docs = [f"document number {i}" for i in range(20)]
+        self.ids = [f"doc{i}" for i in range(20)]
+        self.store.add_documents(self.docs, [{'n': i} for i in range(20)], self.ids)
+
+    def test_search_matches_cosine_ranking(self):
+        """Top-k over normalized rows equals a full cosine ranking."""
+        results = self.store.search("document number 7", k=5)
+
+        assert [r['id'] for r in results] == brute_force(self.store, "document number 7", 5)
+        scores = [r['score'] for r in results]
+        assert scores == sorted(scores, reverse=True)
+        assert results[0]['id'] == 'doc7'
+        assert results[0]['score'] == pytest.approx(1.0, abs=1e-5)
+
+    def test_k_larger_than_corpus(self):
+        """Asking for more results than documents returns all of them."""
+        assert len(self.store.search("anything", k=50)) == 20
+
+    def test_batch_search_matches_search(self):
+        """Batched queries return the same hits as one search per query."""
+        queries = ["document number 7", "document number 12", "document number 7"]
+        self.store.search("document number 12", k=1)
+
+        batched = self.store.batch_search(queries, k=3)
+
+        assert len(batched) == 3
+        for query, results in zip(queries, batched):
+            assert results == self.store.search(query, k=3)
+        assert "document number 7" in self.store._query_cache
+        assert self.store.batch_search([], k=3) == []
+
+    def test_delete_keeps_rows_aligned(self):
+        """Deleting a document keeps embeddings aligned with the rest."""
+        self.store.delete(['doc3'])
+        self.store.delete_document('doc0')
+
+        results = self.store.search("document number 7", k=3)
+
+        assert 'doc3' not in [r['id'] for r in self.store.search("document number 3", k=19)]
+        assert results[0]['id'] == 'doc7'
+        assert [r['id'] for r in results] == brute_force(self.store, "document number 7", 3)
+
+    def test_delete_tombstones_then_compacts(self):
+        """Deletes tombstone rows until enough are dead to compact."""
+        self.store.delete(['doc1', 'doc2'])
+
+        assert self.store._n_rows == 20
+        assert self.store.get_stats()['total_documents'] == 18
+        assert 'doc1' not in [d['id'] for d in self.store.get_all_documents()]
+
+        self.store.delete([f"doc{i}" for i in range(3, 10)])
+
+        assert self.store._n_rows == 11
+        assert self.store.memory_store['ids'][0] == 'doc0'
+        assert self.store._id_to_row['doc15'] == self.store.memory_store['ids'].index('doc15')
+        assert self.store.search("document number 15", k=1)[0]['id'] == 'doc15'
+
+    def test_filter_uses_metadata_index(self):
+        """Scalar filters match through the metadata index, others by scan."""
+        self.store.add_documents(["tagged"], [{'n': 3, 'tags': ['x']}], ['tagged'])
+        self.store.delete(['doc3'])
+
+        assert self.store._filter_rows({'n': 3}) == {20}
+        assert self.store._filter_rows({'tags': ['x']}) is None
+        assert [r['id'] for r in self.store.search("document number 3", k=5, filter={'n': 3})] == ['tagged']
+        assert [r['id'] for r in self.store.search("tagged", k=5, filter={'tags': ['x']})] == ['tagged']
+        assert self.store.search("anything", k=5, filter={'n': 3, 'missing': 1}) == []
+
+    def test_insert_reuses_freed_rows(self):
+        """New documents fill deleted slots before growing the store."""
+        self.store.delete(['doc4', 'doc9'])
+        self.store.add_documents(["fresh text one", "fresh text two", "fresh text three"], ids=['f1', 'f2', 'f3'])
+
+        assert self.store._n_rows == 21
+        assert sorted(self.store._id_to_row[i] for i in ('f1', 'f2', 'f3')) == [4, 9, 20]
+        assert self.store._free_rows == []
+        assert self.store.search("fresh text two", k=1)[0]['id'] == 'f2'
+        assert 'doc9' not in [d['id'] for d in self.store.get_all_documents()]
+        assert self.store._inverted['fresh'] == {4, 9, 20}
+
+    def test_readding_id_replaces_document(self):
+        """Adding an existing ID replaces the old document."""
+        self.store.add_documents(["replacement text"], [{}], ['doc5'])
+
+        assert self.store.get_stats()['total_documents'] == 20
+        [result] = self.store.search("replacement text", k=1)
+        assert result['id'] == 'doc5'
+        assert result['document'] == "replacement text"
+        assert self.store.search("document number 5", k=1)[0]['id'] != 'doc5'
+
+    def test_matrix_is_aligned_float32(self):
+        """The embedding matrix is float32, C-contiguous and 64-byte aligned."""
+        matrix = self.store._emb_matrix
+
+        assert matrix.dtype == np.float32
+        assert matrix.flags['C_CONTIGUOUS']
+        assert matrix.ctypes.data % 64 == 0
+        assert self.store.search("document number 1", k=0) == []
+
+    def test_repeated_query_reuses_embedding(self):
+        """A repeated query is embedded once unless the cache is bypassed."""
+        calls = []
+        embed = self.store._embed_texts
+        self.store._embed_texts = lambda texts: calls.append(texts) or embed(texts)
+
+        first = self.store.search("document number 4", k=3)
+        second = self.store.search("document number 4", k=3)
+        self.store.search("document number 4", k=3, use_cache=False)
+
+        assert first == second
+        assert len(calls) == 2
+
+    def test_growth_beyond_initial_capacity(self):
+        """The embedding matrix grows as documents are added."""
+        store = VectorStore()
+        store._emb_matrix = store._emb_matrix[:2]
+        store.add_documents(self.docs[:5], ids=self.ids[:5])
+        store.add_documents(self.docs[5:], ids=self.ids[5:])
+
+        assert len(store._emb_matrix) >= 20
+        assert store.search("document number 12", k=1)[0]['id'] == 'doc12'
+
+
+class TestQuantizedVectorStore:
+    """Test the int8-quantized in-memory store."""
+
+    def setup_method(self):
+        """Create float32 and int8 stores over the same documents."""
+        self.docs = [f"document number {i}" for i in range(20)]
+        self.ids = [f"doc{i}" for i in range(20)]
+        self.exact = VectorStore()
+        self.store = VectorStore(quantize=True)
+        if self.store.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+        self.exact.add_documents(self.docs, ids=self.ids)
+        self.store.add_documents(self.docs, ids=self.ids)
+
+    def test_stores_int8_rows(self):
+        """Embeddings are kept as int8 codes with a scale per row."""
+        assert self.store._emb_matrix.dtype == np.int8
+        assert self.store._scales.dtype == np.float32
+
+    def test_scores_close_to_float32(self):
+        """Quantized scores stay within int8 rounding error of exact ones."""
+        exact = {r['id']: r['score'] for r in self.exact.search("document number 7", k=20)}
+        results = self.store.search("document number 7", k=20)
+
+        assert results[0]['id'] == 'doc7'
+        for r in results:
+            assert r['score'] == pytest.approx(exact[r['id']], abs=1e-2)
+
+    def test_delete_and_growth_keep_scales_aligned(self):
+        """Compaction and growth move scales together with their rows."""
+        store = VectorStore(quantize=True)
+        store._emb_matrix = store._emb_matrix[:2]
+        store.add_documents(self.docs, ids=self.ids)
+        store.delete([f"doc{i}" for i in range(10)])
+
+        assert store._n_rows == 10
+        assert len(store._scales) == len(store._emb_matrix)
+        [result] = store.search("document number 15", k=1)
+        assert result['id'] == 'doc15'
+        assert result['score'] == pytest.approx(1.0, abs=1e-2)
+
+
+@pytest.mark.skipif(not vector_store.HNSWLIB_AVAILABLE, reason="hnswlib not installed")
+class TestHNSWSearch:
+    """Test the HNSW candidate path of the in-memory store."""
+
+    def setup_method(self):
+        """Create a memory-backed store that always queries its index."""
+        self.store = VectorStore()
+        if self.store.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+        self.docs = [f"document number {i}" for i in range(200)]
+        self.ids = [f"doc{i}" for i in range(200)]
+        self.store.add_documents(self.docs, [{'even': i % 2 == 0} for i in range(200)], self.ids)
+
+    @pytest.fixture(autouse=True)
+    def always_use_index(self, monkeypatch):
+        """Lower the size threshold so every search goes through HNSW."""
+        monkeypatch.setattr(vector_store, 'HNSW_MIN_ROWS', 0)
+
+    def test_exact_match_ranks_first(self):
+        """Candidates are re-ranked with exact cosine scores."""
+        results = self.store.search("document number 42", k=5)
+
+        assert results[0]['id'] == 'doc42'
+        assert results[0]['score'] == pytest.approx(1.0, abs=1e-5)
+        assert len(results) == 5
+
+    def test_deleted_rows_are_not_returned(self):
+        """Deletes mark rows in the index, and compaction rebuilds it."""
+        self.store.delete(['doc42'])
+        assert 'doc42' not in [r['id'] for r in self.store.search("document number 42", k=5)]
+
+        self.store.delete([f"doc{i}" for i in range(100)])
+        assert self.store._n_rows == 100
+        assert self.store._hnsw.get_current_count() == 100
+        assert self.store.search("document number 150", k=1)[0]['id'] == 'doc150'
+
+    def test_reused_rows_replace_index_vectors(self):
+        """A freed row re-added to the index carries its new vector."""
+        self.store.delete(['doc42'])
+        self.store.add_documents(["a completely new entry"], ids=['new'])
+
+        assert self.store._id_to_row['new'] == 42
+        assert self.store.search("a completely new entry", k=1)[0]['id'] == 'new'
+
+    def test_index_built_when_store_reaches_threshold(self, monkeypatch):
+        """Small stores skip the index; crossing the threshold bulk-loads live rows."""
+        monkeypatch.setattr(vector_store, 'HNSW_MIN_ROWS', 250)
+        store = VectorStore()
+        store.add_documents([f"entry {i}" for i in range(200)], ids=[f"e{i}" for i in range(200)])
+        store.delete(['e7'])
+        assert store._hnsw is None
+
+        store.add_documents([f"more {i}" for i in range(60)], ids=[f"m{i}" for i in range(60)])
+
+        assert store._hnsw is not None
+        assert store._hnsw.get_current_count() == 259
+        assert store.search("more 30", k=1)[0]['id'] == 'm30'
+
+    def test_sparse_filter_falls_back_to_scan(self):
+        """A filter that drops most candidates still returns k results."""
+        self.store.add_documents(["tagged text"], [{'tag': 'rare'}], ['rare'])
+
+        results = self.store.search("document number 3", k=1, filter={'tag': 'rare'})
+
+        assert [r['id'] for r in results] == ['rare']
+
+
+class TestPersistentMemoryStore:
+    """Test the memory-mapped, persisted in-memory store."""
+
+    def open_store(self, tmp_path, **kwargs):
+        """Open a persistent memory store under tmp_path."""
+        store = VectorStore(persist_directory=str(tmp_path), persist_memory=True, **kwargs)
+        if store.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+        return store
+
+    def test_reload_restores_documents(self, tmp_path):
+        """A reopened store returns the same documents and rankings."""
+        store = self.open_store(tmp_path)
+        store.add_documents([f"document number {i}" for i in range(10)], [{'n': i} for i in range(10)],
+                            [f"doc{i}" for i in range(10)])
+        store.delete(['doc3'])
+        expected = store.search("document number 7", k=5)
+
+        reopened = self.open_store(tmp_path)
+
+        assert isinstance(reopened._emb_matrix, np.memmap)
+        assert reopened.get_stats()['total_documents'] == 9
+        assert reopened.search("document number 7", k=5) == expected
+        assert 'doc3' not in [d['id'] for d in reopened.get_all_documents()]
+        assert reopened._inverted == store._inverted
+
+    def test_growth_and_compaction_persist(self, tmp_path):
+        """Files grow in place and compaction rewrites the row data."""
+        store = self.open_store(tmp_path, quantize=True)
+        store._emb_matrix = store._allocate('.emb', (2, store.embedding_dimension), store._emb_matrix, 0)
+        store.add_documents([f"document number {i}" for i in range(20)], ids=[f"doc{i}" for i in range(20)])
+        store.delete([f"doc{i}" for i in range(10)])
+
+        reopened = self.open_store(tmp_path, quantize=True)
+
+        assert reopened._n_rows == 10
+        assert reopened.memory_store['ids'] == [f"doc{i}" for i in range(10, 20)]
+        assert reopened.search("document number 15", k=1)[0]['id'] == 'doc15'
+
+    def test_clear_and_incompatible_files(self, tmp_path):
+        """Clearing empties the files; a store of another layout starts empty."""
+        store = self.open_store(tmp_path)
+        store.add_documents(["some text"], ids=['a'])
+
+        assert self.open_store(tmp_path, quantize=True).get_stats()['total_documents'] == 0
+
+        store = self.open_store(tmp_path)
+        store.add_documents(["some text"], ids=['a'])
+        store.clear()
+
+        assert self.open_store(tmp_path).get_stats()['total_documents'] == 0
+
+
+class TestKeywordSearch:
+    """Test keyword search over the inverted index."""
+
+    def setup_method(self):
+        """Create a hybrid retriever over a memory-backed store."""
+        self.store = VectorStore()
+        if self.store.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+        self.store.add_documents(
+            ["The garden was quiet.", "A quiet morning walk", "Notes on taxes", "garden, walk, quiet"],
+            [{'kind': 'a'}, {'kind': 'b'}, {'kind': 'a'}, {'kind': 'b'}],
+            ['d0', 'd1', 'd2', 'd3']
+        )
+        self.retriever = HybridRetriever(self.store)
+
+    def test_scores_fraction_of_query_words(self):
+        """Documents score by the share of query words they contain."""
+        results = self.retriever._keyword_search("quiet garden walk", k=10)
+
+        assert [(r['id'], r['score']) for r in results] == [
+            ('d3', 1.0), ('d0', pytest.approx(2 / 3)), ('d1', pytest.approx(2 / 3))
+        ]
+
+    def test_respects_filter_and_deletes(self):
+        """Filtered-out and deleted documents are not returned."""
+        assert [r['id'] for r in self.retriever._keyword_search("quiet", k=10, filter={'kind': 'b'})] == ['d1', 'd3']
+
+        self.store.delete(['d1', 'd3'])
+
+        assert [r['id'] for r in self.retriever._keyword_search("quiet", k=10)] == ['d0']
+        assert self.store._n_rows == 2
+        assert self.store._inverted['quiet'] == {0}
+        assert 'walk' not in self.store._inverted
+
+    def test_postings_hold_live_rows_only(self):
+        """Tombstoned rows leave the inverted index before compaction."""
+        self.store.delete(['d3'])
+
+        assert self.store._n_rows == 4
+        assert self.store.memory_store['tokens'][3] == frozenset({'garden', 'walk', 'quiet'})
+        assert self.store._inverted['walk'] == {1}
+        assert self.store._inverted['quiet'] == {0, 1}
+
+
+class TestMergeResults:
+    """Test merging semantic and keyword results."""
+
+    def test_returns_k_best_by_weighted_score(self):
+        """Merged scores weight both sources and only the k best return."""
+        retriever = HybridRetriever(VectorStore())
+        semantic = [
+            {'id': 'a', 'document': 'A', 'metadata': {}, 'score': 0.9},
+            {'id': 'b', 'document': 'B', 'metadata': {}, 'score': 0.5},
+        ]
+        keyword = [
+            {'id': 'b', 'document': 'B', 'metadata': {}, 'score': 1.0},
+            {'id': 'c', 'document': 'C', 'metadata': {}, 'score': 1.0},
+        ]
+
+        merged = retriever._merge_results(semantic, keyword, semantic_weight=0.5, k=2)
+
+        assert [r['id'] for r in merged] == ['b', 'c']
+        assert merged[0]['score'] == pytest.approx(0.75)
+        assert merged[0]['keyword_score'] == 1.0
+        assert len(retriever._merge_results(semantic, keyword, semantic_weight=0.5)) == 3
+
+
+class TestCosineScores:
+    """Test the similarity kernel over normalized rows."""
+
+    def test_matches_cosine(self):
+        """Scores equal cosine similarity for unit vectors."""
+        rng = np.random.default_rng(1)
+        matrix = rng.random((50, 16)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        query = matrix[7]
+
+        scores = cosine_scores(matrix, query)
+
+        assert scores.shape == (50,)
+        assert np.allclose(scores, matrix @ query, atol=1e-5)
+        assert int(np.argmax(scores)) == 7
+
+    def test_sharded_scoring_matches(self, monkeypatch):
+        """Scoring split across threads equals the single-threaded result."""
+        rng = np.random.default_rng(3)
+        matrix = rng.standard_normal((1000, 16)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        codes, scales = quantize_rows(matrix)
+        monkeypatch.setattr(vector_store, 'SIMSIMD_AVAILABLE', False)
+        monkeypatch.setattr(vector_store, 'INT8_BLOCK_ROWS', 64)
+        expected = (cosine_scores(matrix, matrix[3]), int8_scores(codes, scales, matrix[3]))
+
+        monkeypatch.setattr(vector_store, 'SCORE_THREADS', 3)
+        monkeypatch.setattr(vector_store, 'PARALLEL_SCORE_ROWS', 1)
+
+        assert np.allclose(cosine_scores(matrix, matrix[3]), expected[0], atol=1e-6)
+        assert np.allclose(int8_scores(codes, scales, matrix[3]), expected[1], atol=1e-6)
+
+    def test_int8_matches_cosine(self):
+        """Scores over quantized rows approximate exact cosine similarity."""
+        rng = np.random.default_rng(2)
+        matrix = rng.standard_normal((50, 16)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        codes, scales = quantize_rows(matrix)
+
+        scores = int8_scores(codes, scales, matrix[7])
+
+        assert codes.dtype == np.int8
+        assert np.allclose(scores, matrix @ matrix[7], atol=2e-2)
+        assert int(np.argmax(scores)) == 7
+
+
+class TestHashEmbeddings:
+    """Test the deterministic fallback embeddings."""
+
+    def test_deterministic_and_dense(self):
+        """Equal texts embed equally and every dimension is filled."""
+        embeddings = hash_embeddings(["alpha", "beta", "alpha"], 384)
+
+        assert embeddings.shape == (3, 384)
+        assert embeddings.dtype == np.float32
+        assert np.array_equal(embeddings[0], embeddings[2])
+        assert not np.array_equal(embeddings[0], embeddings[1])
+        assert embeddings.min() >= 0.0 and embeddings.max() < 1.0
+        assert np.count_nonzero(embeddings[0]) > 380
+        assert hash_embeddings([], 384).shape == (0, 384)
+
+
+class CountingEmbedder:
+    """Minimal stand-in for a loaded SentenceTransformer."""
+
+    def __init__(self, dimension=8):
+        self.dimension = dimension
+        self.calls = 0
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        return hash_embeddings(texts, self.dimension)
+
+
+class TestSharedEmbedder:
+    """Test passing an already-loaded embedding model to stores."""
+
+    def test_stores_share_injected_model(self):
+        """Both stores embed through the one model they were given."""
+        embedder = CountingEmbedder()
+        first = VectorStore(collection_name="first", embedder=embedder)
+        second = VectorStore(collection_name="second", embedder=embedder)
+        if first.collection is not None:
+            pytest.skip("ChromaDB backend in use")
+
+        first.add_documents(["alpha"], ids=["a"])
+        second.add_documents(["beta"], ids=["b"])
+
+        assert first.embedding_model is second.embedding_model is embedder
+        assert first.embedding_dimension == 8
+        assert embedder.calls == 2
+        assert second.search("beta", k=1)[0]['id'] == "b"
+
+
+class TestTopK:
+    """Test the partition-based top-k helper."""
+
+    def test_matches_full_sort(self):
+        """Partitioned top-k equals the head of a full descending sort."""
+        rng = np.random.default_rng(0)
+        scores = rng.random(1000)
+
+        assert list(top_k(scores, 10)) == list(np.argsort(-scores)[:10])
+        assert list(top_k(scores, 2000)) == list(np.argsort(-scores))
+        assert len(top_k(scores, 0)) == 0
+
+    def test_ties_keep_index_order(self):
+        """Equal scores are returned in their original order."""
+        scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1])
+
+        assert list(top_k(scores, 4)) == [1, 0, 2, 3]
+        assert list(top_k(scores, 5)) == [1, 0, 2, 3, 4]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
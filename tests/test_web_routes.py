@@ -0,0 +1,248 @@
+"""
+Unit tests for the web UI routes.
+"""
+
+import asyncio
+import gzip
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+pytest.importorskip("jinja2")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.exceptions import HTTPException
+
+from web.routes import (
+    setup_web_routes, compiled_templates, render_page, static_dir,
+    StaticAssets, StaticHTMLEndpoint
+)
+
+
+class TestDashboardPages:
+    """Test the pre-rendered dashboard pages."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        app = FastAPI()
+        setup_web_routes(app)
+        self.client = TestClient(app)
+
+    def test_index_served_from_rendered_bytes(self):
+        """Test that the index page matches the template rendered at startup."""
+        response = self.client.get("/")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/html; charset=utf-8"
+        assert response.content == render_page("index.html")
+
+    def test_head_has_no_body(self):
+        """Test that HEAD returns headers only."""
+        response = self.client.head("/chat", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert response.content == b""
+        assert int(response.headers["content-length"]) == len(render_page("chat.html"))
+
+    def test_etag_revalidation(self):
+        """Test that a matching If-None-Match returns 304 without a body."""
+        etag = self.client.get("/search").headers["etag"]
+
+        response = self.client.get("/search", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        stale = self.client.get("/search", headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == 200
+        assert stale.content == render_page("search.html")
+
+    def test_gzip_served_precompressed(self):
+        """Test that gzip clients get the compressed copy with its own ETag."""
+        plain = self.client.get("/", headers={"Accept-Encoding": "identity"})
+        packed = self.client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in plain.headers
+        assert packed.headers["content-encoding"] == "gzip"
+        assert packed.headers["vary"] == "accept-encoding"
+        assert packed.content == plain.content == render_page("index.html")
+        assert packed.headers["etag"] != plain.headers["etag"]
+
+        raw = StaticHTMLEndpoint(render_page("index.html")).gzip[0]
+        assert gzip.decompress(raw) == render_page("index.html")
+        assert int(packed.headers["content-length"]) == len(raw)
+
+    def test_missing_template_not_routed(self):
+        """Test that pages without a template are not registered."""
+        assert "settings.html" not in compiled_templates
+        assert self.client.get("/settings").status_code == 404
+
+    def test_pages_hidden_from_openapi(self):
+        """Test that dashboard pages stay out of the API schema."""
+        paths = self.client.get("/openapi.json").json().get("paths", {})
+        assert "/" not in paths and "/chat" not in paths
+
+    def test_static_mounted_first(self):
+        """Test that /static is the first route and serves assets."""
+        first = self.client.app.router.routes[0]
+        assert first.path == "/static" and first.name == "static"
+        assert self.client.get("/static/css/style.css").status_code == 200
+
+    def test_post_not_allowed(self):
+        """Test that pages only answer GET and HEAD."""
+        assert self.client.post("/search").status_code == 405
+
+
+
+class TestStaticAssets:
+    """Test static file serving."""
+
+    def call(self, path, headers=(), extensions=None):
+        """Call the static app directly and collect the sent messages."""
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "root_path": "",
+            "query_string": b"",
+            "headers": list(headers),
+            "extensions": extensions or {},
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(StaticAssets(directory=str(static_dir))(scope, receive, send))
+        return messages
+
+    def test_pathsend_when_advertised(self):
+        """Test that the file path is handed to the server when supported."""
+        messages = self.call("/css/style.css", extensions={"http.response.pathsend": {}})
+
+        assert messages[0]["status"] == 200
+        assert messages[1] == {
+            "type": "http.response.pathsend",
+            "path": str(static_dir / "css" / "style.css"),
+        }
+
+    def test_body_without_extension(self):
+        """Test that servers without pathsend get the file bytes."""
+        messages = self.call("/css/style.css")
+
+        body = b"".join(m.get("body", b"") for m in messages[1:])
+        assert body == (static_dir / "css" / "style.css").read_bytes()
+
+    def test_canonical_paths_resolved_once(self):
+        """Test that only canonical manifest URLs are cached."""
+        app = StaticAssets(directory=str(static_dir))
+        scope = {"path": "/css/style.css", "root_path": ""}
+
+        assert app.get_path(scope) == "css/style.css"
+        assert app._resolved == {"/css/style.css": "css/style.css"}
+        assert app.get_path({"path": "/css/./style.css", "root_path": ""}) == "css/style.css"
+        assert app.get_path({"path": "/js/missing.js", "root_path": ""}) == "js/missing.js"
+        assert list(app._resolved) == ["/css/style.css"]
+
+    def test_large_file_in_one_chunk(self, tmp_path):
+        """Test that files up to 1 MiB are read and sent in a single chunk."""
+        (tmp_path / "big.bin").write_bytes(b"x" * (512 * 1024))
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/big.bin", "root_path": "",
+                 "query_string": b"", "headers": []}
+        asyncio.run(StaticAssets(directory=str(tmp_path))(scope, None, send))
+
+        bodies = [m for m in messages if m["type"] == "http.response.body"]
+        assert len(bodies) == 1
+        assert len(bodies[0]["body"]) == 512 * 1024
+
+    def test_range_falls_back(self):
+        """Test that range requests don't use pathsend."""
+        messages = self.call(
+            "/css/style.css",
+            headers=[(b"range", b"bytes=0-9")],
+            extensions={"http.response.pathsend": {}}
+        )
+
+        assert messages[0]["status"] == 206
+        assert messages[1]["body"] == (static_dir / "css" / "style.css").read_bytes()[:10]
+
+
+    def test_cache_headers_from_manifest(self):
+        """Test that known files carry precomputed cache headers."""
+        messages = self.call("/js/app.js")
+        headers = dict(messages[0]["headers"])
+
+        assert headers[b"cache-control"] == b"public, max-age=3600"
+        assert headers[b"etag"].startswith(b'"')
+        assert b"last-modified" in headers
+
+    def test_conditional_request_skips_disk(self, monkeypatch):
+        """Test that a matching ETag gets a 304 without stat'ing the file."""
+        etag = dict(self.call("/js/app.js")[0]["headers"])[b"etag"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("file was stat'ed")
+
+        monkeypatch.setattr(StaticAssets, "lookup_path", fail)
+        messages = self.call("/js/app.js", headers=[(b"if-none-match", etag)])
+
+        assert messages[0]["status"] == 304
+        assert dict(messages[0]["headers"])[b"etag"] == etag
+
+    def test_edited_file_gets_fresh_headers(self, tmp_path):
+        """Test that a file changed after startup is sent with its new length and ETag."""
+        asset = tmp_path / "app.css"
+        asset.write_bytes(b"a{}")
+        app = StaticAssets(directory=str(tmp_path))
+        old_etag = app.manifest["app.css"][2]["etag"]
+
+        asset.write_bytes(b"body{color:red}")
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/app.css", "root_path": "",
+                 "query_string": b"", "headers": []}
+        asyncio.run(app(scope, None, send))
+
+        headers = dict(messages[0]["headers"])
+        assert messages[0]["status"] == 200
+        assert headers[b"content-length"] == b"15"
+        assert headers[b"etag"].decode() != old_etag
+        assert b"".join(m.get("body", b"") for m in messages[1:]) == b"body{color:red}"
+        assert app.manifest["app.css"][1].st_size == 15
+
+    def test_removed_file_not_found(self, tmp_path):
+        """Test that a file deleted after startup is no longer served."""
+        asset = tmp_path / "gone.js"
+        asset.write_bytes(b"x")
+        app = StaticAssets(directory=str(tmp_path))
+        asset.unlink()
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/gone.js", "root_path": "",
+                 "query_string": b"", "headers": []}
+        with pytest.raises(HTTPException) as raised:
+            asyncio.run(app(scope, None, send))
+
+        assert raised.value.status_code == 404
+        assert "gone.js" not in app.manifest
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])